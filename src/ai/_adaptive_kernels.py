@@ -0,0 +1,57 @@
+"""
+Adaptive Kernels
+Manhattan-distance selection loops shared by the adaptive enemy mixin.
+Compiled with numba when installed; plain Python otherwise.
+"""
+
+import numpy as np
+
+from src.ai._jit import njit
+
+
+@njit(cache=True, nogil=True)
+def closest_index(points, cx, cy):
+    """Index of the point with the smallest Manhattan distance to (cx, cy)."""
+    best = 0
+    best_dist = abs(points[0, 0] - cx) + abs(points[0, 1] - cy)
+    for i in range(1, points.shape[0]):
+        d = abs(points[i, 0] - cx) + abs(points[i, 1] - cy)
+        if d < best_dist:
+            best = i
+            best_dist = d
+    return best
+
+
+@njit(cache=True, nogil=True)
+def weighted_pick(points, cx, cy, r):
+    """
+    Pick an index with weight 1 / (1 + Manhattan distance to (cx, cy)).
+
+    r is a uniform random number in [0, 1) drawn by the caller.
+    """
+    total = 0.0
+    for i in range(points.shape[0]):
+        total += 1.0 / (1.0 + abs(points[i, 0] - cx) + abs(points[i, 1] - cy))
+
+    target = r * total
+    acc = 0.0
+    for i in range(points.shape[0]):
+        acc += 1.0 / (1.0 + abs(points[i, 0] - cx) + abs(points[i, 1] - cy))
+        if acc >= target:
+            return i
+    return points.shape[0] - 1
+
+
+@njit(cache=True, nogil=True)
+def nearest_distances(points, targets):
+    """For each target, the Manhattan distance to its nearest point."""
+    out = np.empty(targets.shape[0], dtype=np.float32)
+    for j in range(targets.shape[0]):
+        best = np.inf
+        for i in range(points.shape[0]):
+            d = abs(points[i, 0] - targets[j, 0]) + abs(points[i, 1] - targets[j, 1])
+            if d < best:
+                best = d
+        out[j] = best
+    return out
+
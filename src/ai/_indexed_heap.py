@@ -0,0 +1,84 @@
+"""
+Indexed Min-Heap
+Binary min-heap with a key -> slot index, so priorities can be lowered
+in place (decrease-key) instead of leaving stale duplicates behind.
+"""
+
+from typing import Any, Dict, Hashable, List, Tuple
+
+
+class IndexedMinHeap:
+    """
+    Priority queue keyed by hashable items, supporting decrease_key.
+
+    Priorities only need to be comparable; A* uses (f_cost, tie_break).
+    """
+
+    def __init__(self):
+        self.heap: List[Tuple[Any, Hashable]] = []
+        self.pos: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.pos
+
+    def push(self, key: Hashable, priority):
+        """Insert a new key. The key must not already be queued."""
+        self.heap.append((priority, key))
+        index = len(self.heap) - 1
+        self.pos[key] = index
+        self._sift_up(index)
+
+    def decrease_key(self, key: Hashable, priority):
+        """Lower the priority of a queued key."""
+        index = self.pos[key]
+        self.heap[index] = (priority, key)
+        self._sift_up(index)
+
+    def pop(self) -> Tuple[Hashable, Any]:
+        """Remove and return (key, priority) with the smallest priority."""
+        heap = self.heap
+        priority, key = heap[0]
+        last = heap.pop()
+        del self.pos[key]
+        if heap:
+            heap[0] = last
+            self.pos[last[1]] = 0
+            self._sift_down(0)
+        return key, priority
+
+    def _sift_up(self, index: int):
+        heap, pos = self.heap, self.pos
+        item = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if item[0] < heap[parent][0]:
+                heap[index] = heap[parent]
+                pos[heap[index][1]] = index
+                index = parent
+            else:
+                break
+        heap[index] = item
+        pos[item[1]] = index
+
+    def _sift_down(self, index: int):
+        heap, pos = self.heap, self.pos
+        size = len(heap)
+        item = heap[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and heap[right][0] < heap[child][0]:
+                child = right
+            if heap[child][0] < item[0]:
+                heap[index] = heap[child]
+                pos[heap[index][1]] = index
+                index = child
+            else:
+                break
+        heap[index] = item
+        pos[item[1]] = index
@@ -0,0 +1,26 @@
+"""
+Optional Numba JIT
+Exposes `njit`, which is numba.njit when numba is installed and a no-op
+decorator otherwise, so kernels still run (uncompiled) without it.
+"""
+
+import os
+
+# Persist compiled kernels across launches (cache=True writes here).
+# Must be set before numba is imported; an explicit env var still wins.
+os.environ.setdefault(
+    "NUMBA_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".maze_bourne", "numba_cache")
+)
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional - kernels run as plain Python
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
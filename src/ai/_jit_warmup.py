@@ -0,0 +1,48 @@
+"""
+JIT Warmup
+Calls every AI kernel once with tiny inputs so numba compiles (or loads
+from its on-disk cache) at startup instead of stalling the first AI tick.
+"""
+
+import threading
+
+import numpy as np
+
+from src.ai._jit import HAVE_NUMBA
+from src.core.logger import get_logger
+
+
+def warmup_ai_kernels():
+    """Run each kernel once with representative dtypes."""
+    from src.ai._adaptive_kernels import closest_index, weighted_pick, nearest_distances
+    from src.ai._search_kernels import gen_search_positions
+    from src.ai._raycast_nb import raycast, raycast_many
+
+    points = np.zeros((2, 2), dtype=np.int32)
+    closest_index(points, 0, 0)
+    weighted_pick(points, 0, 0, 0.5)
+
+    fpoints = np.zeros((2, 2), dtype=np.float32)
+    nearest_distances(fpoints, fpoints)
+
+    walls = np.zeros((7, 7), dtype=np.uint8)
+    gen_search_positions(3, 3, 3, walls, 3, 3, 6)
+    raycast(walls, 0, 0, 6, 4)
+    raycast_many(walls, points[:, 0], points[:, 1], 6, 4)
+
+
+def _warmup_safely():
+    try:
+        warmup_ai_kernels()
+        get_logger().info("AI kernels compiled")
+    except Exception as e:
+        get_logger().error(f"AI kernel warmup failed: {e}", exc_info=True)
+
+
+def start_warmup():
+    """Warm kernels on a daemon thread. No-op when numba is not installed."""
+    if not HAVE_NUMBA:
+        return None
+    thread = threading.Thread(target=_warmup_safely, name="jit-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,51 @@
+"""
+Raycast Kernel
+Bresenham line-of-sight walk over a uint8 blocker grid.
+Compiled with numba when installed; plain Python otherwise.
+"""
+
+import numpy as np
+
+from src.ai._jit import njit
+
+
+@njit(boundscheck=False, cache=True, nogil=True)
+def raycast(blocker, x0, y0, x1, y1):
+    """
+    True if no cell on the line from (x0, y0) to (x1, y1) blocks sight.
+
+    Both endpoints are checked. Cells outside the grid count as blocking.
+    """
+    height, width = blocker.shape
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx - dy
+    x = x0
+    y = y0
+
+    while True:
+        if x < 0 or y < 0 or x >= width or y >= height or blocker[y, x]:
+            return False
+
+        if x == x1 and y == y1:
+            return True
+
+        # Branchless step: each mask is 0 or -1 (all bits set), so the
+        # conditional adds compile to selects instead of jumps
+        e2 = 2 * err
+        mask_x = -int(e2 > -dy)
+        mask_y = -int(e2 < dx)
+        err += (dx & mask_y) - (dy & mask_x)
+        x += sx & mask_x
+        y += sy & mask_y
+
+
+@njit(boundscheck=False, cache=True, nogil=True)
+def raycast_many(blocker, xs, ys, x1, y1):
+    """raycast from each (xs[i], ys[i]) to one shared target (x1, y1)."""
+    out = np.zeros(len(xs), dtype=np.bool_)
+    for i in range(len(xs)):
+        out[i] = raycast(blocker, xs[i], ys[i], x1, y1)
+    return out
@@ -0,0 +1,52 @@
+"""
+Search Kernels
+Compiled inner loops for enemy search patterns.
+Uses numba when installed; otherwise the same code runs as plain Python.
+"""
+
+import numpy as np
+
+from src.ai._jit import njit
+
+
+@njit(cache=True, nogil=True)
+def gen_search_positions(cx, cy, radius, walls, ex, ey, cap):
+    """
+    Collect walkable cells in a square around (cx, cy), shuffled.
+
+    walls is a (height, width) uint8 grid where non-zero means blocked.
+    The centre cell and the enemy's own cell (ex, ey) are skipped.
+    Returns at most `cap` rows of (x, y) as an int32 array.
+    """
+    height, width = walls.shape
+    side = 2 * radius + 1
+    out = np.empty((side * side, 2), dtype=np.int32)
+    count = 0
+
+    for dx in range(-radius, radius + 1):
+        for dy in range(-radius, radius + 1):
+            if dx == 0 and dy == 0:
+                continue
+            x = cx + dx
+            y = cy + dy
+            if x < 0 or y < 0 or x >= width or y >= height:
+                continue
+            if walls[y, x] != 0:
+                continue
+            if x == ex and y == ey:
+                continue
+            out[count, 0] = x
+            out[count, 1] = y
+            count += 1
+
+    # Fisher-Yates shuffle of the filled rows
+    for i in range(count - 1, 0, -1):
+        j = np.random.randint(0, i + 1)
+        tx = out[i, 0]
+        ty = out[i, 1]
+        out[i, 0] = out[j, 0]
+        out[i, 1] = out[j, 1]
+        out[j, 0] = tx
+        out[j, 1] = ty
+
+    return out[:min(count, cap)]
@@ -8,8 +8,11 @@ import time
 import math
 from typing import List, Tuple, Optional, Dict
 
+import numpy as np
+
 from src.utils.grid import GridPos
 from src.core.logger import get_logger
+from src.ai._adaptive_kernels import closest_index, weighted_pick, nearest_distances
 
 
 class AdaptiveMixin:
@@ -28,6 +31,17 @@ class AdaptiveMixin:
     DANGER_ZONE_ATTRACTION = 0.5  # How much to prioritize patrolling danger zones
     GROUP_DISTANCE = 5.0  # Distance to consider for group formation
     ADAPTATION_MEMORY = 10  # How many past data points to consider
+    VECTORIZE_MIN_WAYPOINTS = 4  # Below this the scalar waypoint scan is cheaper
+    
+    # Coordinated search offsets around the target: N, E, S, W (bit 0..3)
+    SEARCH_OFFSETS = ((0, -3), (3, 0), (0, 3), (-3, 0))
+    # (sign dx, sign dy) of an ally's zone -> bitmask of offsets it covers.
+    # Diagonals cover both neighbouring cardinals.
+    _DIR_TO_OFFSET_MASK = {
+        (0, -1): 0b0001, (1, 0): 0b0010, (0, 1): 0b0100, (-1, 0): 0b1000,
+        (1, -1): 0b0011, (1, 1): 0b0110, (-1, 1): 0b1100, (-1, -1): 0b1001,
+        (0, 0): 0b0000,
+    }
     
     def __init__(self):
         # Adaptive state
@@ -36,18 +50,37 @@ class AdaptiveMixin:
         self.assigned_search_zone: Optional[Tuple[int, int]] = None
         self.last_adaptation_time = 0.0
         self.adaptation_cooldown = 2.0  # Seconds between adaptation updates
+        self._waypoint_arr: Optional[np.ndarray] = None  # Cached existing_waypoints
+        self._waypoint_src: Optional[List[Tuple[float, float]]] = None  # What it was built from
+        self._tracker = None  # game.behavior_tracker, looked up on first use
+        
+    def _get_tracker(self, game):
+        """Return the game's behavior tracker, caching the reference once found."""
+        tracker = self._tracker
+        if tracker is None:
+            tracker = self._tracker = getattr(game, 'behavior_tracker', None)
+        return tracker
         
     def get_player_tendencies(self, game) -> dict:
         """Get player behavior data from tracker."""
-        if hasattr(game, 'behavior_tracker') and game.behavior_tracker:
-            return game.behavior_tracker.get_player_tendencies()
-        return {}
+        tracker = self._get_tracker(game)
+        if tracker is None:
+            return {}
+        return tracker.get_player_tendencies()
     
     def get_likely_hiding_spots(self, game, top_n: int = 3) -> List[Tuple[int, int]]:
         """Get the most likely hiding spots based on player behavior."""
-        if hasattr(game, 'behavior_tracker') and game.behavior_tracker:
-            return game.behavior_tracker.get_likely_hiding_spots(top_n)
-        return []
+        tracker = self._get_tracker(game)
+        if tracker is None:
+            return []
+        return tracker.get_likely_hiding_spots(top_n)
+    
+    def get_likely_hiding_spots_array(self, game, top_n: int = 3) -> np.ndarray:
+        """Array form of get_likely_hiding_spots, shape (N, 2)."""
+        tracker = self._get_tracker(game)
+        if tracker is None:
+            return np.empty((0, 2), dtype=np.int32)
+        return tracker.get_likely_hiding_spots_array(top_n)
     
     def get_danger_zones(self, game) -> List[Tuple[int, int]]:
         """Get locations where player has died or taken damage."""
@@ -56,9 +89,17 @@ class AdaptiveMixin:
     
     def get_hot_zones(self, game, min_visits: int = 3) -> List[Tuple[int, int]]:
         """Get frequently visited positions."""
-        if hasattr(game, 'behavior_tracker') and game.behavior_tracker:
-            return game.behavior_tracker.get_hot_zones(min_visits)
-        return []
+        tracker = self._get_tracker(game)
+        if tracker is None:
+            return []
+        return tracker.get_hot_zones(min_visits)
+    
+    def get_hot_zones_array(self, game, min_visits: int = 3) -> np.ndarray:
+        """Array form of get_hot_zones, shape (N, 2)."""
+        tracker = self._get_tracker(game)
+        if tracker is None:
+            return np.empty((0, 2), dtype=np.int32)
+        return tracker.get_hot_zones_array(min_visits)
     
     def should_check_hiding_spot(self) -> bool:
         """Decide whether to prioritize checking a hiding spot."""
@@ -73,31 +114,29 @@ class AdaptiveMixin:
         2. Hot zones (frequently visited areas)
         3. Danger zones (where player has died/taken damage)
         """
+        cx, cy = current_pos[0], current_pos[1]
+        
         # Get hiding spots
-        hiding_spots = self.get_likely_hiding_spots(game)
-        unchecked_spots = [s for s in hiding_spots if s not in self.checked_hiding_spots]
+        hiding_spots = self.get_likely_hiding_spots_array(game)
+        if len(hiding_spots) and self.checked_hiding_spots:
+            unchecked = np.fromiter(
+                ((x, y) not in self.checked_hiding_spots for x, y in hiding_spots.tolist()),
+                dtype=bool, count=len(hiding_spots)
+            )
+            hiding_spots = hiding_spots[unchecked]
         
-        if unchecked_spots and self.should_check_hiding_spot():
+        if len(hiding_spots) and self.should_check_hiding_spot():
             # Prioritize closest unchecked hiding spot
-            target = min(unchecked_spots, 
-                        key=lambda s: abs(s[0] - current_pos[0]) + abs(s[1] - current_pos[1]))
+            target = tuple(hiding_spots[closest_index(hiding_spots, cx, cy)].tolist())
             self.checked_hiding_spots.add(target)
             return target
         
         # Check hot zones next
-        hot_zones = self.get_hot_zones(game)
-        if hot_zones:
+        hot_zones = self.get_hot_zones_array(game)
+        if len(hot_zones):
             # Pick a random hot zone weighted by proximity
-            weights = [1.0 / (1 + abs(z[0] - current_pos[0]) + abs(z[1] - current_pos[1])) 
-                      for z in hot_zones]
-            total = sum(weights)
-            if total > 0:
-                r = random.random() * total
-                cumsum = 0
-                for i, w in enumerate(weights):
-                    cumsum += w
-                    if r <= cumsum:
-                        return hot_zones[i]
+            i = weighted_pick(hot_zones, cx, cy, random.random())
+            return tuple(hot_zones[i].tolist())
         
         return None
     
@@ -113,21 +152,46 @@ class AdaptiveMixin:
             # Add a danger zone to patrol
             zone = random.choice(danger_zones)
             # Check if far enough from existing waypoints
-            min_dist = float('inf')
-            for wp in existing_waypoints:
-                dist = abs(wp[0] - zone[0]) + abs(wp[1] - zone[1])
-                min_dist = min(min_dist, dist)
+            if len(existing_waypoints) >= self.VECTORIZE_MIN_WAYPOINTS:
+                waypoints = self._get_waypoint_array(existing_waypoints)
+                target = np.array([zone], dtype=np.float32).reshape(1, 2)
+                min_dist = float(nearest_distances(waypoints, target)[0])
+            else:
+                min_dist = float('inf')
+                for wp in existing_waypoints:
+                    dist = abs(wp[0] - zone[0]) + abs(wp[1] - zone[1])
+                    min_dist = min(min_dist, dist)
             
             if min_dist > 3:  # Not too close to existing waypoints
                 return (float(zone[0]) + 0.5, float(zone[1]) + 0.5)
         
         return None
     
+    def _get_waypoint_array(self, existing_waypoints: List[Tuple[float, float]]) -> np.ndarray:
+        """Return existing_waypoints as (N, 2) float32, rebuilt whenever their contents change."""
+        arr = self._waypoint_arr
+        if arr is None or self._waypoint_src != existing_waypoints:
+            arr = np.asarray(existing_waypoints, dtype=np.float32).reshape(-1, 2)
+            self._waypoint_arr = arr
+            # A copy, so in-place edits to the caller's list are noticed
+            self._waypoint_src = list(existing_waypoints)
+        return arr
+    
     def find_nearby_allies(self, game, max_distance: float = None) -> List:
         """Find nearby enemy allies for coordination."""
         if max_distance is None:
             max_distance = self.GROUP_DISTANCE
-            
+        
+        # Use the per-frame spatial index when there are enough enemies to
+        # make it worthwhile
+        index = getattr(game, 'enemy_index', None)
+        if index is not None and len(index) >= index.MIN_TREE_SIZE:
+            return [
+                index.enemies[i]
+                for i in index.query_ball_point(self.x, self.y, max_distance)
+                if index.enemies[i] is not self
+            ]
+        
         allies = []
         for enemy in game.enemies:
             if enemy is self:
@@ -151,30 +215,25 @@ class AdaptiveMixin:
         if not allies:
             return target_pos
         
-        # Spread out - each enemy takes a different direction from target
-        offsets = [(0, -3), (3, 0), (0, 3), (-3, 0)]  # N, E, S, W
-        
-        # Find which allies are already assigned directions
-        taken_offsets = set()
+        # Spread out - each enemy takes a different direction from target.
+        # Find which directions allies already cover, as a bitmask
+        taken_mask = 0
         for ally in allies:
-            if hasattr(ally, 'assigned_search_zone') and ally.assigned_search_zone:
-                dx = ally.assigned_search_zone[0] - target_pos[0]
-                dy = ally.assigned_search_zone[1] - target_pos[1]
-                # Normalize to nearest offset
-                for ox, oy in offsets:
-                    if (dx > 0 and ox > 0) or (dx < 0 and ox < 0):
-                        taken_offsets.add((ox, oy))
-                    elif (dy > 0 and oy > 0) or (dy < 0 and oy < 0):
-                        taken_offsets.add((ox, oy))
+            zone = getattr(ally, 'assigned_search_zone', None)
+            if zone:
+                dx = zone[0] - target_pos[0]
+                dy = zone[1] - target_pos[1]
+                taken_mask |= self._DIR_TO_OFFSET_MASK[((dx > 0) - (dx < 0), (dy > 0) - (dy < 0))]
         
-        # Take first available offset
-        for ox, oy in offsets:
-            if (ox, oy) not in taken_offsets:
-                adjusted = (target_pos[0] + ox, target_pos[1] + oy)
-                self.assigned_search_zone = adjusted
-                return adjusted
+        # Take first available offset (lowest clear bit)
+        free = ~taken_mask & 0b1111
+        if not free:
+            return target_pos
         
-        return target_pos
+        ox, oy = self.SEARCH_OFFSETS[(free & -free).bit_length() - 1]
+        adjusted = (target_pos[0] + ox, target_pos[1] + oy)
+        self.assigned_search_zone = adjusted
+        return adjusted
     
     def reset_search_memory(self):
         """Reset adaptive search state for new search."""
@@ -204,14 +263,14 @@ class AdaptiveSearchState:
     
     def __init__(self):
         self.name = "ADAPTIVE_SEARCH"
-        self.enter_time = time.time()
+        self.enter_time = time.monotonic()
         self.duration = 10.0  # Longer search time for adaptive behavior
         self.search_targets: List[Tuple[int, int]] = []
         self.current_target_idx = 0
         
-    def enter(self, enemy):
+    def enter(self, enemy, now: Optional[float] = None):
         """Initialize adaptive search."""
-        self.enter_time = time.time()
+        self.enter_time = time.monotonic() if now is None else now
         self.search_targets = []
         self.current_target_idx = 0
         
@@ -221,13 +280,14 @@ class AdaptiveSearchState:
         
         get_logger().debug("Enemy entering adaptive search mode")
     
-    def update(self, enemy, player, maze, dt, game=None) -> Optional[str]:
+    def update(self, enemy, player, maze, dt, game=None, now: Optional[float] = None) -> Optional[str]:
         """
         Update adaptive search behavior.
         
         Returns next state name or None to stay in current state.
         """
-        from src.core.constants import EnemyState
+        if now is None:
+            now = game.frame_time if game is not None else time.monotonic()
         
         # Check for direct player visibility
         if enemy._can_see_player(player, maze):
@@ -239,7 +299,7 @@ class AdaptiveSearchState:
             return "ALERT"
         
         # Check timer expiry
-        if time.time() - self.enter_time > self.duration:
+        if now - self.enter_time > self.duration:
             return "PATROL"
         
         current_pos = (int(enemy.x), int(enemy.y))
@@ -294,9 +354,9 @@ class AdaptiveSearchState:
         if hasattr(enemy, 'reset_search_memory'):
             enemy.reset_search_memory()
     
-    def is_expired(self) -> bool:
+    def is_expired(self, now: float) -> bool:
         """Check if search duration expired."""
-        return time.time() - self.enter_time > self.duration
+        return now - self.enter_time > self.duration
 
 
 def apply_adaptive_mixin(enemy_class):
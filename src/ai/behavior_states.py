@@ -5,34 +5,112 @@ Implements sophisticated AI state machine for realistic enemy behaviors.
 
 import random
 import time
-from src.utils.grid import GridPos
+from src.utils.grid import GridPos, pack_pos
 from src.ai.pathfinding import AStarPathfinder
+from src.ai._search_kernels import gen_search_positions
+
+# Shared unit-step direction objects, so per-step facing updates don't allocate.
+# These are only ever assigned, never mutated in place.
+_UNIT_DIRECTIONS = {
+    (sx, sy): GridPos(sx, sy) for sx in (-1, 0, 1) for sy in (-1, 0, 1)
+}
+_CARDINAL_DIRECTIONS = [GridPos(0, 1), GridPos(1, 0), GridPos(0, -1), GridPos(-1, 0)]
+
+# Step deltas indexed by walk-mask bit: N, E, S, W
+_DELTAS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+
+def _step_direction(from_pos, to_pos) -> GridPos:
+    """Unit direction (sign of dx, sign of dy) from one position to another."""
+    dx = to_pos.x - from_pos.x
+    dy = to_pos.y - from_pos.y
+    return _UNIT_DIRECTIONS[((dx > 0) - (dx < 0), (dy > 0) - (dy < 0))]
+
+
+def _compute_walk_mask(x: int, y: int, walls) -> int:
+    """4-bit mask of walkable neighbours of (x, y), bit d set for _DELTAS[d]."""
+    height, width = walls.shape
+    mask = 0
+    for d, (dx, dy) in enumerate(_DELTAS):
+        nx, ny = x + dx, y + dy
+        if 0 <= nx < width and 0 <= ny < height and not walls[ny, nx]:
+            mask |= 1 << d
+    return mask
+
+
+def _player_within(enemy, player, radius: float) -> bool:
+    """Cheap squared-distance gate run before the full vision check."""
+    dx = enemy.pos.x - player.pos.x
+    dy = enemy.pos.y - player.pos.y
+    return dx * dx + dy * dy <= radius * radius
+
+
+def _same_cell(a, b) -> bool:
+    """GridPos equality without the __eq__ dispatch and isinstance check."""
+    return a.x == b.x and a.y == b.y
+
 
 class BehaviorState:
     """Base class for enemy behavior states."""
     
     def __init__(self, name: str):
         self.name = name
-        self.enter_time = time.time()
+        self.enter_time = time.monotonic()
         self.duration = 0.0  # 0 = infinite
         
-    def enter(self, enemy):
-        """Called when entering this state."""
-        self.enter_time = time.time()
+    def enter(self, enemy, now: float = None):
+        """Called when entering this state. `now` is the frame's monotonic time."""
+        self.enter_time = time.monotonic() if now is None else now
         
-    def update(self, enemy, player, maze, dt) -> str:
+    def update(self, enemy, player, maze, dt, now: float) -> str:
         """Update behavior. Returns next state name or None to stay."""
         return None
         
     def exit(self, enemy):
         """Called when exiting this state."""
-        pass
+        self._clear_cached_path(enemy)
+        
+    def _step_along_path(self, enemy, target):
+        """
+        Return the next position toward target, or None if there is none.
+        
+        The A* path is cached on the enemy and walked one step per call;
+        it is only recomputed when the target changes, the enemy has left
+        the path, or the path has been used up.
+        """
+        # Positions are compared as packed ints rather than through GridPos.__eq__
+        path = enemy._cached_path
+        path_ids = enemy._cached_path_ids
+        idx = enemy._cached_path_idx
+        target_id = pack_pos(target.x, target.y)
+        if (not path or
+                target_id != enemy._cached_target_id or
+                idx + 1 >= len(path) or
+                pack_pos(enemy.pos.x, enemy.pos.y) != path_ids[idx]):
+            path = enemy.pathfinder.find_path(enemy.pos, target)
+            idx = 0
+            enemy._cached_path = path
+            enemy._cached_path_ids = [pack_pos(p.x, p.y) for p in path]
+            enemy._cached_target_id = target_id
+        
+        if idx + 1 >= len(path):
+            return None
+        
+        enemy._cached_path_idx = idx + 1
+        return path[idx + 1]
         
-    def is_expired(self) -> bool:
+    def _clear_cached_path(self, enemy):
+        """Drop any path cached by _step_along_path."""
+        enemy._cached_path = []
+        enemy._cached_path_ids = []
+        enemy._cached_target_id = -1
+        enemy._cached_path_idx = 0
+        
+    def is_expired(self, now: float) -> bool:
         """Check if state duration has expired."""
         if self.duration <= 0:
             return False
-        return time.time() - self.enter_time >= self.duration
+        return now - self.enter_time >= self.duration
 
 class PatrolState(BehaviorState):
     """Enemy patrols predefined waypoints."""
@@ -40,31 +118,34 @@ class PatrolState(BehaviorState):
     def __init__(self):
         super().__init__("PATROL")
         
-    def enter(self, enemy):
-        super().enter(enemy)
-        if not hasattr(enemy, 'patrol_waypoints') or not enemy.patrol_waypoints:
+    def enter(self, enemy, now: float = None):
+        super().enter(enemy, now)
+        if not enemy.patrol_waypoints:
             self._generate_patrol_route(enemy)
         enemy.patrol_index = 0
         enemy.patrol_wait_time = 0
         
-    def update(self, enemy, player, maze, dt) -> str:
+    def update(self, enemy, player, maze, dt, now: float) -> str:
         # Check for player detection
-        if hasattr(enemy, 'vision_system'):
-            detection = enemy.vision_system.can_detect_player(
+        vision = enemy.vision_system
+        detection_range = enemy.detection_range
+        if vision is not None and _player_within(enemy, player, detection_range):
+            detection = vision.can_detect_player(
                 enemy.pos, player.pos, 
-                vision_type="cone" if hasattr(enemy, 'facing_direction') else "omnidirectional",
-                facing_direction=getattr(enemy, 'facing_direction', None),
-                detection_range=enemy.detection_range
+                vision_type="cone" if enemy.facing_direction is not None else "omnidirectional",
+                facing_direction=enemy.facing_direction,
+                detection_range=detection_range
             )
             
+            confidence = detection.confidence
+            
             # Apply stealth modifiers to detection
-            if detection['detected'] and hasattr(player, 'stealth_mechanics'):
-                stealth_modifier = player.stealth_mechanics.get_detection_modifier_for_enemy(enemy, player)
-                detection['confidence'] *= stealth_modifier
+            if detection.detected and player.stealth_mechanics is not None:
+                confidence *= player.stealth_mechanics.get_detection_modifier_for_enemy(enemy, player)
             
-            if detection['detected'] and detection['confidence'] > 0.7:
+            if detection.detected and confidence > 0.7:
                 enemy.last_known_player_pos = player.pos
-                enemy.detection_confidence = detection['confidence']
+                enemy.detection_confidence = confidence
                 return "ALERT"
         
         # Handle patrol movement
@@ -74,7 +155,7 @@ class PatrolState(BehaviorState):
         current_target = enemy.patrol_waypoints[enemy.patrol_index]
         
         # Check if reached current waypoint
-        if enemy.pos == current_target:
+        if _same_cell(enemy.pos, current_target):
             enemy.patrol_wait_time += dt
             
             # Wait at waypoint for realistic behavior
@@ -85,7 +166,7 @@ class PatrolState(BehaviorState):
                 enemy.patrol_wait_time = 0
                 
                 # Update facing direction for cone vision
-                if hasattr(enemy, 'facing_direction') and enemy.patrol_waypoints:
+                if enemy.facing_direction is not None and enemy.patrol_waypoints:
                     next_waypoint = enemy.patrol_waypoints[enemy.patrol_index]
                     direction = GridPos(
                         next_waypoint.x - enemy.pos.x,
@@ -95,15 +176,15 @@ class PatrolState(BehaviorState):
                         enemy.facing_direction = direction
         else:
             # Move toward current target
-            if hasattr(enemy, 'pathfinder') and enemy.pathfinder:
-                path = enemy.pathfinder.find_path(enemy.pos, current_target)
-                if len(path) > 1:
-                    enemy.pos = path[1]
+            if enemy.pathfinder:
+                next_pos = self._step_along_path(enemy, current_target)
+                if next_pos is not None:
+                    prev_pos = enemy.pos
+                    enemy.pos = next_pos
                     
                     # Update facing direction
-                    if hasattr(enemy, 'facing_direction'):
-                        direction = GridPos(path[1].x - path[0].x, path[1].y - path[0].y)
-                        enemy.facing_direction = direction
+                    if enemy.facing_direction is not None:
+                        enemy.facing_direction = _step_direction(prev_pos, next_pos)
         
         return None
         
@@ -134,56 +215,57 @@ class AlertState(BehaviorState):
         super().__init__("ALERT")
         self.duration = 5.0  # 5 seconds of alert
         
-    def enter(self, enemy):
-        super().enter(enemy)
+    def enter(self, enemy, now: float = None):
+        super().enter(enemy, now)
         enemy.move_speed_multiplier = 1.3  # Move faster when alert
         
-    def update(self, enemy, player, maze, dt) -> str:
+    def update(self, enemy, player, maze, dt, now: float) -> str:
         # Check for direct player sight
-        if hasattr(enemy, 'vision_system'):
-            detection = enemy.vision_system.can_detect_player(
+        vision = enemy.vision_system
+        detection_range = enemy.detection_range * 1.5  # Extended alert range
+        if vision is not None and _player_within(enemy, player, detection_range):
+            detection = vision.can_detect_player(
                 enemy.pos, player.pos,
-                detection_range=enemy.detection_range * 1.5  # Extended alert range
+                detection_range=detection_range
             )
             
+            confidence = detection.confidence
+            
             # Apply stealth modifiers
-            if detection['detected'] and hasattr(player, 'stealth_mechanics'):
-                stealth_modifier = player.stealth_mechanics.get_detection_modifier_for_enemy(enemy, player)
-                detection['confidence'] *= stealth_modifier
+            if detection.detected and player.stealth_mechanics is not None:
+                confidence *= player.stealth_mechanics.get_detection_modifier_for_enemy(enemy, player)
             
-            if detection['detected'] and detection['confidence'] > 0.8:
+            if detection.detected and confidence > 0.8:
                 enemy.last_known_player_pos = player.pos
                 return "CHASE"
         
         # Check if this is a sound investigation (for Sound Hunters)
         investigation_target = None
-        if (hasattr(enemy, 'last_heard_sound_pos') and 
-            enemy.last_heard_sound_pos and
-            hasattr(enemy, 'sound_investigation_timer') and
-            enemy.sound_investigation_timer > 0):
+        if enemy.last_heard_sound_pos and enemy.sound_investigation_timer > 0:
             investigation_target = enemy.last_heard_sound_pos
-        elif hasattr(enemy, 'last_known_player_pos') and enemy.last_known_player_pos:
+        elif enemy.last_known_player_pos:
             investigation_target = enemy.last_known_player_pos
         
         # Move toward investigation target
         if investigation_target:
-            if enemy.pos == investigation_target:
+            if _same_cell(enemy.pos, investigation_target):
                 # Reached investigation spot, start searching
                 return "SEARCH"
             else:
                 # Move toward investigation target
-                if hasattr(enemy, 'pathfinder') and enemy.pathfinder:
-                    path = enemy.pathfinder.find_path(enemy.pos, investigation_target)
-                    if len(path) > 1:
-                        enemy.pos = path[1]
+                if enemy.pathfinder:
+                    next_pos = self._step_along_path(enemy, investigation_target)
+                    if next_pos is not None:
+                        enemy.pos = next_pos
         
         # Return to patrol if alert time expired
-        if self.is_expired():
+        if self.is_expired(now):
             return "PATROL"
         
         return None
         
     def exit(self, enemy):
+        super().exit(enemy)
         enemy.move_speed_multiplier = 1.0  # Reset speed
 
 class SearchState(BehaviorState):
@@ -193,20 +275,22 @@ class SearchState(BehaviorState):
         super().__init__("SEARCH")
         self.duration = 8.0  # 8 seconds of searching
         
-    def enter(self, enemy):
-        super().enter(enemy)
+    def enter(self, enemy, now: float = None):
+        super().enter(enemy, now)
         enemy.search_positions = self._generate_search_positions(enemy)
         enemy.search_index = 0
         
-    def update(self, enemy, player, maze, dt) -> str:
+    def update(self, enemy, player, maze, dt, now: float) -> str:
         # Check for player detection during search
-        if hasattr(enemy, 'vision_system'):
-            detection = enemy.vision_system.can_detect_player(
+        vision = enemy.vision_system
+        detection_range = enemy.detection_range * 0.8  # Slightly reduced while searching
+        if vision is not None and _player_within(enemy, player, detection_range):
+            detection = vision.can_detect_player(
                 enemy.pos, player.pos,
-                detection_range=enemy.detection_range * 0.8  # Slightly reduced while searching
+                detection_range=detection_range
             )
             
-            if detection['detected'] and detection['confidence'] > 0.9:
+            if detection.detected and detection.confidence > 0.9:
                 enemy.last_known_player_pos = player.pos
                 return "CHASE"
         
@@ -220,52 +304,55 @@ class SearchState(BehaviorState):
                     if sound_intensity > 10:  # Lower threshold during search
                         enemy.last_heard_sound_pos = sound.pos
                         # Move towards sound instead of continuing search pattern
-                        if hasattr(enemy, 'pathfinder') and enemy.pathfinder:
-                            path = enemy.pathfinder.find_path(enemy.pos, sound.pos)
-                            if len(path) > 1:
-                                next_pos = path[1]
-                                if enemy.can_move_to(next_pos, maze):
+                        if enemy.pathfinder:
+                            next_pos = self._step_along_path(enemy, sound.pos)
+                            if next_pos is not None:
+                                if hasattr(enemy, 'can_move_to') and enemy.can_move_to(next_pos, maze):
+                                    enemy.facing_direction = _step_direction(enemy.pos, next_pos)
                                     enemy.pos = next_pos
-                                    enemy.facing_direction = GridPos(
-                                        next_pos.x - enemy.pos.x, 
-                                        next_pos.y - enemy.pos.y
-                                    )
                         return None  # Stay in search but move towards sound
         
         # Search behavior - check multiple positions
-        if hasattr(enemy, 'search_positions') and enemy.search_positions:
+        if enemy.search_positions:
             if enemy.search_index < len(enemy.search_positions):
                 target = enemy.search_positions[enemy.search_index]
                 
-                if enemy.pos == target:
+                if _same_cell(enemy.pos, target):
                     # Brief pause at search position instead of sleep
                     enemy.search_index += 1
                 else:
                     # Move to search position
-                    if hasattr(enemy, 'pathfinder') and enemy.pathfinder:
-                        path = enemy.pathfinder.find_path(enemy.pos, target)
-                        if len(path) > 1:
-                            next_pos = path[1]
-                            if enemy.can_move_to(next_pos, maze):
+                    if enemy.pathfinder:
+                        next_pos = self._step_along_path(enemy, target)
+                        if next_pos is not None:
+                            if hasattr(enemy, 'can_move_to') and enemy.can_move_to(next_pos, maze):
                                 enemy.pos = next_pos
         
         # Give up searching after duration
-        if self.is_expired():
+        if self.is_expired(now):
             return "PATROL"
         
         return None
         
     def _generate_search_positions(self, enemy):
         """Generate positions to search around last known player location."""
-        search_positions = []
-        if not hasattr(enemy, 'last_known_player_pos') or enemy.last_known_player_pos is None:
+        if enemy.last_known_player_pos is None:
             # Use current position as fallback
             center = enemy.pos
         else:
             center = enemy.last_known_player_pos
         search_radius = 3
         
-        # Create search pattern around last known position
+        walls = enemy.wall_grid
+        if walls is not None:
+            rows = gen_search_positions(
+                int(center.x), int(center.y), search_radius, walls,
+                int(enemy.pos.x), int(enemy.pos.y), 6
+            )
+            return [GridPos(int(x), int(y)) for x, y in rows]
+        
+        # No wall grid available - fall back to per-cell walkability checks
+        search_positions = []
         for dx in range(-search_radius, search_radius + 1):
             for dy in range(-search_radius, search_radius + 1):
                 if dx == 0 and dy == 0:
@@ -287,34 +374,40 @@ class ChaseState(BehaviorState):
     def __init__(self):
         super().__init__("CHASE")
         
-    def enter(self, enemy):
-        super().enter(enemy)
+    def enter(self, enemy, now: float = None):
+        super().enter(enemy, now)
         enemy.move_speed_multiplier = 1.5  # Faster during chase
-        enemy.chase_start_time = time.time()
+        enemy.chase_start_time = self.enter_time
         
-    def update(self, enemy, player, maze, dt) -> str:
-        chase_duration = time.time() - enemy.chase_start_time
+    def update(self, enemy, player, maze, dt, now: float) -> str:
+        chase_duration = now - enemy.chase_start_time
         
         # Check for continued sight of player
-        if hasattr(enemy, 'vision_system'):
-            detection = enemy.vision_system.can_detect_player(
-                enemy.pos, player.pos,
-                detection_range=enemy.detection_range * 1.2
-            )
+        vision = enemy.vision_system
+        if vision is not None:
+            detection_range = enemy.detection_range * 1.2
+            # Out of range counts as not seen, without running the LOS check
+            detected = (_player_within(enemy, player, detection_range) and
+                        vision.can_detect_player(
+                            enemy.pos, player.pos,
+                            detection_range=detection_range
+                        ).detected)
             
-            if detection['detected']:
+            if detected:
                 enemy.last_known_player_pos = player.pos
-                enemy.chase_start_time = time.time()  # Reset chase timer
+                enemy.chase_start_time = now  # Reset chase timer
             elif chase_duration > 3.0:  # Lost sight for 3 seconds
                 return "SEARCH"
         
         # Chase movement with pathfinding
-        target = getattr(enemy, 'last_known_player_pos', player.pos)
-        if hasattr(enemy, 'pathfinder') and enemy.pathfinder:
-            path = enemy.pathfinder.find_path(enemy.pos, target)
-            if len(path) > 1:
-                enemy.pos = path[1]
-            elif len(path) == 1:
+        target = enemy.last_known_player_pos
+        if target is None:
+            target = player.pos
+        if enemy.pathfinder:
+            next_pos = self._step_along_path(enemy, target)
+            if next_pos is not None:
+                enemy.pos = next_pos
+            elif _same_cell(enemy.pos, target):
                 # Reached player position, start search
                 return "SEARCH"
         
@@ -325,6 +418,7 @@ class ChaseState(BehaviorState):
         return None
         
     def exit(self, enemy):
+        super().exit(enemy)
         enemy.move_speed_multiplier = 1.0  # Reset speed
 
 class IdleState(BehaviorState):
@@ -333,22 +427,34 @@ class IdleState(BehaviorState):
     def __init__(self):
         super().__init__("IDLE")
         
-    def update(self, enemy, player, maze, dt) -> str:
+    def update(self, enemy, player, maze, dt, now: float) -> str:
         # Check for player detection
-        if hasattr(enemy, 'vision_system'):
-            detection = enemy.vision_system.can_detect_player(
+        vision = enemy.vision_system
+        detection_range = enemy.detection_range
+        if vision is not None and _player_within(enemy, player, detection_range):
+            detection = vision.can_detect_player(
                 enemy.pos, player.pos,
-                detection_range=enemy.detection_range
+                detection_range=detection_range
             )
             
-            if detection['detected'] and detection['confidence'] > 0.6:
+            if detection.detected and detection.confidence > 0.6:
                 enemy.last_known_player_pos = player.pos
                 return "ALERT"
         
         # Random idle movement
         if random.random() < 0.4:  # 40% chance each update
-            directions = [GridPos(0, 1), GridPos(1, 0), GridPos(0, -1), GridPos(-1, 0)]
-            direction = random.choice(directions)
+            walls = enemy.wall_grid
+            if walls is not None:
+                # Choose only among open neighbours from the level's wall bitmap
+                x, y = int(enemy.pos.x), int(enemy.pos.y)
+                mask = _compute_walk_mask(x, y, walls)
+                choices = [d for d in range(4) if mask & (1 << d)]
+                if choices:
+                    dx, dy = _DELTAS[random.choice(choices)]
+                    enemy.pos = GridPos(x + dx, y + dy)
+                return None
+            
+            direction = random.choice(_CARDINAL_DIRECTIONS)
             new_pos = enemy.pos + direction
             
             if (hasattr(enemy, 'can_move_to') and
@@ -370,15 +476,24 @@ class BehaviorStateMachine:
         }
         self.current_state = "IDLE"
         
-    def update(self, enemy, player, maze, dt):
-        """Update current state and handle transitions."""
+    def update(self, enemy, player, maze, dt, now: float = None):
+        """
+        Update current state and handle transitions.
+        
+        `now` should be the frame's monotonic timestamp (Game.frame_time) so
+        every enemy shares one clock read per frame.
+        """
+        if now is None:
+            now = time.monotonic()
+        # Expose the level's wall bitmap to states that scan the grid on enter
+        enemy.wall_grid = getattr(maze, 'wall_grid', None)
         current_state_obj = self.states[self.current_state]
-        next_state = current_state_obj.update(enemy, player, maze, dt)
+        next_state = current_state_obj.update(enemy, player, maze, dt, now)
         
         if next_state and next_state in self.states:
-            self.transition_to(enemy, next_state)
+            self.transition_to(enemy, next_state, now)
     
-    def transition_to(self, enemy, new_state: str):
+    def transition_to(self, enemy, new_state: str, now: float = None):
         """Transition to a new state."""
         if new_state not in self.states:
             return
@@ -388,11 +503,12 @@ class BehaviorStateMachine:
         
         # Enter new state
         self.current_state = new_state
-        self.states[self.current_state].enter(enemy)
+        self.states[self.current_state].enter(enemy, now)
         
         # Update enemy state property
         enemy.state = self.current_state
     
     def get_current_state(self) -> str:
         """Get current state name."""
-        return self.current_state
\ No newline at end of file
+        return self.current_state
+
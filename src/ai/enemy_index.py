@@ -0,0 +1,62 @@
+"""
+Enemy Spatial Index
+Per-frame index over live enemy positions for fast "nearby ally" queries.
+"""
+
+from typing import List
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is optional - fall back to a vectorized scan
+    cKDTree = None
+
+
+class EnemySpatialIndex:
+    """
+    Snapshot of alive enemy positions, rebuilt once per AI tick.
+
+    Positions are stored as an (N, 2) float32 array. When scipy is available
+    a cKDTree is built over it; otherwise radius queries use a single NumPy
+    distance pass instead of a Python loop.
+    """
+
+    # Below this many enemies a plain Python scan beats building the tree
+    MIN_TREE_SIZE = 8
+
+    def __init__(self):
+        self.enemies: List = []
+        self.positions = np.empty((0, 2), dtype=np.float32)
+        self._kdtree = None
+
+    def __len__(self) -> int:
+        return len(self.enemies)
+
+    def rebuild(self, enemies: list):
+        """Snapshot alive enemies and rebuild the index."""
+        self.enemies = [e for e in enemies if e.is_alive]
+        count = len(self.enemies)
+        self._kdtree = None
+
+        if count == 0:
+            self.positions = np.empty((0, 2), dtype=np.float32)
+            return
+
+        self.positions = np.array(
+            [(e.pos.x, e.pos.y) for e in self.enemies], dtype=np.float32
+        )
+        if cKDTree is not None and count >= self.MIN_TREE_SIZE:
+            self._kdtree = cKDTree(self.positions)
+
+    def query_ball_point(self, x: float, y: float, radius: float) -> List[int]:
+        """Return indices (into self.enemies) of enemies within radius of (x, y)."""
+        if not self.enemies:
+            return []
+
+        if self._kdtree is not None:
+            return self._kdtree.query_ball_point((x, y), radius)
+
+        dx = self.positions[:, 0] - x
+        dy = self.positions[:, 1] - y
+        return np.flatnonzero(dx * dx + dy * dy <= radius * radius).tolist()
@@ -3,15 +3,103 @@ Line of Sight Detection System
 Implements raycasting for realistic enemy vision with obstacle blocking.
 """
 
+from typing import Dict, NamedTuple, Optional, Sequence
+
+import numpy as np
+
 from src.utils.grid import GridPos
 from src.core.constants import CellType
+from src.ai._raycast_nb import raycast, raycast_many
 import math
 
+
+class Detection(NamedTuple):
+    """Result of VisionSystem.can_detect_player."""
+    detected: bool
+    confidence: float
+    type: str
+
+
+# Shared results for the no-detection cases, so misses don't allocate
+_OUT_OF_RANGE = Detection(False, 0.0, 'out_of_range')
+_BLOCKED = Detection(False, 0.0, 'blocked')
+_OUTSIDE_CONE = Detection(False, 0.0, 'outside_cone')
+_LIMITED_RANGE = Detection(False, 0.0, 'limited_range')
+
+# Offset grids for vision cone queries, indexed [dx + r, dy + r]; built once
+_CONE_MAX_RADIUS = 16
+
+
+def _offset_grids(radius: int):
+    """Return (dx, dy, dist2, angle) arrays covering [-radius, radius]^2."""
+    span = np.arange(-radius, radius + 1)
+    dx, dy = np.meshgrid(span, span, indexing='ij')
+    return dx, dy, dx * dx + dy * dy, np.arctan2(dy, dx)
+
+
+_CONE_GRIDS = _offset_grids(_CONE_MAX_RADIUS)
+
+
 class LineOfSight:
     """Handles line of sight calculations with raycasting."""
     
     def __init__(self, maze):
         self.maze = maze
+        self.blocker = np.ones((0, 0), dtype=np.uint8)
+        self._rebuild_blocker_grid()
+    
+    @staticmethod
+    def _cell_blocks(cell) -> bool:
+        """Whether a cell blocks sight."""
+        # Walls always block sight
+        if cell.cell_type == CellType.WALL:
+            return True
+        
+        # Doors and Privacy doors only block sight when closed (is_locked=True)
+        if cell.cell_type in (CellType.DOOR, CellType.PRIVACY_DOOR):
+            return getattr(cell, 'is_locked', True)  # Default to blocking if no state
+        
+        return False
+    
+    def _rebuild_blocker_grid(self):
+        """Flatten the maze dict into a (H, W) uint8 grid, 1 = blocks sight."""
+        # Door cells whose grid entry follows the live lock state
+        self._doors: Dict[tuple, object] = {}
+        if not self.maze:
+            self.blocker = np.ones((0, 0), dtype=np.uint8)
+            return
+        
+        width = max(x for x, _ in self.maze) + 1
+        height = max(y for _, y in self.maze) + 1
+        blocker = np.ones((height, width), dtype=np.uint8)  # Missing cells block
+        for (x, y), cell in self.maze.items():
+            if x < 0 or y < 0:
+                continue
+            if cell.cell_type in (CellType.DOOR, CellType.PRIVACY_DOOR):
+                self._doors[(x, y)] = cell
+            if not self._cell_blocks(cell):
+                blocker[y, x] = 0
+        self.blocker = blocker
+    
+    def _sync_doors(self):
+        """Copy the current lock state of every door cell into the grid."""
+        blocker = self.blocker
+        for (x, y), cell in self._doors.items():
+            blocker[y, x] = self._cell_blocks(cell)
+    
+    def blocker_grid(self) -> np.ndarray:
+        """The blocker grid with door cells brought up to date."""
+        self._sync_doors()
+        return self.blocker
+    
+    def mark_dirty(self, x: int, y: int):
+        """Refresh one cell of the blocker grid after its cell type changes."""
+        height, width = self.blocker.shape
+        cell = self.maze.get((x, y))
+        if cell is not None and 0 <= x < width and 0 <= y < height:
+            self.blocker[y, x] = 1 if self._cell_blocks(cell) else 0
+            if cell.cell_type in (CellType.DOOR, CellType.PRIVACY_DOOR):
+                self._doors[(x, y)] = cell
     
     def has_clear_sight(self, start: GridPos, target: GridPos, max_distance: float = 8.0) -> bool:
         """
@@ -43,36 +131,7 @@ class LineOfSight:
         Returns:
             True if ray reaches end without hitting walls
         """
-        x0, y0 = start.x, start.y
-        x1, y1 = end.x, end.y
-        
-        dx = abs(x1 - x0)
-        dy = abs(y1 - y0)
-        
-        sx = 1 if x0 < x1 else -1
-        sy = 1 if y0 < y1 else -1
-        
-        err = dx - dy
-        x, y = x0, y0
-        
-        while True:
-            pos = GridPos(x, y)
-            
-            # Check if current position blocks sight
-            if self._blocks_sight(pos):
-                return False
-            
-            # Reached target
-            if x == x1 and y == y1:
-                return True
-            
-            e2 = 2 * err
-            if e2 > -dy:
-                err -= dy
-                x += sx
-            if e2 < dx:
-                err += dx
-                y += sy
+        return raycast(self.blocker_grid(), int(start.x), int(start.y), int(end.x), int(end.y))
     
     def _blocks_sight(self, pos: GridPos) -> bool:
         """
@@ -84,20 +143,12 @@ class LineOfSight:
         Returns:
             True if position blocks sight
         """
-        if pos not in self.maze:
+        x, y = int(pos.x), int(pos.y)
+        blocker = self.blocker_grid()
+        height, width = blocker.shape
+        if not (0 <= x < width and 0 <= y < height):
             return True  # Outside maze blocks sight
-        
-        cell = self.maze[pos]
-        
-        # Walls always block sight
-        if cell.type == CellType.WALL:
-            return True
-        
-        # Doors and Privacy doors only block sight when closed (is_locked=True)
-        if cell.type in [CellType.DOOR, CellType.PRIVACY_DOOR]:
-            return getattr(cell, 'is_locked', True)  # Default to blocking if no state
-        
-        return False
+        return bool(blocker[y, x])
     
     def get_vision_cone_positions(self, start: GridPos, direction: GridPos, 
                                 cone_angle: float = 90.0, max_distance: float = 6.0) -> list:
@@ -119,34 +170,49 @@ class LineOfSight:
         # Calculate direction angle
         dir_angle = math.atan2(direction.y, direction.x)
         
-        # Check positions in a square around the start
+        # Filter the square around the start by range and cone angle in one pass
         radius = int(max_distance) + 1
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                if dx == 0 and dy == 0:
-                    continue
-                
-                check_pos = GridPos(start.x + dx, start.y + dy)
-                distance = start.distance_to(check_pos)
-                
-                if distance > max_distance:
-                    continue
-                
-                # Check if position is within cone angle
-                pos_angle = math.atan2(dy, dx)
-                angle_diff = abs(pos_angle - dir_angle)
-                
-                # Handle angle wrapping
-                if angle_diff > math.pi:
-                    angle_diff = 2 * math.pi - angle_diff
-                
-                if angle_diff <= cone_rad:
-                    # Check if position has clear sight
-                    if self.has_clear_sight(start, check_pos, max_distance):
-                        visible_positions.append(check_pos)
+        if radius <= _CONE_MAX_RADIUS:
+            lo, hi = _CONE_MAX_RADIUS - radius, _CONE_MAX_RADIUS + radius + 1
+            dx, dy, dist2, angles = (g[lo:hi, lo:hi] for g in _CONE_GRIDS)
+        else:
+            dx, dy, dist2, angles = _offset_grids(radius)
+        
+        angle_diff = np.abs(angles - dir_angle)
+        # Handle angle wrapping
+        angle_diff = np.where(angle_diff > math.pi, 2 * math.pi - angle_diff, angle_diff)
+        
+        candidates = (dist2 <= max_distance * max_distance) & (angle_diff <= cone_rad)
+        candidates[radius, radius] = False  # Skip the start cell itself
+        
+        # Only the survivors need a raycast
+        for ox, oy in zip(dx[candidates].tolist(), dy[candidates].tolist()):
+            check_pos = GridPos(start.x + ox, start.y + oy)
+            if self.has_clear_sight(start, check_pos, max_distance):
+                visible_positions.append(check_pos)
         
         return visible_positions
 
+    def is_in_cone_and_visible(self, start: GridPos, facing: GridPos, target: GridPos,
+                               cone_rad: float, max_distance: float) -> bool:
+        """
+        Single-target version of get_vision_cone_positions: whether target
+        is within max_distance, within cone_rad of facing, and in sight.
+        """
+        dx = target.x - start.x
+        dy = target.y - start.y
+        dist2 = dx * dx + dy * dy
+        if dist2 == 0 or dist2 > max_distance * max_distance:
+            return False
+        
+        angle_diff = abs(math.atan2(dy, dx) - math.atan2(facing.y, facing.x))
+        if angle_diff > math.pi:
+            angle_diff = 2 * math.pi - angle_diff
+        if angle_diff > cone_rad:
+            return False
+        
+        return self._raycast(start, target)
+
 class VisionSystem:
     """Enhanced vision system with different vision types."""
     
@@ -156,7 +222,7 @@ class VisionSystem:
     def can_detect_player(self, enemy_pos: GridPos, player_pos: GridPos, 
                          vision_type: str = "omnidirectional", 
                          facing_direction: GridPos = None,
-                         detection_range: float = 6.0) -> dict:
+                         detection_range: float = 6.0) -> Detection:
         """
         Comprehensive player detection system.
         
@@ -168,45 +234,119 @@ class VisionSystem:
             detection_range: Maximum detection range
             
         Returns:
-            Dict with detection info: {'detected': bool, 'confidence': float, 'type': str}
+            Detection(detected, confidence, type)
         """
         distance = enemy_pos.distance_to(player_pos)
         
         # Base detection check
         if distance > detection_range:
-            return {'detected': False, 'confidence': 0.0, 'type': 'out_of_range'}
+            return _OUT_OF_RANGE
         
         has_sight = self.line_of_sight.has_clear_sight(enemy_pos, player_pos, detection_range)
         
         if not has_sight:
-            return {'detected': False, 'confidence': 0.0, 'type': 'blocked'}
+            return _BLOCKED
         
         # Vision type specific checks
         if vision_type == "omnidirectional":
             confidence = 1.0 - (distance / detection_range)
-            return {'detected': True, 'confidence': confidence, 'type': 'omnidirectional'}
+            return Detection(True, confidence, 'omnidirectional')
             
         elif vision_type == "cone" and facing_direction:
-            # Check if player is in vision cone
-            visible_positions = self.line_of_sight.get_vision_cone_positions(
-                enemy_pos, facing_direction, cone_angle=90.0, max_distance=detection_range
-            )
-            
-            if player_pos in visible_positions:
+            # Check if player is in vision cone. The cone is made of whole
+            # cells, so the player must stand exactly on one.
+            on_cell = (player_pos.x - enemy_pos.x == round(player_pos.x - enemy_pos.x)
+                       and player_pos.y - enemy_pos.y == round(player_pos.y - enemy_pos.y))
+            if on_cell and self.line_of_sight.is_in_cone_and_visible(
+                enemy_pos, facing_direction, player_pos,
+                math.radians(45.0), detection_range
+            ):
                 confidence = 1.0 - (distance / detection_range)
-                return {'detected': True, 'confidence': confidence, 'type': 'cone'}
+                return Detection(True, confidence, 'cone')
             else:
-                return {'detected': False, 'confidence': 0.0, 'type': 'outside_cone'}
+                return _OUTSIDE_CONE
                 
         elif vision_type == "limited":
             # Reduced detection range and confidence
             limited_range = detection_range * 0.7
             if distance <= limited_range:
                 confidence = 0.8 * (1.0 - (distance / limited_range))
-                return {'detected': True, 'confidence': confidence, 'type': 'limited'}
+                return Detection(True, confidence, 'limited')
             else:
-                return {'detected': False, 'confidence': 0.0, 'type': 'limited_range'}
+                return _LIMITED_RANGE
         
         # Default fallback
         confidence = 1.0 - (distance / detection_range)
-        return {'detected': has_sight, 'confidence': confidence, 'type': 'default'}
\ No newline at end of file
+        return Detection(has_sight, confidence, 'default')
+    
+    def batch_detect(self, enemies_xy: np.ndarray, player_xy, ranges: np.ndarray,
+                     vision_types: Optional[Sequence[str]] = None,
+                     facings: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Run can_detect_player for many enemies against one player at once.
+        
+        Range, cone and limited-range filters are vectorized; only enemies
+        that pass them are raycast.
+        
+        Args:
+            enemies_xy: (N, 2) enemy positions
+            player_xy: Player (x, y)
+            ranges: (N,) detection ranges
+            vision_types: Per-enemy vision type (default omnidirectional)
+            facings: (N, 2) facing directions for cone vision; a (0, 0) row
+                means no facing, like passing None
+            
+        Returns:
+            {'detected': (N,) bool, 'confidence': (N,) float32}
+        """
+        xy = np.asarray(enemies_xy, dtype=np.float64).reshape(-1, 2)
+        count = len(xy)
+        ranges = np.broadcast_to(np.asarray(ranges, dtype=np.float64), (count,))
+        px, py = float(player_xy[0]), float(player_xy[1])
+        detected = np.zeros(count, dtype=bool)
+        confidence = np.zeros(count, dtype=np.float32)
+        if count == 0:
+            return {'detected': detected, 'confidence': confidence}
+        
+        offset_x = px - xy[:, 0]
+        offset_y = py - xy[:, 1]
+        distance = np.sqrt(offset_x * offset_x + offset_y * offset_y)
+        passed = distance <= ranges
+        with np.errstate(divide='ignore', invalid='ignore'):
+            conf = 1.0 - distance / ranges
+        
+        if vision_types is not None:
+            types = np.asarray(vision_types, dtype=object)
+            
+            # Cone: the player must sit on a cell of the cone (integer offset,
+            # not the enemy's own cell) within 45 degrees of the facing
+            is_cone = types == "cone"
+            if facings is not None:
+                facings = np.asarray(facings, dtype=np.float64).reshape(-1, 2)
+                is_cone &= (facings != 0).any(axis=1)
+                angle_diff = np.abs(np.arctan2(offset_y, offset_x)
+                                    - np.arctan2(facings[:, 1], facings[:, 0]))
+                angle_diff = np.where(angle_diff > math.pi, 2 * math.pi - angle_diff, angle_diff)
+                on_cell = ((offset_x == np.round(offset_x)) & (offset_y == np.round(offset_y))
+                           & (distance > 0))
+                in_cone = on_cell & (angle_diff <= math.radians(45.0))
+                passed &= ~is_cone | in_cone
+            
+            # Limited: 70% range and 80% confidence
+            is_limited = types == "limited"
+            limited_range = ranges * 0.7
+            passed &= ~is_limited | (distance <= limited_range)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                conf = np.where(is_limited, 0.8 * (1.0 - distance / limited_range), conf)
+        
+        # Raycast only the survivors
+        candidates = np.flatnonzero(passed)
+        if len(candidates):
+            xs = xy[candidates, 0].astype(np.int64)
+            ys = xy[candidates, 1].astype(np.int64)
+            sight = raycast_many(self.line_of_sight.blocker_grid(), xs, ys, int(px), int(py))
+            hits = candidates[sight]
+            detected[hits] = True
+            confidence[hits] = conf[hits]
+        
+        return {'detected': detected, 'confidence': confidence}
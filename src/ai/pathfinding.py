@@ -1,27 +1,25 @@
 """
 A* Pathfinding Algorithm for Smart Enemy AI
 """
-import heapq
 from typing import List, Optional, Tuple, Set
 from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import count
+
+import numpy as np
+
 from src.utils.grid import GridPos
 from src.levels.maze_generator import CellType
+from src.ai._indexed_heap import IndexedMinHeap
 
-class Node:
-    """Node for A* pathfinding algorithm."""
-    
-    def __init__(self, pos: GridPos, g_cost: float = 0, h_cost: float = 0, parent=None):
-        self.pos = pos
-        self.g_cost = g_cost  # Distance from start
-        self.h_cost = h_cost  # Heuristic distance to goal
-        self.f_cost = g_cost + h_cost  # Total cost
-        self.parent = parent
-    
-    def __lt__(self, other):
-        return self.f_cost < other.f_cost
-    
-    def __eq__(self, other):
-        return self.pos == other.pos
+# Walkability mask values
+BLOCKED = 0
+OPEN = 1
+DOOR = 2  # Depends on lock state, so checked against the live cell
+
+# 4-directional movement only; diagonals would need an octile heuristic
+# and corner-cutting checks
+_NEIGHBOR_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
 
 class AStarPathfinder:
     """A* pathfinding implementation for game entities."""
@@ -31,14 +29,61 @@ class AStarPathfinder:
         self.cache = OrderedDict()  # LRU cache for performance
         self.max_cache_size = 500  # Reduced for better memory management
         self.max_iterations = 2000  # Prevent DoS attacks
+        
+        # Movement is 4-directional with unit cost, so Manhattan distance is
+        # the exact obstacle-free cost. Weights above 1.0 (up to ~1.2) shrink
+        # the frontier at the price of slightly longer paths.
+        self.heuristic_weight = 1.0
         self.performance_stats = {
             'total_calls': 0,
             'cache_hits': 0,
             'timeout_failures': 0,
             'cache_evictions': 0
         }
+        
+        # Grid bounds from the maze keys ((x, y) tuples or GridPos)
+        coords = [self._key_xy(key) for key in maze]
+        self.width = max((x for x, _ in coords), default=-1) + 1
+        self.height = max((y for _, y in coords), default=-1) + 1
+        
+        # Flat (y * width + x) scratch arrays reused across searches; only
+        # the cells a search touched are reset afterwards
+        size = self.width * self.height
+        self._closed = np.zeros(size, dtype=bool)
+        self._g = np.full(size, np.inf, dtype=np.float32)
+        self._parent = np.full(size, -1, dtype=np.int32)
+        self._touched: List[int] = []
+        self.refresh_walkable()
     
-    def find_path(self, start: GridPos, goal: GridPos, max_distance: int = 50) -> List[GridPos]:
+    def refresh_walkable(self):
+        """
+        Rebuild the walkability mask from the maze.
+        
+        Door cells are stored as DOOR and re-checked on every visit, so
+        opening or closing doors does not require a refresh; call this only
+        when cell types change (e.g. in the editor).
+        """
+        walkable = np.zeros((self.height, self.width), dtype=np.uint8)
+        for key, cell in self.maze.items():
+            x, y = self._key_xy(key)
+            if x < 0 or y < 0:
+                continue
+            if cell.cell_type in (CellType.DOOR, CellType.PRIVACY_DOOR):
+                walkable[y, x] = DOOR
+            elif cell.is_walkable():
+                walkable[y, x] = OPEN
+        self.walkable = walkable
+        self.cache.clear()
+    
+    @staticmethod
+    def _key_xy(key) -> Tuple[int, int]:
+        """Integer (x, y) of a maze key."""
+        if isinstance(key, GridPos):
+            return key.to_tuple()
+        return int(key[0]), int(key[1])
+    
+    def find_path(self, start: GridPos, goal: GridPos, max_distance: int = 50,
+                  avoid: Optional[Set[Tuple[int, int]]] = None) -> List[GridPos]:
         """
         Find optimal path from start to goal using A* algorithm.
         
@@ -46,18 +91,25 @@ class AStarPathfinder:
             start: Starting position
             goal: Target position
             max_distance: Maximum search distance to prevent infinite loops
+            avoid: Optional set of (x, y) cells treated as blocked; such
+                searches bypass the cache
             
         Returns:
             List of GridPos representing the path, empty list if no path found
         """
         self.performance_stats['total_calls'] += 1
         
-        # Check cache first (LRU: move to end on access)
-        cache_key = (start, goal)
-        if cache_key in self.cache:
+        sx, sy = int(start.x), int(start.y)
+        gx, gy = int(goal.x), int(goal.y)
+        
+        # Check cache first (LRU: move to end on access). Callers consume
+        # paths in place, so always hand out a copy.
+        cache_key = (sx, sy, gx, gy)
+        cached = None if avoid else self.cache.get(cache_key)
+        if cached is not None:
             self.performance_stats['cache_hits'] += 1
             self.cache.move_to_end(cache_key)
-            return self.cache[cache_key]
+            return list(cached)
         
         # Validate inputs
         if not self._is_valid_position(start) or not self._is_valid_position(goal):
@@ -66,63 +118,85 @@ class AStarPathfinder:
         if start == goal:
             return [start]
         
-        # Initialize A* structures
-        open_set = []
-        closed_set: Set[GridPos] = set()
+        start_idx = sy * self.width + sx
+        self._g[start_idx] = 0.0
+        self._touched.append(start_idx)
         
-        start_node = Node(start, 0, self._heuristic(start, goal))
-        heapq.heappush(open_set, start_node)
+        try:
+            path = self._search(start_idx, gx, gy, max_distance, avoid)
+        finally:
+            touched = self._touched
+            self._closed[touched] = False
+            self._g[touched] = np.inf
+            self._parent[touched] = -1
+            touched.clear()
         
-        node_map = {start: start_node}
+        if path and not avoid:
+            # Paths are symmetric, so also serve the reverse query
+            self._cache_store(cache_key, path)
+            self._cache_store((gx, gy, sx, sy), path[::-1])
+            return list(path)
+        
+        return path
+    
+    def _search(self, start_idx: int, gx: int, gy: int,
+                max_distance: int, avoid: Optional[Set[Tuple[int, int]]] = None) -> List[GridPos]:
+        """A* main loop over the flat scratch arrays prepared by find_path."""
+        closed, g_grid, parent = self._closed, self._g, self._parent
+        touched = self._touched
+        width = self.width
+        
+        # Priorities are (f_cost, insertion order) so ties pop first-in-first-out
+        open_set = IndexedMinHeap()
+        tie_break = count()
+        weight = self.heuristic_weight
+        sx, sy = start_idx % width, start_idx // width
+        open_set.push(start_idx, (weight * (abs(sx - gx) + abs(sy - gy)), next(tie_break)))
         iterations = 0
         
         while open_set and iterations < self.max_iterations:
-            # Get node with lowest f_cost
-            current = heapq.heappop(open_set)
+            # Get cell with lowest f_cost
+            current, _ = open_set.pop()
+            cy, cx = divmod(current, width)
             
             # Check if we've reached the goal
-            if current.pos == goal:
-                path = self._reconstruct_path(current)
-                
-                # Cache the result with LRU eviction
-                if len(self.cache) >= self.max_cache_size:
-                    # Remove oldest entry (FIFO in OrderedDict)
-                    self.cache.popitem(last=False)
-                    self.performance_stats['cache_evictions'] += 1
-                self.cache[cache_key] = path
-                
-                return path
+            if cx == gx and cy == gy:
+                return self._reconstruct_path(current)
             
-            closed_set.add(current.pos)
+            closed[current] = True
             iterations += 1
             
-            # Check neighbors
-            for neighbor_pos in self._get_neighbors(current.pos):
-                if neighbor_pos in closed_set:
+            current_g = float(g_grid[current])
+            budget = max_distance - current_g
+            
+            # Jump along each direction to the next cell where the path
+            # could turn, instead of expanding every corridor tile
+            for dx, dy in _NEIGHBOR_OFFSETS:
+                jump = self._jump(cx, cy, dx, dy, gx, gy, budget, avoid)
+                if jump is None:
                     continue
                 
-                if not self._is_walkable(neighbor_pos):
+                nx, ny, steps = jump
+                neighbor = ny * width + nx
+                if closed[neighbor]:
                     continue
                 
-                # Calculate costs
-                g_cost = current.g_cost + self._distance(current.pos, neighbor_pos)
-                h_cost = self._heuristic(neighbor_pos, goal)
+                g_cost = current_g + steps
                 
-                # Skip if this would exceed max distance
-                if g_cost > max_distance:
+                # Check if this path to neighbor is better
+                known_g = g_grid[neighbor]
+                if g_cost >= known_g:
                     continue
                 
-                # Check if this path to neighbor is better
-                if neighbor_pos in node_map:
-                    neighbor_node = node_map[neighbor_pos]
-                    if g_cost < neighbor_node.g_cost:
-                        neighbor_node.g_cost = g_cost
-                        neighbor_node.f_cost = g_cost + h_cost
-                        neighbor_node.parent = current
+                if known_g == np.inf:
+                    touched.append(neighbor)
+                g_grid[neighbor] = g_cost
+                parent[neighbor] = current
+                priority = (g_cost + weight * (abs(nx - gx) + abs(ny - gy)), next(tie_break))
+                if neighbor in open_set:
+                    open_set.decrease_key(neighbor, priority)
                 else:
-                    neighbor_node = Node(neighbor_pos, g_cost, h_cost, current)
-                    node_map[neighbor_pos] = neighbor_node
-                    heapq.heappush(open_set, neighbor_node)
+                    open_set.push(neighbor, priority)
         
         # No path found (or timed out)
         if iterations >= self.max_iterations:
@@ -130,6 +204,51 @@ class AStarPathfinder:
             
         return []
     
+    def _cache_store(self, key: tuple, path: List[GridPos]):
+        """Insert a path, evicting least recently used entries past the limit."""
+        self.cache[key] = path
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_cache_size:
+            self.cache.popitem(last=False)
+            self.performance_stats['cache_evictions'] += 1
+    
+    def _passable(self, x: int, y: int) -> bool:
+        """Mask lookup with bounds and live door checks."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        state = self.walkable[y, x]
+        if state == DOOR:
+            return self.maze[(x, y)].is_walkable()
+        return state == OPEN
+    
+    def _jump(self, x: int, y: int, dx: int, dy: int, gx: int, gy: int,
+              budget: float, avoid: Optional[Set[Tuple[int, int]]] = None
+              ) -> Optional[Tuple[int, int, int]]:
+        """
+        Walk from (x, y) along (dx, dy) to the next jump point.
+        
+        A jump point is the goal or any cell with an open side neighbour
+        (where an optimal path may turn). Cells in between only allow going
+        straight on, so skipping them keeps the search optimal on a
+        4-connected grid. Returns (x, y, steps) or None on a dead end or
+        when the step budget runs out.
+        """
+        passable = self._passable
+        steps = 0
+        
+        while True:
+            x += dx
+            y += dy
+            steps += 1
+            if steps > budget or not passable(x, y):
+                return None
+            if avoid and (x, y) in avoid:
+                return None
+            if x == gx and y == gy:
+                return x, y, steps
+            if passable(x + dy, y + dx) or passable(x - dy, y - dx):
+                return x, y, steps
+    
     def find_path_avoiding_positions(self, start: GridPos, goal: GridPos, 
                                    avoid_positions: Set[GridPos], 
                                    max_distance: int = 50) -> List[GridPos]:
@@ -145,79 +264,34 @@ class AStarPathfinder:
         Returns:
             List of GridPos representing the path
         """
-        # Temporarily mark avoid positions as non-walkable
-        original_cache = self.cache.copy()
-        self.cache.clear()  # Clear cache since we're changing constraints
-        
-        # Store original maze state
-        original_states = {}
-        for pos in avoid_positions:
-            if pos in self.maze:
-                original_states[pos] = self.maze[pos].type
-                # Temporarily mark as wall
-                self.maze[pos].type = CellType.WALL
-        
-        try:
-            path = self.find_path(start, goal, max_distance)
-        finally:
-            # Restore original maze state
-            for pos, original_type in original_states.items():
-                self.maze[pos].type = original_type
-            
-            # Restore cache
-            self.cache = original_cache
-        
-        return path
-    
-    def _heuristic(self, pos1: GridPos, pos2: GridPos) -> float:
-        """Manhattan distance heuristic."""
-        return abs(pos1.x - pos2.x) + abs(pos1.y - pos2.y)
-    
-    def _distance(self, pos1: GridPos, pos2: GridPos) -> float:
-        """Actual distance between adjacent positions."""
-        dx = abs(pos1.x - pos2.x)
-        dy = abs(pos1.y - pos2.y)
-        
-        # Diagonal movement costs more
-        if dx == 1 and dy == 1:
-            return 1.414  # sqrt(2)
-        else:
-            return 1.0
-    
-    def _get_neighbors(self, pos: GridPos) -> List[GridPos]:
-        """Get all valid neighbor positions."""
-        neighbors = []
-        
-        # 4-directional movement (no diagonals for simplicity)
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        
-        for dx, dy in directions:
-            neighbor = GridPos(pos.x + dx, pos.y + dy)
-            if self._is_valid_position(neighbor):
-                neighbors.append(neighbor)
-        
-        return neighbors
+        avoid = {(int(pos.x), int(pos.y)) for pos in avoid_positions}
+        return self.find_path(start, goal, max_distance, avoid=avoid)
     
     def _is_valid_position(self, pos: GridPos) -> bool:
         """Check if position is within maze bounds."""
-        return pos in self.maze
+        return (0 <= pos.x < self.width and 0 <= pos.y < self.height
+                and (int(pos.x), int(pos.y)) in self.maze)
     
-    def _is_walkable(self, pos: GridPos) -> bool:
-        """Check if position can be walked through."""
-        if not self._is_valid_position(pos):
-            return False
-        
-        cell = self.maze[pos]
-        return cell.is_walkable()
-    
-    def _reconstruct_path(self, end_node: Node) -> List[GridPos]:
-        """Reconstruct path from end node back to start."""
-        path = []
-        current = end_node
+    def _reconstruct_path(self, end: int) -> List[GridPos]:
+        """
+        Reconstruct path from end cell back to start via the parent array,
+        filling in the straight runs between jump points.
+        """
+        width = self.width
+        parent = self._parent
+        y, x = divmod(end, width)
+        path = [GridPos(x, y)]
+        current = int(parent[end])
         
-        while current:
-            path.append(current.pos)
-            current = current.parent
+        while current != -1:
+            py, px = divmod(current, width)
+            step_x = (px > x) - (px < x)
+            step_y = (py > y) - (py < y)
+            while x != px or y != py:
+                x += step_x
+                y += step_y
+                path.append(GridPos(x, y))
+            current = int(parent[current])
         
         path.reverse()
         return path
@@ -226,6 +300,34 @@ class AStarPathfinder:
         """Clear the pathfinding cache."""
         self.cache.clear()
 
+@dataclass
+class PathFollower:
+    """
+    A path plus a cursor to the next waypoint, so following it costs O(1)
+    per step instead of searching the list for the current position.
+    """
+    path: List[GridPos] = field(default_factory=list)
+    cursor: int = 0
+    
+    def __bool__(self) -> bool:
+        return self.cursor < len(self.path)
+    
+    def __len__(self) -> int:
+        return len(self.path) - self.cursor
+    
+    def next(self, current: GridPos) -> Optional[GridPos]:
+        """
+        Waypoint to head for from current, or None when the path is done.
+        
+        Reaching the pending waypoint advances the cursor past it.
+        """
+        path = self.path
+        cursor = self.cursor
+        if cursor < len(path) and path[cursor] == current:
+            cursor += 1
+            self.cursor = cursor
+        return path[cursor] if cursor < len(path) else None
+
 class PathfindingUtils:
     """Utility functions for pathfinding operations."""
     
@@ -253,25 +355,3 @@ class PathfindingUtils:
         
         simplified.append(path[-1])  # Always include end
         return simplified
-    
-    @staticmethod
-    def get_next_move(current_pos: GridPos, path: List[GridPos]) -> Optional[GridPos]:
-        """
-        Get the next position to move to from current position.
-        
-        Args:
-            current_pos: Current position
-            path: Path to follow
-            
-        Returns:
-            Next position to move to, or None if path is complete
-        """
-        if not path or current_pos not in path:
-            return None
-        
-        current_index = path.index(current_pos)
-        
-        if current_index + 1 < len(path):
-            return path[current_index + 1]
-        
-        return None  # Reached end of path
\ No newline at end of file
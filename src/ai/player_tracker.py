@@ -4,11 +4,33 @@ Tracks player patterns to inform enemy learning and LLM strategist.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Optional
-from collections import defaultdict
+from typing import Deque, Dict, List, Tuple, Optional
+from collections import defaultdict, deque
 import math
 import time
 
+import numpy as np
+
+from src.utils.spatial_hash import HashGridIndex
+
+# Bound once at import; record_position runs every frame
+_hypot = math.hypot
+
+# Most recent death/damage/near-miss locations kept per run
+MAX_LOCATION_HISTORY = 200
+
+
+def _location_history(items=()) -> Deque[Tuple[int, int]]:
+    return deque(items, maxlen=MAX_LOCATION_HISTORY)
+
+
+# Visit counts saturate here instead of wrapping around
+_VISIT_CAP = np.iinfo(np.uint16).max
+
+
+def _empty_heatmap() -> np.ndarray:
+    return np.zeros((0, 0), dtype=np.uint16)
+
 
 @dataclass
 class PlayerBehaviorTracker:
@@ -35,12 +57,13 @@ class PlayerBehaviorTracker:
     total_distance: float = 0.0
     
     # Death/near-miss locations
-    death_locations: List[Tuple[int, int]] = field(default_factory=list)
-    near_miss_locations: List[Tuple[int, int]] = field(default_factory=list)  # Spotted but escaped
-    damage_locations: List[Tuple[int, int]] = field(default_factory=list)
+    death_locations: Deque[Tuple[int, int]] = field(default_factory=_location_history)
+    near_miss_locations: Deque[Tuple[int, int]] = field(default_factory=_location_history)  # Spotted but escaped
+    damage_locations: Deque[Tuple[int, int]] = field(default_factory=_location_history)
     
-    # Route preferences - visited positions with frequency
-    visited_positions: Dict[Tuple[int, int], int] = field(default_factory=lambda: defaultdict(int))
+    # Route preferences - per-cell visit counts as a [y, x] heatmap that
+    # grows to fit the positions seen
+    visited: np.ndarray = field(default_factory=_empty_heatmap)
     
     # Door usage
     doors_opened: int = 0
@@ -62,18 +85,43 @@ class PlayerBehaviorTracker:
     _is_hidden: bool = False
     _is_stealthed: bool = False
     
+    # Cached NumPy views for adaptive AI queries, keyed by query parameter
+    _hiding_spots_cache: Dict[int, np.ndarray] = field(default_factory=dict)
+    # Hiding spots by usage, most used first; rebuilt after the next hide
+    _hiding_spots_sorted: Optional[List[Tuple[Tuple[int, int], int]]] = None
+    # Spatial index over hiding_spot_usage for nearest/radius queries
+    _hiding_index: HashGridIndex = field(default_factory=HashGridIndex)
+    _hot_zones_cache: Dict[int, np.ndarray] = field(default_factory=dict)
+    # Memoized get_player_tendencies() result, cleared by every record_* call
+    _tendencies_cache: Optional[dict] = None
+    # (danger_zones, near_miss_zones) summaries; these only change on
+    # deaths, damage and near misses, not on the per-frame record_position
+    _zones_cache: Optional[Tuple[list, list]] = None
+    
     def record_position(self, x: float, y: float, is_stealthed: bool = False, dt: float = 0.0):
         """Record player position and update movement patterns."""
-        grid_pos = (int(x), int(y))
-        self.visited_positions[grid_pos] += 1
+        gx, gy = int(x), int(y)
+        if gx >= 0 and gy >= 0:
+            visited = self.visited
+            if gy >= visited.shape[0] or gx >= visited.shape[1]:
+                visited = self._grow_visited(gx, gy)
+            count = visited[gy, gx]
+            if count < _VISIT_CAP:
+                count += 1
+                visited[gy, gx] = count
+                # A cell only changes a hot-zone result on the visit that
+                # brings it up to that query's threshold
+                if count in self._hot_zones_cache:
+                    self._hot_zones_cache.clear()
+        self._tendencies_cache = None
         
         if self._last_position is not None:
             dx = x - self._last_position[0]
             dy = y - self._last_position[1]
             
-            # Calculate distance moved
-            dist = math.sqrt(dx * dx + dy * dy)
-            self.total_distance += dist
+            # Calculate distance moved (standing still needs no maths)
+            if dx or dy:
+                self.total_distance += _hypot(dx, dy)
             
             # Track direction preferences
             if abs(dx) > 0.1 or abs(dy) > 0.1:
@@ -93,10 +141,24 @@ class PlayerBehaviorTracker:
             self.normal_time += dt
             self._is_stealthed = False
     
+    def _grow_visited(self, x: int, y: int) -> np.ndarray:
+        """Enlarge the heatmap so (x, y) fits, doubling to amortize copies."""
+        height, width = self.visited.shape
+        new_height = max(y + 1, height * 2, 32)
+        new_width = max(x + 1, width * 2, 32)
+        grown = np.zeros((new_height, new_width), dtype=np.uint16)
+        grown[:height, :width] = self.visited
+        self.visited = grown
+        return grown
+    
     def record_hide(self, pos: Tuple[int, int], is_entering: bool):
         """Record hiding behavior."""
+        self._tendencies_cache = None
         if is_entering:
             self.hiding_spot_usage[pos] += 1
+            self._index_hiding_spot(pos)
+            self._hiding_spots_cache.clear()
+            self._hiding_spots_sorted = None
             self.total_hides += 1
             self.last_hide_start = time.time()
             self._is_hidden = True
@@ -105,32 +167,61 @@ class PlayerBehaviorTracker:
                 self.time_spent_hiding += time.time() - self.last_hide_start
             self._is_hidden = False
     
+    def _index_hiding_spot(self, pos):
+        """Mirror one hiding_spot_usage entry into the spatial index."""
+        if isinstance(pos, tuple) and len(pos) == 2:
+            self._hiding_index.set(int(pos[0]), int(pos[1]), self.hiding_spot_usage[pos])
+    
+    def _sorted_hiding_spots(self) -> List[Tuple[Tuple[int, int], int]]:
+        """(pos, count) pairs, most used first, cached until the next hide."""
+        if self._hiding_spots_sorted is None:
+            self._hiding_spots_sorted = sorted(
+                self.hiding_spot_usage.items(),
+                key=lambda x: x[1],
+                reverse=True
+            )
+        return self._hiding_spots_sorted
+    
+    def get_nearest_hiding_spot(self, x: float, y: float,
+                                radius: float = 10.0) -> Optional[Tuple[int, int]]:
+        """Closest hiding spot the player has used within radius, or None."""
+        return self._hiding_index.nearest(x, y, radius)
+    
     def record_death(self, pos: Tuple[int, int]):
         """Record death location."""
+        self._tendencies_cache = None
+        self._zones_cache = None
         self.death_locations.append(pos)
     
     def record_damage(self, pos: Tuple[int, int]):
         """Record location where player took damage."""
+        self._tendencies_cache = None
+        self._zones_cache = None
         self.damage_locations.append(pos)
     
     def record_near_miss(self, pos: Tuple[int, int]):
         """Record location where player was spotted but escaped."""
+        self._tendencies_cache = None
+        self._zones_cache = None
         self.near_miss_locations.append(pos)
     
     def record_door_used(self, was_escaping: bool = False):
         """Record door usage."""
+        self._tendencies_cache = None
         self.doors_opened += 1
         if was_escaping:
             self.doors_used_for_escape += 1
     
     def record_floor_complete(self, time_taken: float):
         """Record floor completion."""
+        self._tendencies_cache = None
         self.floors_completed += 1
         self.total_play_time += time_taken
         self.average_floor_time = self.total_play_time / self.floors_completed
     
     def record_parry(self, success: bool):
         """Record parry attempt result."""
+        self._tendencies_cache = None
         if success:
             self.successful_parries += 1
         else:
@@ -138,6 +229,7 @@ class PlayerBehaviorTracker:
     
     def record_dodge(self):
         """Record dodge attempt."""
+        self._tendencies_cache = None
         self.dodge_attempts += 1
     
     def get_player_tendencies(self) -> dict:
@@ -145,8 +237,12 @@ class PlayerBehaviorTracker:
         Get summary of player tendencies for AI/LLM consumption.
         
         Returns:
-            Dict with player behavior patterns
+            Dict with player behavior patterns. The dict is cached until the
+            next record_* call and shared between callers - do not mutate it.
         """
+        if self._tendencies_cache is not None:
+            return self._tendencies_cache
+        
         total_direction = sum(self.preferred_directions.values()) or 1
         total_time = self.stealth_time + self.normal_time or 1
         
@@ -156,16 +252,15 @@ class PlayerBehaviorTracker:
             hiding_preference = min(1.0, self.time_spent_hiding / (total_time * 0.3))
         
         # Get most used hiding spots
-        favorite_hiding_spots = sorted(
-            self.hiding_spot_usage.items(), 
-            key=lambda x: x[1], 
-            reverse=True
-        )[:5]
+        favorite_hiding_spots = self._sorted_hiding_spots()[:5]
         
         # Get danger zones (where player died or took damage)
-        danger_zones = list(set(self.death_locations + self.damage_locations))
+        if self._zones_cache is None:
+            danger_zones = list(set(self.death_locations) | set(self.damage_locations))
+            self._zones_cache = (danger_zones[-10:], list(self.near_miss_locations)[-10:])
+        danger_zones, near_miss_zones = self._zones_cache
         
-        return {
+        self._tendencies_cache = {
             "hiding_preference": hiding_preference,
             "favorite_hiding_spots": favorite_hiding_spots,
             "stealth_ratio": self.stealth_time / total_time,
@@ -173,8 +268,8 @@ class PlayerBehaviorTracker:
                 d: count / total_direction 
                 for d, count in self.preferred_directions.items()
             },
-            "danger_zones": danger_zones[-10:],  # Last 10 danger locations
-            "near_miss_zones": self.near_miss_locations[-10:],
+            "danger_zones": danger_zones,  # Last 10 danger locations
+            "near_miss_zones": near_miss_zones,
             "total_hides": self.total_hides,
             "floors_completed": self.floors_completed,
             "average_floor_time": self.average_floor_time,
@@ -187,30 +282,39 @@ class PlayerBehaviorTracker:
                 if (self.successful_parries + self.failed_parries) > 0 else 0.5
             ),
         }
+        return self._tendencies_cache
     
     def get_hot_zones(self, min_visits: int = 3) -> List[Tuple[int, int]]:
         """Get frequently visited positions."""
-        return [
-            pos for pos, count in self.visited_positions.items() 
-            if count >= min_visits
-        ]
+        return [tuple(pos) for pos in self.get_hot_zones_array(min_visits).tolist()]
     
     def get_likely_hiding_spots(self, top_n: int = 3) -> List[Tuple[int, int]]:
         """Get the most likely hiding spots based on past behavior."""
-        if not self.hiding_spot_usage:
-            return []
-        
-        sorted_spots = sorted(
-            self.hiding_spot_usage.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        return [pos for pos, _ in sorted_spots[:top_n]]
+        return [pos for pos, _ in self._sorted_hiding_spots()[:top_n]]
+    
+    def get_hot_zones_array(self, min_visits: int = 3) -> np.ndarray:
+        """Hot zones as an (N, 2) int32 array, cached until the next visit."""
+        cached = self._hot_zones_cache.get(min_visits)
+        if cached is None:
+            ys, xs = np.nonzero(self.visited >= min_visits)
+            cached = np.column_stack((xs, ys)).astype(np.int32)
+            self._hot_zones_cache[min_visits] = cached
+        return cached
+    
+    def get_likely_hiding_spots_array(self, top_n: int = 3) -> np.ndarray:
+        """Likely hiding spots as an (N, 2) int32 array, cached until the next hide."""
+        cached = self._hiding_spots_cache.get(top_n)
+        if cached is None:
+            cached = np.array(self.get_likely_hiding_spots(top_n), dtype=np.int32).reshape(-1, 2)
+            self._hiding_spots_cache[top_n] = cached
+        return cached
     
     def reset_for_new_floor(self):
         """Reset per-floor tracking while keeping cross-floor stats."""
         # Keep cumulative stats, reset position tracking
-        self.visited_positions.clear()
+        self.visited.fill(0)
+        self._hot_zones_cache.clear()
+        self._tendencies_cache = None
         self._last_position = None
     
     def to_dict(self) -> dict:
@@ -222,9 +326,9 @@ class PlayerBehaviorTracker:
             "preferred_directions": dict(self.preferred_directions),
             "stealth_time": self.stealth_time,
             "normal_time": self.normal_time,
-            "death_locations": self.death_locations,
-            "near_miss_locations": self.near_miss_locations,
-            "damage_locations": self.damage_locations,
+            "death_locations": list(self.death_locations),
+            "near_miss_locations": list(self.near_miss_locations),
+            "damage_locations": list(self.damage_locations),
             "doors_opened": self.doors_opened,
             "doors_used_for_escape": self.doors_used_for_escape,
             "floors_completed": self.floors_completed,
@@ -241,14 +345,16 @@ class PlayerBehaviorTracker:
             tuple(k) if isinstance(k, list) else k: v 
             for k, v in data.get("hiding_spot_usage", {}).items()
         })
+        for pos in tracker.hiding_spot_usage:
+            tracker._index_hiding_spot(pos)
         tracker.total_hides = data.get("total_hides", 0)
         tracker.time_spent_hiding = data.get("time_spent_hiding", 0.0)
         tracker.preferred_directions = defaultdict(int, data.get("preferred_directions", {}))
         tracker.stealth_time = data.get("stealth_time", 0.0)
         tracker.normal_time = data.get("normal_time", 0.0)
-        tracker.death_locations = [tuple(p) for p in data.get("death_locations", [])]
-        tracker.near_miss_locations = [tuple(p) for p in data.get("near_miss_locations", [])]
-        tracker.damage_locations = [tuple(p) for p in data.get("damage_locations", [])]
+        tracker.death_locations = _location_history(tuple(p) for p in data.get("death_locations", []))
+        tracker.near_miss_locations = _location_history(tuple(p) for p in data.get("near_miss_locations", []))
+        tracker.damage_locations = _location_history(tuple(p) for p in data.get("damage_locations", []))
         tracker.doors_opened = data.get("doors_opened", 0)
         tracker.doors_used_for_escape = data.get("doors_used_for_escape", 0)
         tracker.floors_completed = data.get("floors_completed", 0)
@@ -4,13 +4,60 @@ Provides tactical insights by querying LLM models when enemies can't find the pl
 """
 
 import json
+import re
 import time
+import hashlib
 import asyncio
 import threading
-from typing import Optional, Dict, List, Tuple, Any
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from itertools import count
+from queue import Queue, Empty
+from typing import Optional, List, Tuple, Any
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
 from src.core.logger import get_logger
 
+def _snapshot_alive_positions(enemies: list) -> List[Tuple[float, float]]:
+    """(x, y) of every living enemy, gathered with one mask over flat arrays."""
+    count = len(enemies)
+    if count == 0:
+        return []
+    xs = np.fromiter((e.pos.x for e in enemies), dtype=np.float32, count=count)
+    ys = np.fromiter((e.pos.y for e in enemies), dtype=np.float32, count=count)
+    alive = np.fromiter((e.is_alive for e in enemies), dtype=bool, count=count)
+    return list(zip(xs[alive].tolist(), ys[alive].tolist()))
+
+
+def _trim_cache(cache: OrderedDict, is_expired, max_size: int):
+    """Evict from the oldest end while over max_size or the head has expired."""
+    while cache and (len(cache) > max_size or is_expired(next(iter(cache.values())))):
+        cache.popitem(last=False)
+
+
+# First flat {...} object in a mixed prose/JSON LLM reply
+_JSON_OBJ_RE = re.compile(r'\{[^{}]*\}', re.DOTALL)
+
+# Strategy prompt; _build_prompt only fills in the per-request fields
+_PROMPT_TPL = """You are the tactical coordinator for enemy guards in a stealth maze game.
+
+SITUATION:
+- Floor: {floor}
+- Enemies searching for player: {n_enemies}
+- Enemy positions: {positions}  # First 3, rounded
+- Last seen player at: {last_seen}
+
+PLAYER BEHAVIOR ANALYSIS:
+- Hiding preference: {hiding:.1%} (how often they hide)
+- Stealth usage: {stealth:.1%} (how often they use stealth)
+- Favorite hiding spots: {hiding_spots}
+- Known danger zones: {danger_zones}
+- Door escape rate: {door_escape:.1%}
+
+TASK: Suggest where enemies should search. Respond in JSON format:
+{{"positions": [[x1,y1], [x2,y2]], "formation": "spread|group|ambush", "reason": "brief explanation"}}"""
+
 
 @dataclass
 class StrategyRequest:
@@ -21,6 +68,7 @@ class StrategyRequest:
     last_known_player_pos: Optional[Tuple[int, int]]
     floor_number: int
     timestamp: float = field(default_factory=time.time)
+    prompt: str = ""  # Built once when the request is created
     
 
 @dataclass
@@ -45,6 +93,14 @@ class LLMProvider:
     async def get_strategy(self, prompt: str) -> str:
         """Get strategic advice from the LLM."""
         raise NotImplementedError
+    
+    async def probe(self) -> bool:
+        """Whether this provider can currently answer queries."""
+        return self.enabled
+    
+    async def aclose(self):
+        """Release pooled connections. Called on the loop that used them."""
+        pass
         
 
 class GeminiProvider(LLMProvider):
@@ -76,6 +132,7 @@ class OpenAIProvider(LLMProvider):
     
     def __init__(self, api_key: str = "", model: str = "gpt-4o-mini"):
         super().__init__(api_key, model)
+        self._client = None  # openai.AsyncOpenAI, created on first query
         
     async def get_strategy(self, prompt: str) -> str:
         """Query OpenAI API."""
@@ -83,9 +140,10 @@ class OpenAIProvider(LLMProvider):
             return ""
         
         try:
-            import openai
-            client = openai.AsyncOpenAI(api_key=self.api_key)
-            response = await client.chat.completions.create(
+            if self._client is None:
+                import openai
+                self._client = openai.AsyncOpenAI(api_key=self.api_key)
+            response = await self._client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a tactical AI advisor for enemy units in a stealth game. Provide concise, actionable advice."},
@@ -97,6 +155,11 @@ class OpenAIProvider(LLMProvider):
         except Exception as e:
             get_logger().error(f"OpenAI error: {e}", exc_info=True)
             return ""
+    
+    async def aclose(self):
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.close()
 
 
 class OllamaProvider(LLMProvider):
@@ -106,28 +169,50 @@ class OllamaProvider(LLMProvider):
         super().__init__("local", model)
         self.host = host
         self.enabled = True  # Always try local
+        self._client = None  # Pooled httpx.AsyncClient, created on first query
+        
+    def _get_client(self):
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                base_url=self.host,
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=4, max_connections=8)
+            )
+        return self._client
+    
+    async def probe(self) -> bool:
+        """Check that an Ollama server is listening."""
+        try:
+            response = await self._get_client().get("/api/tags", timeout=2.0)
+            return response.status_code == 200
+        except Exception:
+            return False
         
     async def get_strategy(self, prompt: str) -> str:
         """Query local Ollama."""
         try:
-            import httpx
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{self.host}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {"num_predict": 150}
-                    }
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("response", "")
+            response = await self._get_client().post(
+                "/api/generate",
+                json={
+                    "model": self.model,
+                    "prompt": prompt,
+                    "stream": False,
+                    "options": {"num_predict": 150}
+                }
+            )
+            if response.status_code == 200:
+                data = response.json()
+                return data.get("response", "")
         except Exception as e:
             # Ollama not running - this is expected
             pass
         return ""
+    
+    async def aclose(self):
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
 
 
 class EnemyStrategist:
@@ -138,16 +223,38 @@ class EnemyStrategist:
     for tactical advice based on player behavior patterns.
     """
     
-    # Rate limiting
-    MIN_REQUEST_INTERVAL = 5.0  # Seconds between LLM queries
+    # Rate limiting: token bucket that holds up to MAX_PENDING_REQUESTS
+    # tokens and refills one every MIN_REQUEST_INTERVAL seconds, so bursts
+    # are allowed but the average rate stays bounded
+    MIN_REQUEST_INTERVAL = 5.0  # Seconds per refilled token
     MAX_PENDING_REQUESTS = 3
     
+    # Answers are reused for identical prompts: served as-is while fresh,
+    # served and refreshed in the background while stale, then dropped
+    PROMPT_CACHE_FRESH = 180.0
+    PROMPT_CACHE_STALE = 420.0
+    
+    # Enemy positions are rounded to this many tiles in prompts so that
+    # near-identical situations share a cache entry
+    PROMPT_POSITION_GRID = 4
+    
+    # Bounds for the request/response bookkeeping, so entries that are
+    # never fetched can't accumulate over a long session
+    MAX_CACHED_RESPONSES = 128
+    PENDING_TIMEOUT = 60.0  # Seconds before an unanswered request is dropped
+    
     def __init__(self, settings_manager=None):
         self.settings_manager = settings_manager
-        self.last_request_time = 0.0
-        self.pending_requests: Dict[str, StrategyRequest] = {}
-        self.cached_responses: Dict[str, StrategyResponse] = {}
+        self._tokens = float(self.MAX_PENDING_REQUESTS)
+        self._request_ids = count(1)  # Bursts can land in the same millisecond
+        self._last_refill = time.monotonic()
+        self._refill_rate = 1.0 / self.MIN_REQUEST_INTERVAL
+        # All three are kept in insertion (= age) order for eviction
+        self.pending_requests: "OrderedDict[str, StrategyRequest]" = OrderedDict()
+        self.cached_responses: "OrderedDict[str, StrategyResponse]" = OrderedDict()
         self.response_cache_duration = 30.0  # Seconds
+        # prompt fingerprint -> (monotonic time, response)
+        self._prompt_cache: "OrderedDict[str, Tuple[float, StrategyResponse]]" = OrderedDict()
         
         # Initialize providers (lazy - only when needed)
         self._providers: List[LLMProvider] = []
@@ -155,9 +262,16 @@ class EnemyStrategist:
         
         # Background thread for async queries
         self._query_thread: Optional[threading.Thread] = None
-        self._query_queue: List[StrategyRequest] = []
-        self._response_queue: List[StrategyResponse] = []
+        # Thread-safe handoff; None on the query queue wakes the worker to exit
+        self._query_queue: "Queue[Optional[StrategyRequest]]" = Queue()
+        # Worker results as (prompt fingerprint or None, response)
+        self._response_queue: "Queue[Tuple[Optional[str], StrategyResponse]]" = Queue()
         self._running = True
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Set once by the worker's startup probe; False means no provider
+        # can answer, so requests are refused before doing any work
+        self._any_provider_reachable: Optional[bool] = None
         
     def _init_providers(self):
         """Initialize LLM providers from settings."""
@@ -192,15 +306,25 @@ class EnemyStrategist:
         """
         Request strategic advice for enemies.
         
-        Returns request_id if submitted, None if rate-limited or unavailable.
+        Returns request_id if submitted or answered from the prompt cache,
+        None if rate-limited or unavailable.
         """
-        # Rate limiting
-        current_time = time.time()
-        if current_time - self.last_request_time < self.MIN_REQUEST_INTERVAL:
+        if self._any_provider_reachable is False:
             return None
+        if self._any_provider_reachable is None:
+            self._ensure_worker()  # Probes providers before taking requests
         
-        if len(self.pending_requests) >= self.MAX_PENDING_REQUESTS:
-            return None
+        self._collect_responses()
+        
+        # Rate limiting (monotonic clock, immune to wall-clock jumps)
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.MAX_PENDING_REQUESTS),
+            self._tokens + (now - self._last_refill) * self._refill_rate
+        )
+        self._last_refill = now
+        if self._tokens < 1.0 and not self._prompt_cache:
+            return None  # Nothing could be served or submitted
         
         # Get player behavior data
         if not hasattr(game, 'behavior_tracker') or not game.behavior_tracker:
@@ -209,58 +333,157 @@ class EnemyStrategist:
         tendencies = game.behavior_tracker.get_player_tendencies()
         
         # Create request
-        request_id = f"req_{int(current_time * 1000)}"
+        request_id = f"req_{next(self._request_ids)}"
         request = StrategyRequest(
             request_id=request_id,
             player_tendencies=tendencies,
-            enemy_positions=[(e.x, e.y) for e in enemies if e.is_alive],
-            last_known_player_pos=enemies[0].last_known_player_pos if enemies else None,
+            enemy_positions=_snapshot_alive_positions(enemies),
+            last_known_player_pos=next(
+                (e.last_known_player_pos for e in enemies if e.last_known_player_pos), None
+            ),
             floor_number=game.current_level_num
         )
+        request.prompt = self._build_prompt(request)
+        
+        # Serve a cached answer to the same prompt without asking the LLM
+        cached = self._prompt_cache.get(self._prompt_key(request.prompt))
+        age = now - cached[0] if cached else None
+        if cached and age < self.PROMPT_CACHE_STALE:
+            self._cache_response(replace(
+                cached[1], request_id=request_id, timestamp=time.time()
+            ))
+            if age >= self.PROMPT_CACHE_FRESH:
+                # Stale: refresh in the background if the rate limit allows
+                request.request_id = f"{request_id}_refresh"
+                self._submit(request)
+            return request_id
+        
+        if not self._submit(request):
+            return None
+        return request_id
+    
+    def _submit(self, request: StrategyRequest) -> bool:
+        """Queue a request for the worker if the rate limit allows."""
+        if self._tokens < 1.0:
+            return False
+        
+        # Forget requests the worker never answered (e.g. it died mid-query)
+        cutoff = time.time() - self.PENDING_TIMEOUT
+        _trim_cache(self.pending_requests, lambda r: r.timestamp < cutoff,
+                    self.MAX_PENDING_REQUESTS)
+        if len(self.pending_requests) >= self.MAX_PENDING_REQUESTS:
+            return False
         
-        self.pending_requests[request_id] = request
-        self.last_request_time = current_time
+        self.pending_requests[request.request_id] = request
+        self._tokens -= 1.0
         
         # Queue for background processing
-        self._query_queue.append(request)
+        self._query_queue.put(request)
+        self._ensure_worker()
         
-        # Start background thread if not running
+        return True
+    
+    def _ensure_worker(self):
+        """Start the background worker once; it then waits on the queue."""
         if self._query_thread is None or not self._query_thread.is_alive():
             self._query_thread = threading.Thread(target=self._process_queries, daemon=True)
             self._query_thread.start()
-        
-        return request_id
+    
+    @staticmethod
+    def _prompt_key(prompt: str) -> str:
+        """Short fingerprint of a prompt for the response cache."""
+        return hashlib.blake2b(prompt.encode(), digest_size=8).hexdigest()
     
     def get_response(self, request_id: str) -> Optional[StrategyResponse]:
         """
         Get response for a previous request.
         Returns None if not ready yet.
         """
-        # Check cache first
-        if request_id in self.cached_responses:
-            response = self.cached_responses[request_id]
-            if time.time() - response.timestamp < self.response_cache_duration:
-                return response
-        
-        # Check response queue
-        for response in self._response_queue:
-            if response.request_id == request_id:
-                self._response_queue.remove(response)
-                self.cached_responses[request_id] = response
-                self.pending_requests.pop(request_id, None)
-                return response
+        self._collect_responses()
+        self._trim_responses()
+        
+        response = self.cached_responses.get(request_id)
+        if response and time.time() - response.timestamp < self.response_cache_duration:
+            return response
         
         return None
     
+    def _trim_responses(self):
+        """Drop expired responses from the front of the cache."""
+        cutoff = time.time() - self.response_cache_duration
+        _trim_cache(self.cached_responses, lambda r: r.timestamp < cutoff,
+                    self.MAX_CACHED_RESPONSES)
+    
+    def _cache_response(self, response: StrategyResponse):
+        """Store a response for get_response, evicting old entries."""
+        self.cached_responses[response.request_id] = response
+        self.cached_responses.move_to_end(response.request_id)
+        self._trim_responses()
+    
+    def _collect_responses(self):
+        """Move finished responses from the worker into the caches."""
+        while True:
+            try:
+                key, response = self._response_queue.get_nowait()
+            except Empty:
+                break
+            self._cache_response(response)
+            self.pending_requests.pop(response.request_id, None)
+            
+            if key is not None:
+                # Caches are only touched here, on the game thread
+                self._prompt_cache[key] = (time.monotonic(), response)
+                self._prompt_cache.move_to_end(key)
+                cutoff = time.monotonic() - self.PROMPT_CACHE_STALE
+                _trim_cache(self._prompt_cache, lambda entry: entry[0] < cutoff,
+                            self.MAX_CACHED_RESPONSES)
+    
     def _process_queries(self):
         """Background thread to process LLM queries."""
         self._init_providers()
         
-        while self._running and self._query_queue:
-            request = self._query_queue.pop(0)
+        # One event loop for the life of this thread, reused by every query
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        try:
+            if self._any_provider_reachable is None:
+                self._any_provider_reachable = loop.run_until_complete(self._probe_providers())
+            if self._any_provider_reachable:
+                self._drain_queries(loop)
+            else:
+                get_logger().info("No LLM provider reachable; strategist disabled")
+        finally:
+            self._loop = None
+            # Pooled clients are bound to this loop, so close them on it
+            try:
+                loop.run_until_complete(self._close_providers())
+            except Exception as e:
+                get_logger().error(f"Provider close error: {e}", exc_info=True)
+            loop.close()
+    
+    async def _probe_providers(self) -> bool:
+        for provider in self._providers:
+            if provider.enabled and await provider.probe():
+                return True
+        return False
+    
+    async def _close_providers(self):
+        for provider in self._providers:
+            await provider.aclose()
+    
+    def _drain_queries(self, loop: asyncio.AbstractEventLoop):
+        """Answer queued requests until shutdown."""
+        while self._running:
+            try:
+                request = self._query_queue.get(timeout=1.0)
+            except Empty:
+                continue
+            if request is None:
+                break
             
             # Build prompt
-            prompt = self._build_prompt(request)
+            prompt = request.prompt or self._build_prompt(request)
             
             # Try each provider
             response_text = ""
@@ -269,11 +492,7 @@ class EnemyStrategist:
                     continue
                 
                 try:
-                    # Run async in thread
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
                     response_text = loop.run_until_complete(provider.get_strategy(prompt))
-                    loop.close()
                     
                     if response_text:
                         break
@@ -282,31 +501,29 @@ class EnemyStrategist:
             
             # Parse response
             strategy = self._parse_response(request.request_id, response_text)
-            self._response_queue.append(strategy)
+            key = self._prompt_key(prompt) if response_text else None
+            self._response_queue.put((key, strategy))
     
     def _build_prompt(self, request: StrategyRequest) -> str:
         """Build LLM prompt from request data."""
         tendencies = request.player_tendencies
-        
-        prompt = f"""You are the tactical coordinator for enemy guards in a stealth maze game.
-
-SITUATION:
-- Floor: {request.floor_number}
-- Enemies searching for player: {len(request.enemy_positions)}
-- Enemy positions: {request.enemy_positions[:3]}  # First 3
-- Last seen player at: {request.last_known_player_pos or "Unknown"}
-
-PLAYER BEHAVIOR ANALYSIS:
-- Hiding preference: {tendencies.get('hiding_preference', 0):.1%} (how often they hide)
-- Stealth usage: {tendencies.get('stealth_ratio', 0):.1%} (how often they use stealth)
-- Favorite hiding spots: {tendencies.get('favorite_hiding_spots', [])[:3]}
-- Known danger zones: {tendencies.get('danger_zones', [])[:3]}
-- Door escape rate: {tendencies.get('doors_for_escape_ratio', 0):.1%}
-
-TASK: Suggest where enemies should search. Respond in JSON format:
-{{"positions": [[x1,y1], [x2,y2]], "formation": "spread|group|ambush", "reason": "brief explanation"}}"""
-
-        return prompt
+        grid = self.PROMPT_POSITION_GRID
+        enemy_positions = [
+            (int(x) // grid * grid, int(y) // grid * grid)
+            for x, y in request.enemy_positions[:3]
+        ]
+        
+        return _PROMPT_TPL.format_map({
+            "floor": request.floor_number,
+            "n_enemies": len(request.enemy_positions),
+            "positions": enemy_positions,
+            "last_seen": request.last_known_player_pos or "Unknown",
+            "hiding": tendencies.get('hiding_preference', 0),
+            "stealth": tendencies.get('stealth_ratio', 0),
+            "hiding_spots": tendencies.get('favorite_hiding_spots', [])[:3],
+            "danger_zones": tendencies.get('danger_zones', [])[:3],
+            "door_escape": tendencies.get('doors_for_escape_ratio', 0),
+        })
     
     def _parse_response(self, request_id: str, response_text: str) -> StrategyResponse:
         """Parse LLM response into StrategyResponse."""
@@ -323,11 +540,17 @@ TASK: Suggest where enemies should search. Respond in JSON format:
             return default
         
         try:
-            # Try to extract JSON from response
-            import re
-            json_match = re.search(r'\{[^{}]*\}', response_text, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
+            # Most providers return bare JSON; only fall back to pulling an
+            # object out of surrounding prose when that fails
+            data = None
+            try:
+                data = json.loads(response_text)
+            except json.JSONDecodeError:
+                json_match = _JSON_OBJ_RE.search(response_text)
+                if json_match:
+                    data = json.loads(json_match.group())
+            
+            if isinstance(data, dict):
                 positions = data.get("positions", [])
                 formation = data.get("formation", "spread")
                 reason = data.get("reason", "LLM strategy")
@@ -384,5 +607,12 @@ TASK: Suggest where enemies should search. Respond in JSON format:
     def shutdown(self):
         """Clean up resources."""
         self._running = False
+        self._query_queue.put(None)
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            try:
+                loop.call_soon_threadsafe(loop.stop)
+            except RuntimeError:
+                pass  # Closed between the check and the call
         if self._query_thread and self._query_thread.is_alive():
             self._query_thread.join(timeout=1.0)
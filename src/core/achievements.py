@@ -5,7 +5,8 @@ Tracks player progress and unlocks badges
 
 import json
 import os
-from typing import Dict, List, Set
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from src.core.logger import get_logger
@@ -38,34 +39,31 @@ class Achievement:
         if self.unlocked:
             return False
         
-        req_type = self.requirement.get("type")
-        
-        if req_type == "level_complete":
-            level_num = self.requirement.get("level")
-            return stats.get("levels_completed", set()).__contains__(level_num)
-        
-        elif req_type == "all_levels":
-            total = self.requirement.get("count", 10)
-            return len(stats.get("levels_completed", set())) >= total
-        
-        elif req_type == "speed_run":
-            level_num = self.requirement.get("level")
-            target_time = self.requirement.get("time")
-            best_time = stats.get("level_best_times", {}).get(level_num, float('inf'))
-            return best_time <= target_time
-        
-        elif req_type == "no_damage":
-            level_num = self.requirement.get("level")
-            return stats.get("no_damage_levels", set()).__contains__(level_num)
-        
-        elif req_type == "perfect_stealth":
-            level_num = self.requirement.get("level")
-            return stats.get("stealth_perfect_levels", set()).__contains__(level_num)
-        
-        elif req_type == "total_deaths":
-            return stats.get("total_deaths", 0) >= self.requirement.get("count", 1)
-        
-        return False
+        checker = _CHECKERS.get(self.requirement.get("type"))
+        return checker(self.requirement, stats) if checker else False
+
+
+def _best_time_beaten(req: dict, stats: dict) -> bool:
+    best_time = stats.get("level_best_times", {}).get(req.get("level"), float('inf'))
+    return best_time <= req.get("time")
+
+
+# Requirement type -> check(requirement, stats); unknown types never unlock
+_CHECKERS = {
+    "level_complete": lambda req, stats: req.get("level") in stats.get("levels_completed", ()),
+    "all_levels": lambda req, stats: len(stats.get("levels_completed", ())) >= req.get("count", 10),
+    "speed_run": _best_time_beaten,
+    "no_damage": lambda req, stats: req.get("level") in stats.get("no_damage_levels", ()),
+    "perfect_stealth": lambda req, stats: req.get("level") in stats.get("stealth_perfect_levels", ()),
+    "total_deaths": lambda req, stats: stats.get("total_deaths", 0) >= req.get("count", 1),
+}
+
+# Requirement types whose stats can change when a level ends
+LEVEL_END_EVENTS = ("level_complete", "all_levels", "speed_run", "no_damage",
+                    "perfect_stealth")
+
+# Requirement types whose stats can change when the player dies
+DEATH_EVENTS = ("total_deaths",)
 
 
 class AchievementManager:
@@ -75,10 +73,35 @@ class AchievementManager:
         self.achievements: Dict[str, Achievement] = {}
         self.unlocked_achievements: Set[str] = set()
         self.save_path = "achievements.json"
+        self._dirty = False  # Unsaved unlocks since the last save/load
+        
+        # Locked achievements grouped by requirement type; only types with
+        # a checker are indexed, since the rest can never unlock
+        self._locked_by_type: Dict[str, List[Achievement]] = defaultdict(list)
+        
+        # Read-side views for the UI, rebuilt lazily after an unlock
+        self._progress_cache: Optional[tuple] = None
+        self._visible_cache: Optional[List[Achievement]] = None
+        self._unlocked_cache: Optional[List[Achievement]] = None
         
         self._define_achievements()
         self.load()
     
+    def _index_locked(self):
+        """Rebuild the per-type buckets of locked achievements."""
+        self._invalidate_views()
+        self._locked_by_type.clear()
+        for achievement in self.achievements.values():
+            req_type = achievement.requirement.get("type")
+            if not achievement.unlocked and req_type in _CHECKERS:
+                self._locked_by_type[req_type].append(achievement)
+    
+    def _invalidate_views(self):
+        """Drop cached progress/visible/unlocked views."""
+        self._progress_cache = None
+        self._visible_cache = None
+        self._unlocked_cache = None
+    
     def _define_achievements(self):
         """Define all achievements in the game."""
         achievements = [
@@ -147,17 +170,32 @@ class AchievementManager:
         for achievement in achievements:
             self.achievements[achievement.id] = achievement
     
-    def check_all(self, stats: dict) -> List[Achievement]:
-        """Check all achievements and return newly unlocked ones."""
+    def check_all(self, stats: dict,
+                  event_types: Optional[Iterable[str]] = None) -> List[Achievement]:
+        """
+        Check locked achievements and return newly unlocked ones.
+        
+        event_types limits the check to those requirement types (e.g.
+        LEVEL_END_EVENTS); by default every checkable type is visited.
+        """
         newly_unlocked = []
+        types = list(self._locked_by_type) if event_types is None else event_types
         
-        for achievement in self.achievements.values():
-            if achievement.check_unlock(stats):
-                achievement.unlocked = True
-                achievement.unlock_time = stats.get("current_time", 0.0)
-                self.unlocked_achievements.add(achievement.id)
-                newly_unlocked.append(achievement)
+        for req_type in types:
+            bucket = self._locked_by_type.get(req_type)
+            if not bucket:
+                continue
+            for achievement in list(bucket):
+                if achievement.check_unlock(stats):
+                    achievement.unlocked = True
+                    achievement.unlock_time = stats.get("current_time", 0.0)
+                    self.unlocked_achievements.add(achievement.id)
+                    newly_unlocked.append(achievement)
+                    bucket.remove(achievement)
         
+        if newly_unlocked:
+            self._dirty = True
+            self._invalidate_views()
         return newly_unlocked
     
     def get_achievement(self, achievement_id: str) -> Achievement:
@@ -165,22 +203,34 @@ class AchievementManager:
         return self.achievements.get(achievement_id)
     
     def get_all_unlocked(self) -> List[Achievement]:
-        """Get all unlocked achievements."""
-        return [ach for ach in self.achievements.values() if ach.unlocked]
+        """Get all unlocked achievements (cached until the next unlock)."""
+        if self._unlocked_cache is None:
+            self._unlocked_cache = [ach for ach in self.achievements.values() if ach.unlocked]
+        return self._unlocked_cache
     
     def get_all_visible(self) -> List[Achievement]:
-        """Get all visible achievements (unlocked or not hidden)."""
-        return [ach for ach in self.achievements.values() 
-                if ach.unlocked or not ach.hidden]
+        """Get all visible achievements (unlocked or not hidden), cached until the next unlock."""
+        if self._visible_cache is None:
+            self._visible_cache = [ach for ach in self.achievements.values() 
+                                   if ach.unlocked or not ach.hidden]
+        return self._visible_cache
     
     def get_progress(self) -> tuple:
         """Get overall achievement progress (unlocked, total)."""
-        total = len(self.achievements)
-        unlocked = len(self.unlocked_achievements)
-        return (unlocked, total)
+        if self._progress_cache is None:
+            self._progress_cache = (len(self.unlocked_achievements), len(self.achievements))
+        return self._progress_cache
     
     def save(self):
-        """Save achievement progress to file."""
+        """
+        Save achievement progress to file, if anything changed.
+        
+        Writes to a temp file and renames it over the save, so a crash
+        mid-write never leaves a truncated file behind.
+        """
+        if not self._dirty:
+            return
+        
         data = {
             "unlocked": list(self.unlocked_achievements),
             "achievements": {
@@ -192,23 +242,33 @@ class AchievementManager:
             }
         }
         
-        with open(self.save_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        tmp_path = self.save_path + ".tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.save_path)
+        except Exception:
+            # Don't leave a half-written temp file next to the save
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._dirty = False
     
     def load(self):
-        """Load achievement progress from file."""
-        if not os.path.exists(self.save_path):
-            return
+        """Load achievement progress from file and rebuild the locked index."""
+        if os.path.exists(self.save_path):
+            try:
+                with open(self.save_path, 'r') as f:
+                    data = json.load(f)
+                
+                self.unlocked_achievements = set(data.get("unlocked", []))
+                
+                for aid, ach_data in data.get("achievements", {}).items():
+                    if aid in self.achievements:
+                        self.achievements[aid].unlocked = ach_data.get("unlocked", False)
+                        self.achievements[aid].unlock_time = ach_data.get("unlock_time", 0.0)
+                self._dirty = False  # In step with the file again
+            except Exception as e:
+                get_logger().error(f"Error loading achievements: {e}", exc_info=True)
         
-        try:
-            with open(self.save_path, 'r') as f:
-                data = json.load(f)
-            
-            self.unlocked_achievements = set(data.get("unlocked", []))
-            
-            for aid, ach_data in data.get("achievements", {}).items():
-                if aid in self.achievements:
-                    self.achievements[aid].unlocked = ach_data.get("unlocked", False)
-                    self.achievements[aid].unlock_time = ach_data.get("unlock_time", 0.0)
-        except Exception as e:
-            get_logger().error(f"Error loading achievements: {e}", exc_info=True)
+        self._index_locked()
@@ -1,20 +1,34 @@
 import pygame
 import os
-from src.core.constants import AUDIO_ENABLED, MASTER_VOLUME, SFX_VOLUME, MUSIC_VOLUME
+import time
+from typing import Dict, Optional
+from src.core.constants import (
+    AUDIO_ENABLED, MASTER_VOLUME, SFX_VOLUME, MUSIC_VOLUME, MIXER_CHANNELS, SFX_REPLAY_WINDOW
+)
 from src.core.logger import get_logger
 
+_AUDIO_EXTS = (".wav", ".ogg")
+
 class AudioManager:
     def __init__(self):
         self.enabled = AUDIO_ENABLED
-        self.sounds = {}
+        self.sounds: Dict[str, pygame.mixer.Sound] = {}
+        self._sound_paths: Dict[str, str] = {}
         self.master_volume = MASTER_VOLUME
         self.sfx_volume = SFX_VOLUME
         self.music_volume = MUSIC_VOLUME
+        self._sfx_mix = self.master_volume * self.sfx_volume
+        
+        # Sounds last played with a non-default volume_scale; they need
+        # their baseline volume restored before the next unscaled play
+        self._scaled = set()
+        self._last_play_ts: Dict[str, float] = {}
         
         # Initialize mixer if not already done
         try:
             if not pygame.mixer.get_init():
                 pygame.mixer.init()
+            pygame.mixer.set_num_channels(MIXER_CHANNELS)
         except Exception as e:
             get_logger().error(f"Failed to initialize audio mixer: {e}", exc_info=True)
             self.enabled = False
@@ -23,37 +37,74 @@ class AudioManager:
         self.load_assets()
         
     def load_assets(self):
-        """Load all sound files from assets/audio."""
+        """
+        Index sound files in assets/audio.
+        
+        Files are only decoded the first time they are played, so sounds a
+        session never uses cost neither startup time nor memory.
+        """
         audio_dir = "assets/audio"
         try:
             if not os.path.exists(audio_dir):
                 get_logger().warning(f"Audio directory not found: {audio_dir}")
                 return
                 
-            for filename in os.listdir(audio_dir):
-                if filename.endswith(".wav") or filename.endswith(".ogg"):
-                    name = os.path.splitext(filename)[0]
-                    path = os.path.join(audio_dir, filename)
-                    try:
-                        sound = pygame.mixer.Sound(path)
-                        sound.set_volume(self.master_volume * self.sfx_volume)
-                        self.sounds[name] = sound
-                        get_logger().debug(f"Loaded audio: {name}")
-                    except Exception as e:
-                        get_logger().error(f"Failed to load {filename}: {e}")
+            # scandir reuses the readdir entry type, so no extra stat per file
+            with os.scandir(audio_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith(".") or not entry.name.endswith(_AUDIO_EXTS):
+                        continue
+                    if entry.is_file():
+                        self._sound_paths[os.path.splitext(entry.name)[0]] = entry.path
         except OSError as e:
             get_logger().error(f"Error accessing audio directory {audio_dir}: {e}", exc_info=True)
 
+    def _get_sound(self, name: str) -> Optional[pygame.mixer.Sound]:
+        """Return a loaded sound, decoding it on first use."""
+        sound = self.sounds.get(name)
+        if sound is not None:
+            return sound
+        
+        path = self._sound_paths.get(name)
+        if path is None:
+            return None
+        try:
+            sound = pygame.mixer.Sound(path)
+        except Exception as e:
+            get_logger().error(f"Failed to load {path}: {e}")
+            # Don't retry a broken file on every play
+            del self._sound_paths[name]
+            return None
+        
+        sound.set_volume(self._sfx_mix)
+        self.sounds[name] = sound
+        get_logger().debug(f"Loaded audio: {name}")
+        return sound
+
     def play_sound(self, name: str, volume_scale: float = 1.0):
         """Play a sound effect by name."""
-        if not self.enabled or name not in self.sounds:
+        if not self.enabled:
             return
+        
+        # Stacked copies of one effect in the same instant just sound like
+        # a glitch and eat channels
+        now = time.monotonic()
+        if now - self._last_play_ts.get(name, -SFX_REPLAY_WINDOW) < SFX_REPLAY_WINDOW:
+            return
+        self._last_play_ts[name] = now
             
         try:
-            sound = self.sounds[name]
-            # Adjust volume dynamically based on current settings
-            final_vol = self.master_volume * self.sfx_volume * volume_scale
-            sound.set_volume(final_vol)
+            sound = self._get_sound(name)
+            if sound is None:
+                return
+            # Sounds already sit at the baseline mix; only cross into SDL
+            # to change volume when this play differs from it
+            if volume_scale != 1.0:
+                sound.set_volume(self._sfx_mix * volume_scale)
+                self._scaled.add(name)
+            elif name in self._scaled:
+                sound.set_volume(self._sfx_mix)
+                self._scaled.discard(name)
             sound.play()
         except Exception as e:
             get_logger().error(f"Failed to play sound {name}: {e}")
@@ -107,8 +158,10 @@ class AudioManager:
 
     def _update_volumes(self):
         """Update volumes of loaded sounds."""
+        self._sfx_mix = self.master_volume * self.sfx_volume
+        self._scaled.clear()
         for sound in self.sounds.values():
-            sound.set_volume(self.master_volume * self.sfx_volume)
+            sound.set_volume(self._sfx_mix)
         
         # Also update music
         try:
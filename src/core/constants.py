@@ -3,9 +3,9 @@ Maze Bourne - Game Constants and Configuration
 A Stealth Sci-Fi Maze Game with RL AI
 """
 
-from enum import Enum, auto
-from dataclasses import dataclass
-from typing import Tuple
+from enum import Enum, IntEnum, auto
+from types import MappingProxyType
+from typing import NamedTuple, Tuple
 
 # =============================================================================
 # DISPLAY SETTINGS
@@ -24,6 +24,11 @@ SCREEN_HEIGHT = GAME_HEIGHT
 TARGET_FPS = 144
 WINDOW_TITLE = "Maze Bourne"
 
+# Partial presents: a state's dirty rects are pushed with display.update()
+# instead of a full flip when there are few of them and they cover little
+DIRTY_RECT_MAX_COUNT = 2
+DIRTY_RECT_MAX_AREA = 0.25  # Fraction of the screen
+
 # Tile/Grid Settings
 TILE_SIZE = 40  # Optimized for 720p (32x18 tiles fit)
 GRID_LINE_WIDTH = 1
@@ -34,8 +39,10 @@ CAMERA_LERP_SPEED = 8.0  # Smooth camera follow speed
 # =============================================================================
 # COLOR PALETTE - Sci-Fi Theme
 # =============================================================================
-@dataclass(frozen=True)
 class Colors:
+    # Plain namespace of colour tuples; empty __slots__ keeps instances read-only
+    __slots__ = ()
+    
     # Background
     VOID = (10, 10, 15)
     BACKGROUND = (15, 20, 30)
@@ -142,36 +149,58 @@ ENEMY_SEARCH_DURATION = 8.0  # Seconds
 ENEMY_CHASE_TIMEOUT = 5.0    # Lose interest after X seconds
 
 # Per-type configuration
-ENEMY_CONFIG = {
-    EnemyType.PATROL: {
-        "speed": 2.2,  # Standard pace
-        "vision_range": 5.0,
-        "vision_angle": 120,
-        "hearing_range": 4.0,
-        "color": COLORS.ENEMY_PATROL,
-    },
-    EnemyType.TRACKER: {
-        "speed": 4.2,  # Fast but short sighted
-        "vision_range": 4.0,  # Nerfed from 6.0
-        "vision_angle": 360,
-        "hearing_range": 6.0,
-        "color": COLORS.ENEMY_TRACKER,
-    },
-    EnemyType.SOUND_HUNTER: {
-        "speed": 3.2,  # Faster than patrol
-        "vision_range": 3.0,
-        "vision_angle": 90,
-        "hearing_range": 15.0,
-        "color": COLORS.ENEMY_SOUND,
-    },
-    EnemyType.SIGHT_GUARD: {
-        "speed": 1.8,  # Slow but sees far
-        "vision_range": 10.0,
-        "vision_angle": 60,
-        "hearing_range": 5.0,
-        "color": COLORS.ENEMY_SIGHT,
-    },
-}
+class EnemyConfig(NamedTuple):
+    """Base stats for one enemy type."""
+    speed: float
+    vision_range: float
+    vision_angle: int
+    hearing_range: float
+    color: Tuple[int, int, int]
+
+_PATROL_CONFIG = EnemyConfig(
+    speed=2.2,  # Standard pace
+    vision_range=5.0,
+    vision_angle=120,
+    hearing_range=4.0,
+    color=COLORS.ENEMY_PATROL,
+)
+
+# Indexed by EnemyType.value - 1 (see enemy_config)
+ENEMY_CONFIG_TABLE: Tuple[EnemyConfig, ...] = (
+    # PATROL
+    _PATROL_CONFIG,
+    # TRACKER
+    EnemyConfig(
+        speed=4.2,  # Fast but short sighted
+        vision_range=4.0,  # Nerfed from 6.0
+        vision_angle=360,
+        hearing_range=6.0,
+        color=COLORS.ENEMY_TRACKER,
+    ),
+    # SOUND_HUNTER
+    EnemyConfig(
+        speed=3.2,  # Faster than patrol
+        vision_range=3.0,
+        vision_angle=90,
+        hearing_range=15.0,
+        color=COLORS.ENEMY_SOUND,
+    ),
+    # SIGHT_GUARD
+    EnemyConfig(
+        speed=1.8,  # Slow but sees far
+        vision_range=10.0,
+        vision_angle=60,
+        hearing_range=5.0,
+        color=COLORS.ENEMY_SIGHT,
+    ),
+    # RL_ADAPTIVE has no stats of its own yet
+    _PATROL_CONFIG,
+)
+assert len(ENEMY_CONFIG_TABLE) == len(EnemyType)
+
+def enemy_config(enemy_type: EnemyType) -> EnemyConfig:
+    """Base stats for an enemy type."""
+    return ENEMY_CONFIG_TABLE[enemy_type.value - 1]
 
 # Behavior states
 class EnemyState(Enum):
@@ -186,7 +215,8 @@ class EnemyState(Enum):
 # =============================================================================
 # LEVEL SETTINGS
 # =============================================================================
-class CellType(Enum):
+class CellType(IntEnum):
+    # Int-valued so cell types compare as ints and fit in NumPy grids
     VOID = 0
     WALL = 1
     FLOOR = 2
@@ -246,20 +276,32 @@ class GameState(Enum):
 # =============================================================================
 # INPUT MAPPINGS (can be customized later)
 # =============================================================================
-import pygame
+# SDL2 keycodes, written out so importing constants doesn't pull in pygame
+# (values match pygame.K_*)
+_K_SPACE = 32
+_K_ESCAPE = 27
+_K_a, _K_d, _K_e, _K_s, _K_w = 97, 100, 101, 115, 119
+_K_RIGHT, _K_LEFT, _K_DOWN, _K_UP = 1073741903, 1073741904, 1073741905, 1073741906
+_K_F3 = 1073741884
+_K_LSHIFT, _K_RSHIFT = 1073742049, 1073742053
 
 CONTROLS = {
-    "move_up": [pygame.K_w, pygame.K_UP],
-    "move_down": [pygame.K_s, pygame.K_DOWN],
-    "move_left": [pygame.K_a, pygame.K_LEFT],
-    "move_right": [pygame.K_d, pygame.K_RIGHT],
-    "stealth": [pygame.K_LSHIFT, pygame.K_RSHIFT],
-    "dash": [pygame.K_SPACE],
-    "interact": [pygame.K_e],
-    "pause": [pygame.K_ESCAPE],
-    "debug": [pygame.K_F3],
+    "move_up": [_K_w, _K_UP],
+    "move_down": [_K_s, _K_DOWN],
+    "move_left": [_K_a, _K_LEFT],
+    "move_right": [_K_d, _K_RIGHT],
+    "stealth": [_K_LSHIFT, _K_RSHIFT],
+    "dash": [_K_SPACE],
+    "interact": [_K_e],
+    "pause": [_K_ESCAPE],
+    "debug": [_K_F3],
 }
 
+# Inverse of CONTROLS: keycode -> action, for one lookup per held key
+KEY_TO_ACTION = MappingProxyType(
+    {key: action for action, keys in CONTROLS.items() for key in keys}
+)
+
 # =============================================================================
 # REINFORCEMENT LEARNING SETTINGS
 # =============================================================================
@@ -290,6 +332,8 @@ AUDIO_ENABLED = True
 MASTER_VOLUME = 0.7
 MUSIC_VOLUME = 0.5
 SFX_VOLUME = 0.8
+MIXER_CHANNELS = 32       # pygame defaults to 8, which bursts of SFX exhaust
+SFX_REPLAY_WINDOW = 0.03  # Seconds; repeats of one SFX inside this are dropped
 
 # =============================================================================
 # DEBUG SETTINGS
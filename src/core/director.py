@@ -3,32 +3,56 @@ Maze Bourne - AI Director (Adaptive Difficulty System)
 Analyzes player behavior and adjusts enemy AI strategies.
 """
 
-from dataclasses import dataclass, field
-from typing import List, Dict, Set
-from enum import Enum
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional
+from enum import IntFlag, auto
 
-class AIModifier(Enum):
-    NONE = "none"
-    CHECK_HIDING_SPOTS = "check_spots"  # Enemies check closets
-    GROUP_PATROL = "group_patrol"       # Enemies move in pairs
-    FAST_FLANK = "fast_flank"           # Enemies move faster to cut off runners
-    SENSITIVE_HEARING = "sensitive"     # Enemies hear from further away
-    PREDICTIVE_PATHING = "predictive"   # Enemies move to where you're going
+import numpy as np
+
+class AIModifier(IntFlag):
+    """Director modifiers; combine with | and test with `in`."""
+    NONE = 0
+    CHECK_HIDING_SPOTS = auto()  # Enemies check closets
+    GROUP_PATROL = auto()        # Enemies move in pairs
+    FAST_FLANK = auto()          # Enemies move faster to cut off runners
+    SENSITIVE_HEARING = auto()   # Enemies hear from further away
+    PREDICTIVE_PATHING = auto()  # Enemies move to where you're going
+
+def _score_property(index: int, doc: str) -> property:
+    def getter(self) -> float:
+        return float(self.scores[index])
+    def setter(self, value: float):
+        self.scores[index] = value
+    return property(getter, setter, doc=doc)
 
-@dataclass
 class PlayerProfile:
-    """Persistent player behavior profile."""
-    hider_score: float = 0.0      # 0.0 to 1.0 (Caps at 1.0)
-    runner_score: float = 0.0     # High movement
-    camper_score: float = 0.0     # High stationary time outside hiding
-    aggro_score: float = 0.0      # Number of alerts triggered
+    """Persistent player behavior profile, stored as one score vector."""
+    __slots__ = ("scores",)
+    
+    # Index of each score in the vector
+    HIDER, RUNNER, CAMPER, AGGRO = range(4)
+    
+    def __init__(self, hider_score: float = 0.0, runner_score: float = 0.0,
+                 camper_score: float = 0.0, aggro_score: float = 0.0):
+        # float64 so threshold checks (> 0.6) match plain Python floats
+        self.scores = np.array(
+            (hider_score, runner_score, camper_score, aggro_score), dtype=np.float64
+        )
+    
+    hider_score = _score_property(HIDER, "0.0 to 1.0 (Caps at 1.0)")
+    runner_score = _score_property(RUNNER, "High movement")
+    camper_score = _score_property(CAMPER, "High stationary time outside hiding")
+    aggro_score = _score_property(AGGRO, "Number of alerts triggered")
+    
+    def __repr__(self) -> str:
+        return (f"PlayerProfile(hider_score={self.hider_score}, runner_score={self.runner_score}, "
+                f"camper_score={self.camper_score}, aggro_score={self.aggro_score})")
     
     def decay(self, rate=0.1):
         """Slowly forget old habits."""
-        self.hider_score = max(0, self.hider_score - rate)
-        self.runner_score = max(0, self.runner_score - rate)
-        self.camper_score = max(0, self.camper_score - rate)
-        self.aggro_score = max(0, self.aggro_score - rate)
+        scores = self.scores
+        np.subtract(scores, rate, out=scores)
+        np.maximum(scores, 0.0, out=scores)
 
 class AIDirector:
     """
@@ -38,88 +62,106 @@ class AIDirector:
     
     def __init__(self):
         self.profile = PlayerProfile()
-        self.active_modifiers: Set[AIModifier] = set()
+        self.active_modifiers = AIModifier.NONE
         self.difficulty_level = 1.0
+        self._instruction_cache: Optional[str] = None  # Reset by _update_modifiers
+        # Modifier mask -> overrides; the mask fully determines them, so
+        # entries never go stale
+        self._config_mod_cache: Dict[int, Mapping] = {}
     
     def analyze_level_stats(self, stats_tracker):
         """Analyze a completed level's stats and update profile."""
         
+        s = stats_tracker
+        
         # Calculate localized scores for this run
-        total_time = max(1.0, stats_tracker.current_total_time)
+        total_time = s.current_total_time
+        if total_time < 1.0:
+            total_time = 1.0
+        
+        # Per-score adjustment, indexed like PlayerProfile.scores
+        delta = np.full(4, -0.1)
         
         # Hiding Ratio
-        hiding_ratio = stats_tracker.current_time_in_hiding / total_time
-        if hiding_ratio > 0.3: # Spent >30% time in closets
-            self.profile.hider_score += 0.4
-        else:
-            self.profile.hider_score -= 0.1
+        if s.current_time_in_hiding / total_time > 0.3: # Spent >30% time in closets
+            delta[PlayerProfile.HIDER] = 0.4
             
         # Stationary Ratio (Camping corners)
-        stationary_ratio = stats_tracker.current_stationary_time / total_time
-        if stationary_ratio > 0.4:
-            self.profile.camper_score += 0.3
-        else:
-            self.profile.camper_score -= 0.1
+        if s.current_stationary_time / total_time > 0.4:
+            delta[PlayerProfile.CAMPER] = 0.3
             
         # Runner (Distance / Time)
         # Avg speed. If traversing a lot
-        avg_speed = stats_tracker.current_distance_traveled / total_time
-        if avg_speed > 3.0: # Very fast pace
-            self.profile.runner_score += 0.3
-        else:
-            self.profile.runner_score -= 0.1
+        if s.current_distance_traveled / total_time > 3.0: # Very fast pace
+            delta[PlayerProfile.RUNNER] = 0.3
             
         # Aggro
-        if stats_tracker.current_times_spotted > 2:
-            self.profile.aggro_score += 0.3
-        else:
-            self.profile.aggro_score -= 0.1
+        if s.current_times_spotted > 2:
+            delta[PlayerProfile.AGGRO] = 0.3
             
         # Clamp scores
-        self.profile.hider_score = self._clamp(self.profile.hider_score)
-        self.profile.camper_score = self._clamp(self.profile.camper_score)
-        self.profile.runner_score = self._clamp(self.profile.runner_score)
-        self.profile.aggro_score = self._clamp(self.profile.aggro_score)
+        scores = self.profile.scores
+        np.clip(scores + delta, 0.0, 1.0, out=scores)
         
         self._update_modifiers()
         
-    def _clamp(self, val):
-        return max(0.0, min(1.0, val))
-        
     def _update_modifiers(self):
         """Decide on active modifiers based on profile."""
-        self.active_modifiers.clear()
+        mods = AIModifier.NONE
         
         if self.profile.hider_score > 0.6:
-            self.active_modifiers.add(AIModifier.CHECK_HIDING_SPOTS)
+            mods |= AIModifier.CHECK_HIDING_SPOTS
             
         if self.profile.camper_score > 0.6:
-            self.active_modifiers.add(AIModifier.GROUP_PATROL) # Flush them out
-            self.active_modifiers.add(AIModifier.SENSITIVE_HEARING)
+            mods |= AIModifier.GROUP_PATROL # Flush them out
+            mods |= AIModifier.SENSITIVE_HEARING
             
         if self.profile.runner_score > 0.6:
-            self.active_modifiers.add(AIModifier.FAST_FLANK)
-            self.active_modifiers.add(AIModifier.PREDICTIVE_PATHING)
+            mods |= AIModifier.FAST_FLANK
+            mods |= AIModifier.PREDICTIVE_PATHING
+        
+        self.active_modifiers = mods
             
         # Difficulty scaling
         self.difficulty_level += 0.1
         
-    def get_enemy_config_modifiers(self) -> Dict:
-        """Return distinct property overrides for enemies."""
+        self._instruction_cache = None
+        
+    def get_enemy_config_modifiers(self) -> Mapping:
+        """
+        Return distinct property overrides for enemies.
+        
+        The mapping is shared between callers and read-only; copy it
+        before adding entries.
+        """
+        key = int(self.active_modifiers)
+        cached = self._config_mod_cache.get(key)
+        if cached is None:
+            cached = self._config_mod_cache[key] = MappingProxyType(
+                self._compute_config_mods(self.active_modifiers)
+            )
+        return cached
+    
+    @staticmethod
+    def _compute_config_mods(active: AIModifier) -> Dict:
         mods = {}
         
-        if AIModifier.FAST_FLANK in self.active_modifiers:
+        if AIModifier.FAST_FLANK in active:
             mods["speed_mult"] = 1.3
             
-        if AIModifier.SENSITIVE_HEARING in self.active_modifiers:
+        if AIModifier.SENSITIVE_HEARING in active:
             mods["hearing_mult"] = 1.5
             
         return mods
 
     def get_behavior_instruction(self) -> str:
         """Return a text summary of the Director's Orders (for debug/UI)."""
+        if self._instruction_cache is not None:
+            return self._instruction_cache
+        
         if not self.active_modifiers:
-            return "Maintaing Standard Patrols."
+            self._instruction_cache = "Maintaing Standard Patrols."
+            return self._instruction_cache
             
         orders = []
         if AIModifier.CHECK_HIDING_SPOTS in self.active_modifiers:
@@ -129,4 +171,5 @@ class AIDirector:
         if AIModifier.FAST_FLANK in self.active_modifiers:
             orders.append("Intercept Hostile.")
             
-        return " | ".join(orders)
+        self._instruction_cache = " | ".join(orders)
+        return self._instruction_cache
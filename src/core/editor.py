@@ -1,11 +1,26 @@
 import pygame
 import os
+
+import numpy as np
+
 from src.core.constants import *
-from src.levels.level import Level, CellType, Cell
+from src.levels.level import Level, CellType
 from src.ui.screens import UIButton
 from src.ui.theme import UITheme
 from src.core.logger import get_logger
 
+# Tile colour per cell type; anything not listed draws as floor
+_CELL_COLORS = {
+    CellType.WALL: COLORS.WALL,
+    CellType.KEY: COLORS.KEY,
+    CellType.DOOR: COLORS.DOOR_LOCKED,
+    CellType.EXIT: COLORS.EXIT,
+    CellType.SPAWN: COLORS.SPAWN,
+    CellType.TRAP: COLORS.TRAP,
+    CellType.ENEMY_SPAWN: COLORS.ENEMY_PATROL,
+    CellType.HIDING_SPOT: COLORS.HIDING_SPOT,
+}
+
 class Editor:
     def __init__(self, game):
         self.game = game
@@ -13,6 +28,10 @@ class Editor:
         self.camera_x = 0
         self.camera_y = 0
         self.zoom = 1.0
+        self._tile_size = TILE_SIZE  # Bound once; read every frame in update()
+        self._cursor = None  # Last system cursor set; set_cursor only on change
+        self._tile_surfs = self._build_tile_surfs()
+        self._grid_bg = self._build_grid_bg()
         
         # Tools
         # Tuple: (Display Name, CellType/Logic)
@@ -28,11 +47,50 @@ class Editor:
             ("HIDE", CellType.HIDING_SPOT)
         ]
         self.selected_tool = self.tools[0][1] # Default Wall
+        self._tool_names = {t: name for name, t in self.tools}
+        self._selected_tool_name = self._tool_names[self.selected_tool]
+        
+        # Rendered HUD text; text only changes with the selected tool
+        self._title_surf = None
+        self._tool_label_cache = {}  # tool -> rendered "Tool: NAME" surface
+        self._selected_label = None  # Label for the current tool; reset by select_tool
+        
+        # Cached side panel and the state it was drawn with
+        self._panel_rect = pygame.Rect(SCREEN_WIDTH - 200, 0, 200, SCREEN_HEIGHT)
+        self._panel_surf = None
+        self._panel_state = None
+        
+        # Partial presents: the view the last frame was drawn with, and cells
+        # painted since then
+        self._last_view = None
+        self._painted = []
         
         # UI
         self.ui_buttons = []
+        self._tool_button_by_type = {}  # tool -> its palette button, for highlighting
         self._init_ui()
         
+    def _build_tile_surfs(self):
+        """Pre-rasterize the inner square drawn for each cell type."""
+        inner = self._tile_size - 4
+        convert = pygame.display.get_surface() is not None
+        surfs = {}
+        for cell_type in CellType:
+            surf = pygame.Surface((inner, inner))
+            surf.fill(_CELL_COLORS.get(cell_type, COLORS.FLOOR))
+            surfs[cell_type] = surf.convert() if convert else surf
+        return surfs
+        
+    def _build_grid_bg(self):
+        """Pre-render the grid outlines for one screen plus a tile of scroll."""
+        tile = self._tile_size
+        surf = pygame.Surface((SCREEN_WIDTH + tile, SCREEN_HEIGHT + tile))
+        surf.fill(COLORS.VOID)
+        for y in range(0, SCREEN_HEIGHT + tile, tile):
+            for x in range(0, SCREEN_WIDTH + tile, tile):
+                pygame.draw.rect(surf, (20, 20, 20), (x, y, tile, tile), 1)
+        return surf.convert() if pygame.display.get_surface() is not None else surf
+        
     def _init_ui(self):
         cx = SCREEN_WIDTH - 150
         y = 50
@@ -57,10 +115,13 @@ class Editor:
             action = lambda t=tool_type: self.select_tool(t)
             btn = UIButton(cx, y, 120, 35, name, action, font)
             self.ui_buttons.append(btn)
+            self._tool_button_by_type[tool_type] = btn
             y += 40
             
     def select_tool(self, tool_type):
         self.selected_tool = tool_type
+        self._selected_tool_name = self._tool_names.get(tool_type, "UNKNOWN")
+        self._selected_label = None
         if self.game.audio_manager:
             self.game.audio_manager.play_sound("sfx_ui_select", 0.6)
 
@@ -77,16 +138,24 @@ class Editor:
         # Reset camera
         self.camera_x = 0
         self.camera_y = 0
-        pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_CROSSHAIR)
+        self._set_cursor(pygame.SYSTEM_CURSOR_CROSSHAIR)
+        
+    def _set_cursor(self, cursor: int):
+        """Switch the system cursor, skipping the OS call when it is unchanged."""
+        if cursor != self._cursor:
+            pygame.mouse.set_cursor(cursor)
+            self._cursor = cursor
         
     def update(self, dt: float):
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_click = pygame.mouse.get_pressed()[0]
-        right_click = pygame.mouse.get_pressed()[2]
+        mouse = pygame.mouse
+        mouse_pos = mouse.get_pos()
+        buttons = mouse.get_pressed()
+        mouse_click = buttons[0]
+        right_click = buttons[2]
         
         # UI Interaction (if mouse is in side panel)
         if mouse_pos[0] > SCREEN_WIDTH - 200:
-            pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
+            self._set_cursor(pygame.SYSTEM_CURSOR_ARROW)
             if self.game.audio_manager:
                 manager = self.game.audio_manager
             else:
@@ -99,14 +168,15 @@ class Editor:
                      pass
             return
         
-        pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_CROSSHAIR)
+        self._set_cursor(pygame.SYSTEM_CURSOR_CROSSHAIR)
         
         # Camera Pan (WASD)
         speed = 500 * dt
-        if self.game.is_key_pressed(pygame.K_w): self.camera_y -= speed
-        if self.game.is_key_pressed(pygame.K_s): self.camera_y += speed
-        if self.game.is_key_pressed(pygame.K_a): self.camera_x -= speed
-        if self.game.is_key_pressed(pygame.K_d): self.camera_x += speed
+        held = self.game.keys_pressed
+        if pygame.K_w in held: self.camera_y -= speed
+        if pygame.K_s in held: self.camera_y += speed
+        if pygame.K_a in held: self.camera_x -= speed
+        if pygame.K_d in held: self.camera_x += speed
         
         # Paint / Erase
         # Calculate grid pos
@@ -114,8 +184,9 @@ class Editor:
         # mouse_x = screen_x
         # grid_x = (mouse_x + camera_x) / TILE_SIZE
         
-        grid_x = int((mouse_pos[0] + self.camera_x) // TILE_SIZE)
-        grid_y = int((mouse_pos[1] + self.camera_y) // TILE_SIZE)
+        tile = self._tile_size
+        grid_x = int((mouse_pos[0] + self.camera_x) // tile)
+        grid_y = int((mouse_pos[1] + self.camera_y) // tile)
         
         if 0 <= grid_x < self.level.width and 0 <= grid_y < self.level.height:
             if mouse_click:
@@ -124,113 +195,146 @@ class Editor:
                 self._paint(grid_x, grid_y, CellType.FLOOR) # Eraser
 
     def _paint(self, x, y, cell_type):
-        # Update cell data
-        if (x, y) not in self.level.cells:
-             self.level.cells[(x, y)] = Cell(x, y, cell_type)
-        else:
-             self.level.cells[(x, y)].cell_type = cell_type
+        # Update cell data; holding the mouse on a painted cell changes nothing.
+        # item() gives a plain int: comparing a NumPy scalar to an IntEnum is slow
+        if self.level.type_grid.item(y, x) == cell_type:
+            return
+        self.level.set_cell_type(x, y, cell_type)
+        self._painted.append((x, y))
              
     def save_level(self):
-        # Scan cells to update lists (key_positions, etc) for the Level class
-        # (The Level.save_to_file usually relies on these lists being correct)
+        filename = "levels/level_1.json" # Default for now
         
-        self.level.key_positions = []
-        self.level.door_positions = []
-        self.level.trap_positions = []
-        self.level.enemy_spawns = []
-        
-        for (x, y), cell in self.level.cells.items():
-            ct = cell.cell_type
-            if ct == CellType.KEY:
-                self.level.key_positions.append((x, y))
-            elif ct == CellType.DOOR:
-                self.level.door_positions.append((x, y))
-            elif ct == CellType.TRAP:
-                self.level.trap_positions.append((x, y))
-            elif ct == CellType.ENEMY_SPAWN:
-                self.level.enemy_spawns.append((x, y))
-            elif ct == CellType.SPAWN:
-                self.level.spawn_point = (x, y)
-            elif ct == CellType.EXIT:
-                self.level.exit_point = (x, y)
+        # Nothing painted since the last save: the file is already current
+        if self.level.dirty or not os.path.exists(filename):
+            self._write_level(filename)
         
-        # Save
-        filename = "levels/level_1.json" # Default for now
-        self.level.save_to_file(filename)
         if self.game.renderer:
             self.game.renderer.add_notification(f"Saved to {filename}!", COLORS.EXIT)
         if self.game.audio_manager:
             self.game.audio_manager.play_sound("sfx_ui_select", 1.0)
+    
+    def _write_level(self, filename: str):
+        # Scan cells to update lists (key_positions, etc) for the Level class
+        # (The Level.save_to_file usually relies on these lists being correct)
+        
+        # One vectorized compare per object type; nonzero() walks the grid
+        # row by row, the same order the cells were created in
+        grid = self.level.type_grid
+        width = self.level.width
+        
+        def positions(cell_type):
+            ys, xs = np.nonzero(grid == cell_type)
+            return list(zip(xs.tolist(), ys.tolist()))
+        
+        # Spawn/exit are single points; the last match wins, as before
+        for cell_type, attr in ((CellType.SPAWN, 'spawn_point'), (CellType.EXIT, 'exit_point')):
+            hits = np.flatnonzero(grid == cell_type)
+            if len(hits):
+                y, x = divmod(int(hits[-1]), width)
+                setattr(self.level, attr, (x, y))
+        
+        # Assign whole lists so Level can refresh its key/door membership sets
+        self.level.key_positions = positions(CellType.KEY)
+        self.level.door_positions = positions(CellType.DOOR)
+        self.level.trap_positions = positions(CellType.TRAP)
+        self.level.enemy_spawns = positions(CellType.ENEMY_SPAWN)
+        
+        # Save
+        self.level.save_to_file(filename)
+        self.level.dirty = False
              
     def render(self):
         self.game.screen.fill(COLORS.VOID)
         
-        # Draw visible grid
-        start_x = int(self.camera_x // TILE_SIZE)
-        start_y = int(self.camera_y // TILE_SIZE)
-        end_x = start_x + (SCREEN_WIDTH // TILE_SIZE) + 1
-        end_y = start_y + (SCREEN_HEIGHT // TILE_SIZE) + 1
-        
-        # Offset for smooth scrolling
-        off_x = -int(self.camera_x % TILE_SIZE)
-        off_y = -int(self.camera_y % TILE_SIZE)
-        
-        for y in range(start_y, end_y):
-            for x in range(start_x, end_x):
-                # Calculate screen pos
-                sx = (x - start_x) * TILE_SIZE + off_x
-                sy = (y - start_y) * TILE_SIZE + off_y
-                
-                # Check valid
-                if 0 <= x < self.level.width and 0 <= y < self.level.height:
-                    # Draw base grid
-                    pygame.draw.rect(self.game.screen, (20, 20, 20), (sx, sy, TILE_SIZE, TILE_SIZE), 1)
-                    
-                    # Draw Content
-                    cell = self.level.get_cell(x, y)
-                    if cell:
-                        self._draw_cell(sx, sy, cell.cell_type)
+        grid = self.level.type_grid
+        tile = self._tile_size
+        tile_surfs = self._tile_surfs
+        
+        # Screen position of cell (0, 0); scrolls by whole pixels
+        start_x = int(self.camera_x // tile)
+        start_y = int(self.camera_y // tile)
+        origin_x = -int(self.camera_x % tile) - start_x * tile
+        origin_y = -int(self.camera_y % tile) - start_y * tile
+        
+        # Visible cell range, clamped to the level up front so the loop needs
+        # no bounds checks; columns under the side panel are skipped too
+        view_w = SCREEN_WIDTH - 200
+        x0 = max(start_x, 0)
+        y0 = max(start_y, 0)
+        x1 = min(-(-(view_w - origin_x) // tile), self.level.width)
+        y1 = min(-(-(SCREEN_HEIGHT - origin_y) // tile), self.level.height)
+        
+        # Grid lines: one blit of the pre-rendered background, cut to the level
+        left = x0 * tile + origin_x
+        top = y0 * tile + origin_y
+        if x1 > x0 and y1 > y0:
+            self.game.screen.blit(
+                self._grid_bg, (left, top),
+                ((x0 - start_x) * tile, (y0 - start_y) * tile, (x1 - x0) * tile, (y1 - y0) * tile)
+            )
+        
+        # Cell contents, inset inside the grid lines
+        blits = []
+        sx0 = left + 2
+        sy = top + 2
+        for row in grid[y0:y1, x0:x1].tolist():
+            sx = sx0
+            for cell_type in row:
+                blits.append((tile_surfs[cell_type], (sx, sy)))
+                sx += tile
+            sy += tile
+        self.game.screen.fblits(blits)
+    
+        # Only painted cells changed unless the view scrolled or the level
+        # was swapped; report them so the game can skip a full flip
+        view = (self.level, origin_x, origin_y)
+        if view != self._last_view:
+            self._last_view = view
+            dirty = None
+        else:
+            dirty = [pygame.Rect(x * tile + origin_x, y * tile + origin_y, tile, tile)
+                     for x, y in self._painted]
+        self._painted.clear()
+        
+        # Side panel: only redrawn when the tool or a button's hover/press
+        # state changes, otherwise the cached copy is blitted back
+        screen = self.game.screen
+        state = (self.selected_tool, tuple((b.is_hovered, b.is_pressed) for b in self.ui_buttons))
+        if state != self._panel_state:
+            self._draw_panel(screen)
+            self._panel_surf = screen.subsurface(self._panel_rect).copy()
+            self._panel_state = state
+            if dirty is not None:
+                dirty.append(self._panel_rect)
+        else:
+            screen.blit(self._panel_surf, self._panel_rect)
+        self.game.dirty_rects = dirty
     
-        # Side Panel
-        panel_rect = pygame.Rect(SCREEN_WIDTH - 200, 0, 200, SCREEN_HEIGHT)
-        pygame.draw.rect(self.game.screen, COLORS.UI_BG, panel_rect)
-        pygame.draw.line(self.game.screen, COLORS.UI_BORDER, (SCREEN_WIDTH - 200, 0), (SCREEN_WIDTH - 200, SCREEN_HEIGHT), 2)
+    def _draw_panel(self, screen: pygame.Surface):
+        """Draw the side panel: background, title, tool label and buttons."""
+        pygame.draw.rect(screen, COLORS.UI_BG, self._panel_rect)
+        pygame.draw.line(screen, COLORS.UI_BORDER, (SCREEN_WIDTH - 200, 0), (SCREEN_WIDTH - 200, SCREEN_HEIGHT), 2)
         
         # Title
-        title = self.game.font_medium.render("EDITOR", True, COLORS.UI_TEXT)
-        self.game.screen.blit(title, (SCREEN_WIDTH - 150, 10))
+        if self._title_surf is None:
+            self._title_surf = self.game.font_medium.render("EDITOR", True, COLORS.UI_TEXT)
+        screen.blit(self._title_surf, (SCREEN_WIDTH - 150, 10))
         
         # Selected Tool
-        try:
-            # Find name again
-            t_name = next(name for name, t in self.tools if t == self.selected_tool)
-        except:
-            t_name = "UNKNOWN"
-            
-        sel_text = self.game.font_small.render(f"Tool: {t_name}", True, COLORS.PLAYER)
-        self.game.screen.blit(sel_text, (SCREEN_WIDTH - 180, 550))
+        sel_text = self._selected_label
+        if sel_text is None:
+            sel_text = self._tool_label_cache.get(self.selected_tool)
+            if sel_text is None:
+                sel_text = self.game.font_small.render(f"Tool: {self._selected_tool_name}", True, COLORS.PLAYER)
+                self._tool_label_cache[self.selected_tool] = sel_text
+            self._selected_label = sel_text
+        screen.blit(sel_text, (SCREEN_WIDTH - 180, 550))
+        
+        # Highlight selected tool button
+        active_btn = self._tool_button_by_type.get(self.selected_tool)
+        if active_btn is not None:
+            pygame.draw.rect(screen, COLORS.PLAYER_DASH, active_btn.rect.inflate(4, 4), 2, border_radius=6)
         
         for btn in self.ui_buttons:
-            # Highlight selected tool button
-            is_active = False
-            for name, t in self.tools:
-                if btn.text == name and t == self.selected_tool:
-                    is_active = True
-                    break
-            
-            if is_active:
-                pygame.draw.rect(self.game.screen, COLORS.PLAYER_DASH, btn.rect.inflate(4, 4), 2, border_radius=6)
-            btn.draw(self.game.screen)
-            
-    def _draw_cell(self, x, y, ctype):
-        color = COLORS.FLOOR
-        if ctype == CellType.WALL: color = COLORS.WALL
-        elif ctype == CellType.KEY: color = COLORS.KEY
-        elif ctype == CellType.DOOR: color = COLORS.DOOR_LOCKED
-        elif ctype == CellType.EXIT: color = COLORS.EXIT
-        elif ctype == CellType.SPAWN: color = COLORS.SPAWN
-        elif ctype == CellType.TRAP: color = COLORS.TRAP
-        elif ctype == CellType.ENEMY_SPAWN: color = COLORS.ENEMY_PATROL
-        elif ctype == CellType.HIDING_SPOT: color = COLORS.HIDING_SPOT
-        
-        pygame.draw.rect(self.game.screen, color, (x + 2, y + 2, TILE_SIZE - 4, TILE_SIZE - 4))
+            btn.draw(screen)
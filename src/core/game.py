@@ -7,13 +7,14 @@ import pygame
 import sys
 import time
 import math
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, List
 from enum import Enum
 
 from src.core.constants import (
     WINDOW_WIDTH, WINDOW_HEIGHT, GAME_WIDTH, GAME_HEIGHT,
     SCREEN_WIDTH, SCREEN_HEIGHT, TARGET_FPS, WINDOW_TITLE,
-    GameState, COLORS, DEBUG_MODE, SHOW_FPS
+    GameState, COLORS, DEBUG_MODE, SHOW_FPS, EnemyState,
+    DIRTY_RECT_MAX_COUNT, DIRTY_RECT_MAX_AREA
 )
 from src.core.editor import Editor
 from src.core.logger import get_logger
@@ -84,6 +85,9 @@ class Game:
         
         # State handlers
         self.state_handlers: Dict[GameState, Dict[str, Callable]] = {}
+        # The current state's per-frame handlers, rebound on state change
+        self._update_handler: Callable = lambda dt: None
+        self._render_handler: Callable = lambda: None
         
         # Core systems (will be initialized later)
         self.renderer = None
@@ -107,6 +111,13 @@ class Game:
         # Debug mode
         self.debug_mode = DEBUG_MODE
         self.show_fps = SHOW_FPS
+        # Fixed labels, keyed by (font, text, color); see _static_text()
+        self._static_text_cache: Dict[tuple, pygame.Surface] = {}
+        
+        # Partial presents: a state render may list the only screen rects it
+        # changed; None means present the whole frame
+        self.dirty_rects: Optional[List[pygame.Rect]] = None
+        self._full_present = True  # Forced after window resize/expose
         
         # Fonts (optimized for 720p)
         self.font_large = pygame.font.Font(None, 80)
@@ -118,6 +129,10 @@ class Game:
         
         # Entities
         self.enemies = []
+        from src.ai.enemy_index import EnemySpatialIndex
+        self.enemy_index = EnemySpatialIndex()  # Rebuilt once per AI tick
+        from src.ai._jit_warmup import start_warmup
+        start_warmup()  # Compile AI kernels in the background before they're needed
         from src.entities.game_objects import GameObjectManager
         self.game_objects = GameObjectManager()
         
@@ -156,6 +171,7 @@ class Game:
         # RL / AI initialization (deferred to endless)
         self.previous_frame_time = time.time()
         self.dt = 0.0
+        self.frame_time = time.monotonic()  # Sampled once per frame for AI timers
         
         # Boss components
         self.current_boss = None
@@ -182,6 +198,7 @@ class Game:
         while self.running:
             # delta time
             self.dt = self.clock.tick(self.target_fps) / 1000.0
+            self.frame_time = time.monotonic()
             
             # FPS tracking
             self.frame_count += 1
@@ -228,28 +245,42 @@ class Game:
                     elif event.type == pygame.MOUSEBUTTONUP:
                         if event.button <= 3:
                             self.mouse_buttons[event.button - 1] = False
+                
+                # Window changes need the whole frame presented
+                elif event.type in (pygame.VIDEORESIZE, pygame.WINDOWEXPOSED):
+                    self._full_present = True
             
                 # Pass event to UI Manager
                 self.ui_manager.handle_event(event)
             
             # Update
-            if self.state in self.state_handlers:
-                self.state_handlers[self.state]["update"](self.dt)
+            self._update_handler(self.dt)
             
             # Render Phase
             # Clear screen
             self.screen.fill(COLORS.BACKGROUND)
             
             # Call State Render
-            if self.state in self.state_handlers:
-                handler = self.state_handlers[self.state]["render"]
-                handler()
+            self.dirty_rects = None
+            self._render_handler()
 
-            # Flip
-            pygame.display.flip()
+            # Present
+            self._present()
             
         self._cleanup()
     
+    def _present(self):
+        """Push the frame to the display, updating only dirty rects when they are small."""
+        dirty = self.dirty_rects
+        if (dirty is not None and not self._full_present
+                and len(dirty) <= DIRTY_RECT_MAX_COUNT
+                and sum(r.w * r.h for r in dirty) < SCREEN_WIDTH * SCREEN_HEIGHT * DIRTY_RECT_MAX_AREA):
+            if dirty:
+                pygame.display.update(dirty)
+        else:
+            pygame.display.flip()
+        self._full_present = False
+    
     def _setup_default_handlers(self):
         """Set up default state handlers."""
         # Menu state
@@ -339,6 +370,18 @@ class Game:
             "enter": enter or (lambda: None),
             "exit": exit or (lambda: None),
         }
+        if state == self.state:
+            self._bind_state_handlers()
+    
+    def _bind_state_handlers(self):
+        """Point the per-frame update/render handlers at the current state."""
+        handlers = self.state_handlers.get(self.state)
+        if handlers is None:
+            self._update_handler = lambda dt: None
+            self._render_handler = lambda: None
+        else:
+            self._update_handler = handlers["update"]
+            self._render_handler = handlers["render"]
     
     def unpause(self):
         """Helper to resume game."""
@@ -362,6 +405,8 @@ class Game:
             
         self.last_state = self.state
         self.state = new_state
+        self._bind_state_handlers()
+        self._full_present = True
         get_logger().info(f"State changed: {self.last_state.name} -> {self.state.name}")
         
         # UIManager Logic based on state
@@ -451,6 +496,14 @@ class Game:
             state_surface = self.font_tiny.render(state_text, True, COLORS.UI_TEXT_DIM)
             self.screen.blit(state_surface, (10, 35))
     
+    def _static_text(self, font: pygame.font.Font, text: str, color) -> pygame.Surface:
+        """Surface for a fixed label; rasterized on first use, then reused."""
+        key = (font, text, color)
+        surf = self._static_text_cache.get(key)
+        if surf is None:
+            surf = self._static_text_cache[key] = font.render(text, True, color)
+        return surf
+    
     # =========================================================================
     # Default State Handlers
     # =========================================================================
@@ -570,7 +623,7 @@ class Game:
         self.screen.fill(COLORS.BACKGROUND)
         
         # Title
-        title = self.font_large.render("ACHIEVEMENTS", True, COLORS.PLAYER)
+        title = self._static_text(self.font_large, "ACHIEVEMENTS", COLORS.PLAYER)
         self.screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, 60)))
         
         # Get achievements data
@@ -621,12 +674,12 @@ class Game:
             
             # Title
             title_color = COLORS.UI_TEXT if ach.unlocked else COLORS.UI_TEXT_DIM
-            name_surf = self.font_small.render(ach.name, True, title_color)
+            name_surf = self._static_text(self.font_small, ach.name, title_color)
             self.screen.blit(name_surf, (x + 65, y + 12))
             
             # Description
             desc_color = COLORS.UI_TEXT_DIM if ach.unlocked else (80, 80, 80)
-            desc_surf = self.font_tiny.render(ach.description, True, desc_color)
+            desc_surf = self._static_text(self.font_tiny, ach.description, desc_color)
             self.screen.blit(desc_surf, (x + 65, y + 38))
         
         # Back button
@@ -689,7 +742,7 @@ class Game:
         self.screen.fill(COLORS.BACKGROUND)
         
         # Title
-        title = self.font_large.render("SELECT LEVEL", True, COLORS.PLAYER)
+        title = self._static_text(self.font_large, "SELECT LEVEL", COLORS.PLAYER)
         self.screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, 70)))
         
         # Draw level buttons with stars
@@ -724,7 +777,6 @@ class Game:
     
     def _draw_level_star(self, surface, x, y, size, filled=True):
         """Draw a small star for level select."""
-        import math
         points = []
         for i in range(5):
             angle = math.pi / 2 + i * 2 * math.pi / 5
@@ -822,7 +874,7 @@ class Game:
         self.renderer.add_notification(f"Level {self.current_level_num}", duration=3.0)
         
         # Get AI Modifiers for this level
-        enemy_modifiers = self.director.get_enemy_config_modifiers()
+        enemy_modifiers = dict(self.director.get_enemy_config_modifiers())
         enemy_modifiers["modifiers"] = self.director.active_modifiers
         
         # Spawn enemies from level config
@@ -962,13 +1014,15 @@ class Game:
         if self.player:
             self.player.update(dt, self)
         
+        # Snapshot enemy positions for neighbour queries this tick
+        self.enemy_index.rebuild(self.enemies)
+        
         for enemy in self.enemies:
             enemy.update(dt, self)
         
         # LLM Strategist for Endless Mode (periodic strategy requests)
         if self.game_mode == "endless" and hasattr(self, 'strategist') and self.strategist:
             # Check if any enemies are searching
-            from src.core.constants import EnemyState
             searching_enemies = [e for e in self.enemies if e.state == EnemyState.SEARCH]
             
             if searching_enemies:
@@ -1040,7 +1094,7 @@ class Game:
             
         else:
             # Placeholder when renderer not initialized
-            text = self.font_medium.render("Game View - Renderer Loading...", True, COLORS.UI_TEXT)
+            text = self._static_text(self.font_medium, "Game View - Renderer Loading...", COLORS.UI_TEXT)
             rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
             self.screen.blit(text, rect)
     
@@ -1048,7 +1102,7 @@ class Game:
         self.screen.fill(COLORS.BACKGROUND)
         
         # Title
-        title = self.font_large.render("HOW TO PLAY", True, COLORS.PLAYER)
+        title = self._static_text(self.font_large, "HOW TO PLAY", COLORS.PLAYER)
         self.screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, 50)))
         
         # Grid layout for help items
@@ -1061,9 +1115,9 @@ class Game:
         # Arrow
         pygame.draw.line(self.screen, COLORS.UI_TEXT, (130, start_y + 20), (170, start_y + 20), 2)
         
-        obj_text = self.font_medium.render("OBJECTIVE", True, COLORS.UI_ENERGY)
+        obj_text = self._static_text(self.font_medium, "OBJECTIVE", COLORS.UI_ENERGY)
         self.screen.blit(obj_text, (250, start_y))
-        obj_desc = self.font_small.render("Collect the Golden Key -> Escape via Green Portal", True, COLORS.UI_TEXT)
+        obj_desc = self._static_text(self.font_small, "Collect the Golden Key -> Escape via Green Portal", COLORS.UI_TEXT)
         self.screen.blit(obj_desc, (250, start_y + 30))
         
         # 2. Controls
@@ -1074,9 +1128,9 @@ class Game:
         self._draw_key_icon(80, start_y + 35, "S")
         self._draw_key_icon(110, start_y + 35, "D")
         
-        ctrl_text = self.font_medium.render("CONTROLS", True, COLORS.UI_ENERGY)
+        ctrl_text = self._static_text(self.font_medium, "CONTROLS", COLORS.UI_ENERGY)
         self.screen.blit(ctrl_text, (250, start_y + 10))
-        ctrl_desc = self.font_small.render("Move. SHIFT: Sneak (Silent, uses Energy). SPACE: Dash (Burst, uses Energy).", True, COLORS.UI_TEXT)
+        ctrl_desc = self._static_text(self.font_small, "Move. SHIFT: Sneak (Silent, uses Energy). SPACE: Dash (Burst, uses Energy).", COLORS.UI_TEXT)
         self.screen.blit(ctrl_desc, (250, start_y + 40))
         
         # 3. Enemies
@@ -1094,9 +1148,9 @@ class Game:
         pts = [(180, start_y + 30), (195, start_y), (210, start_y + 30)]
         pygame.draw.polygon(self.screen, COLORS.ENEMY_HUNTER, pts)
         
-        en_text = self.font_medium.render("AVOID ENEMIES", True, COLORS.UI_ENERGY)
+        en_text = self._static_text(self.font_medium, "AVOID ENEMIES", COLORS.UI_ENERGY)
         self.screen.blit(en_text, (250, start_y))
-        en_desc = self.font_small.render("Red: Patrol | Orange: Tracker | Yellow: Hunter | Purple: Guard", True, COLORS.UI_TEXT)
+        en_desc = self._static_text(self.font_small, "Red: Patrol | Orange: Tracker | Yellow: Hunter | Purple: Guard", COLORS.UI_TEXT)
         self.screen.blit(en_desc, (250, start_y + 30))
         
         # 4. Hiding
@@ -1104,17 +1158,17 @@ class Game:
         pygame.draw.rect(self.screen, COLORS.HIDING_SPOT, (80, start_y, 40, 40))
         pygame.draw.rect(self.screen, (100, 100, 255), (80, start_y, 40, 40), 2) # Glow
         
-        hide_text = self.font_medium.render("STAY HIDDEN", True, COLORS.UI_ENERGY)
+        hide_text = self._static_text(self.font_medium, "STAY HIDDEN", COLORS.UI_ENERGY)
         self.screen.blit(hide_text, (250, start_y + 5))
-        hide_desc = self.font_small.render("Hide in Blue Zones to evade chase. Sneaking consumes Energy.", True, COLORS.UI_TEXT)
+        hide_desc = self._static_text(self.font_small, "Hide in Blue Zones to evade chase. Sneaking consumes Energy.", COLORS.UI_TEXT)
         self.screen.blit(hide_desc, (250, start_y + 35))
         
         # 5. Editor Mode
         start_y += item_height
         
-        edit_text = self.font_medium.render("LEVEL EDITOR", True, COLORS.UI_ENERGY)
+        edit_text = self._static_text(self.font_medium, "LEVEL EDITOR", COLORS.UI_ENERGY)
         self.screen.blit(edit_text, (100, start_y + 5))
-        edit_desc = self.font_small.render("Drag to Paint. Right Click to Erase. Save & Play your own levels!", True, COLORS.UI_TEXT)
+        edit_desc = self._static_text(self.font_small, "Drag to Paint. Right Click to Erase. Save & Play your own levels!", COLORS.UI_TEXT)
         self.screen.blit(edit_desc, (100, start_y + 35))
         
         for btn in self.help_buttons:
@@ -1123,7 +1177,7 @@ class Game:
     def _draw_key_icon(self, x, y, char):
         pygame.draw.rect(self.screen, (50, 50, 60), (x, y, 28, 28), border_radius=4)
         pygame.draw.rect(self.screen, (150, 150, 160), (x, y, 28, 28), 1, border_radius=4)
-        txt = self.font_tiny.render(char, True, COLORS.UI_TEXT)
+        txt = self._static_text(self.font_tiny, char, COLORS.UI_TEXT)
         self.screen.blit(txt, (x + 8, y + 6))
         
     def _credits_enter(self):
@@ -1165,11 +1219,11 @@ class Game:
     
     def _game_over_render(self):
         """Render game over state."""
-        text = self.font_large.render("GAME OVER", True, COLORS.UI_HEALTH)
+        text = self._static_text(self.font_large, "GAME OVER", COLORS.UI_HEALTH)
         rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
         self.screen.blit(text, rect)
         
-        restart = self.font_small.render("Press ENTER to Retry", True, COLORS.UI_TEXT_DIM)
+        restart = self._static_text(self.font_small, "Press ENTER to Retry", COLORS.UI_TEXT_DIM)
         restart_rect = restart.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
         self.screen.blit(restart, restart_rect)
     
@@ -1181,7 +1235,6 @@ class Game:
     
     def _draw_star(self, surface, x, y, size, filled=True):
         """Draw a star shape."""
-        import math
         points = []
         for i in range(5):
             angle = math.pi / 2 + i * 2 * math.pi / 5
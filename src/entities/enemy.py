@@ -11,11 +11,13 @@ from typing import Optional, Tuple, List
 from dataclasses import dataclass
 
 from src.core.constants import (
-    EnemyType, EnemyState, ENEMY_CONFIG, TILE_SIZE,
+    EnemyType, EnemyState, enemy_config, TILE_SIZE,
     ENEMY_PATROL_WAIT, ENEMY_ALERT_DURATION, ENEMY_SEARCH_DURATION, ENEMY_CHASE_TIMEOUT,
-    CellType
+    CellType, COLORS
 )
+from src.core.director import AIModifier
 from src.utils.grid import GridPos
+from src.ai.pathfinding import AStarPathfinder, PathFollower
 
 
 class Enemy:
@@ -36,7 +38,7 @@ class Enemy:
         
         # Type and config
         self.enemy_type = enemy_type
-        self.config = ENEMY_CONFIG.get(enemy_type, ENEMY_CONFIG[EnemyType.PATROL])
+        self.config = enemy_config(enemy_type)
         
         # Apply Config Overrides (from Director)
         if config_overrides:
@@ -45,14 +47,14 @@ class Enemy:
             pass
 
         # Stats from config (with overrides)
-        self.speed = config_overrides.get("speed_mult", 1.0) * self.config["speed"] if config_overrides else self.config["speed"]
-        self.vision_range = self.config["vision_range"]
-        self.vision_angle = self.config["vision_angle"]
-        self.hearing_range = config_overrides.get("hearing_mult", 1.0) * self.config["hearing_range"] if config_overrides else self.config["hearing_range"]
-        self.color = self.config["color"]
+        self.speed = config_overrides.get("speed_mult", 1.0) * self.config.speed if config_overrides else self.config.speed
+        self.vision_range = self.config.vision_range
+        self.vision_angle = self.config.vision_angle
+        self.hearing_range = config_overrides.get("hearing_mult", 1.0) * self.config.hearing_range if config_overrides else self.config.hearing_range
+        self.color = self.config.color
         
         # Active AI Modifiers (Behavioral flags)
-        self.ai_modifiers = set()
+        self.ai_modifiers = AIModifier.NONE
         if config_overrides and "modifiers" in config_overrides:
              self.ai_modifiers = config_overrides["modifiers"]
         
@@ -79,6 +81,19 @@ class Enemy:
         
         # For sound hunters
         self.last_heard_sound_pos: Optional[GridPos] = None
+        self.sound_investigation_timer = 0.0
+        
+        # Optional subsystems used by src.ai.behavior_states.
+        # Defaulted here so per-tick code can test "is not None" instead of hasattr.
+        self.vision_system = None
+        self.wall_grid = None
+        self.patrol_waypoints: List[GridPos] = []
+        self.search_positions: List[GridPos] = []
+        self.search_index = 0
+        self._cached_path: List[GridPos] = []
+        self._cached_path_ids: List[int] = []  # Packed coords, see grid.pack_pos
+        self._cached_target_id = -1
+        self._cached_path_idx = 0
         
         # Status
         self.is_alive = True
@@ -86,7 +101,7 @@ class Enemy:
         
         # Pathfinding
         self.pathfinder = None
-        self.current_path: List[GridPos] = []
+        self.current_path = PathFollower()
         self.path_update_timer = 0.0
         self.path_update_interval = 0.5
         
@@ -156,7 +171,6 @@ class Enemy:
         
         # Initialize pathfinder if needed
         if self.pathfinder is None and level:
-            from src.ai.pathfinding import AStarPathfinder
             self.pathfinder = AStarPathfinder(level.cells)
             
         # Store game reference for later use
@@ -283,24 +297,20 @@ class Enemy:
         if not self._can_move() or not self.current_path:
             return False
         
-        # Find next waypoint in path
+        # Find next waypoint in path, skipping the one we're standing on
         current_grid_pos = GridPos(int(self.pos.x), int(self.pos.y))
+        next_pos = self.current_path.next(current_grid_pos)
         
-        # Check if we've reached current target
-        if self.current_path and current_grid_pos == self.current_path[0]:
-            self.current_path.pop(0)
-        
-        if not self.current_path:
+        if next_pos is None:
             return False
         
         # Move toward next point in path
-        next_pos = self.current_path[0]
         return self._move_toward(next_pos, level)
     
     def _update_pathfinding(self, target: GridPos, use_pathfinding: bool = True):
         """Update A* path to target if needed."""
         if not use_pathfinding or not self.pathfinder:
-            self.current_path = []
+            self.current_path = PathFollower()
             return
         
         # Check if we need to recalculate
@@ -313,7 +323,7 @@ class Enemy:
         start = GridPos(int(self.pos.x), int(self.pos.y))
         goal = GridPos(int(target.x), int(target.y))
         
-        self.current_path = self.pathfinder.find_path(start, goal, max_distance=30)
+        self.current_path = PathFollower(self.pathfinder.find_path(start, goal, max_distance=30))
     
     def _can_see_player(self, player, level) -> bool:
         """Check if enemy can see the player."""
@@ -321,12 +331,14 @@ class Enemy:
         if getattr(player, 'is_hidden', False):
             return False
         
-        player_pos = GridPos(player.x, player.y)
-        distance = self.pos.distance_to(player_pos)
-        
-        # Check range
-        if distance > self.vision_range:
+        # Check range on the squared distance, so out-of-range players cost
+        # no sqrt or allocation
+        dx = player.x - self.pos.x
+        dy = player.y - self.pos.y
+        dist2 = dx * dx + dy * dy
+        if dist2 > self.vision_range * self.vision_range:
             return False
+        distance = math.sqrt(dist2)
         
         # Check if player is stealthed (reduces visibility)
         if getattr(player, 'is_stealthed', False):
@@ -336,8 +348,6 @@ class Enemy:
         # Check vision angle (for non-360 vision)
         if self.vision_angle < 360:
             # Calculate angle to player
-            dx = player.x - self.pos.x
-            dy = player.y - self.pos.y
             angle_to_player = math.degrees(math.atan2(dy, dx))
             
             # Calculate facing angle
@@ -370,12 +380,14 @@ class Enemy:
     
     def _can_hear_player(self, player) -> bool:
         """Check if enemy can hear the player (for sound hunters)."""
-        player_pos = GridPos(player.x, player.y)
-        distance = self.pos.distance_to(player_pos)
+        dx = player.x - self.pos.x
+        dy = player.y - self.pos.y
+        dist2 = dx * dx + dy * dy
         
         # Check hearing range
-        if distance > self.hearing_range:
+        if dist2 > self.hearing_range * self.hearing_range:
             return False
+        distance = math.sqrt(dist2)
         
         # Stealth reduces noise
         if getattr(player, 'is_stealthed', False):
@@ -678,7 +690,6 @@ class Enemy:
     def get_render_color(self) -> Tuple[int, int, int]:
         """Get the render color based on type and state."""
         if self.state in [EnemyState.ALERT, EnemyState.CHASE]:
-            from src.core.constants import COLORS
             return COLORS.ENEMY_ALERT
         return self.color
     
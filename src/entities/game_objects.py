@@ -81,7 +81,7 @@ class Door(GameObject):
             
             # Update level collision
             if game and game.level:
-                game.level.opened_doors.add((int(self.x), int(self.y)))
+                game.level.set_door_locked(int(self.x), int(self.y), False)
                 
             get_logger().debug(f"Unlocked door: {self.door_id}")
             return True
@@ -95,7 +95,7 @@ class Door(GameObject):
         
         # Update level collision
         if game and game.level:
-            game.level.opened_doors.add((int(self.x), int(self.y)))
+            game.level.set_door_locked(int(self.x), int(self.y), False)
             
         get_logger().debug(f"Door {self.door_id} unlocked remotely")
 
@@ -122,28 +122,18 @@ class PrivacyDoor(GameObject):
             self.is_locked = False
             self.last_opened_time = time.time()
             
-            # Update level collision
+            # Update level collision and line of sight
             if game and game.level:
-                game.level.opened_doors.add((int(self.x), int(self.y)))
-                # Also mark the cell as unlocked for line of sight
-                cell = game.level.get_cell(int(self.x), int(self.y))
-                if cell:
-                    cell.is_locked = False
+                game.level.set_door_locked(int(self.x), int(self.y), False)
                     
             get_logger().debug(f"Opened privacy door {self.door_id}")
         else:
             # Close the door
             self.is_locked = True
             
-            # Update level collision  
+            # Update level collision and line of sight
             if game and game.level:
-                pos = (int(self.x), int(self.y))
-                if pos in game.level.opened_doors:
-                    game.level.opened_doors.remove(pos)
-                # Mark cell as locked for line of sight
-                cell = game.level.get_cell(int(self.x), int(self.y))
-                if cell:
-                    cell.is_locked = True
+                game.level.set_door_locked(int(self.x), int(self.y), True)
                     
             get_logger().debug(f"Closed privacy door {self.door_id}")
         return True
@@ -162,12 +152,7 @@ class PrivacyDoor(GameObject):
                         self.is_locked = True
                         # Update level state
                         if game and game.level:
-                            pos = (int(self.x), int(self.y))
-                            if pos in game.level.opened_doors:
-                                game.level.opened_doors.remove(pos)
-                            cell = game.level.get_cell(int(self.x), int(self.y))
-                            if cell:
-                                cell.is_locked = True
+                            game.level.set_door_locked(int(self.x), int(self.y), True)
                         get_logger().debug(f"Auto-closed privacy door {self.door_id}")
 
 
@@ -199,8 +184,8 @@ class Lever(GameObject):
                             obj.unlock(game)
                         else:
                             obj.is_locked = True
-                            if game and game.level and (int(obj.x), int(obj.y)) in game.level.opened_doors:
-                                game.level.opened_doors.remove((int(obj.x), int(obj.y)))
+                            if game and game.level:
+                                game.level.set_door_locked(int(obj.x), int(obj.y), True)
                 elif hasattr(obj, 'camera_id') and obj.camera_id == obj_id:
                     if isinstance(obj, SecurityCamera):
                         obj.is_disabled = self.is_on
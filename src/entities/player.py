@@ -6,11 +6,14 @@ from dataclasses import dataclass, field
 from typing import Tuple
 import time
 
+import pygame
+
 from src.core.constants import (
     PLAYER_SPEED, PLAYER_HEALTH, PLAYER_MAX_ENERGY,
     STEALTH_SPEED_MULT, DASH_DISTANCE, DASH_DURATION, DASH_COOLDOWN, DASH_ENERGY_COST,
-    CONTROLS
+    KEY_TO_ACTION, CellType, COLORS, GameState
 )
+from src.core.achievements import LEVEL_END_EVENTS, DEATH_EVENTS
 
 
 class Player:
@@ -38,6 +41,7 @@ class Player:
         
         # Stealth
         self.is_stealthed = False
+        self.stealth_mechanics = None  # Optional detection modifier provider
         
         # Dash
         self.is_dashing = False
@@ -207,49 +211,26 @@ class Player:
 
     def _handle_input(self, game):
         """Process input for movement and abilities."""
-        import pygame
-        
         # Disable input if hidden
         if hasattr(self, 'is_hidden') and self.is_hidden:
             self._move_input = (0, 0)
             return
 
-        # Movement
-        move_x = 0
-        move_y = 0
-        
-        for key in CONTROLS["move_up"]:
-            if game.is_key_pressed(key):
-                move_y = -1
-                break
-        for key in CONTROLS["move_down"]:
-            if game.is_key_pressed(key):
-                move_y = 1
-                break
-        for key in CONTROLS["move_left"]:
-            if game.is_key_pressed(key):
-                move_x = -1
-                break
-        for key in CONTROLS["move_right"]:
-            if game.is_key_pressed(key):
-                move_x = 1
-                break
+        # Map held keys to actions once
+        held = {KEY_TO_ACTION.get(key) for key in game.keys_pressed}
+        
+        # Movement (down/right win when both directions are held)
+        move_x = 1 if "move_right" in held else (-1 if "move_left" in held else 0)
+        move_y = 1 if "move_down" in held else (-1 if "move_up" in held else 0)
         
         self._move_input = (move_x, move_y)
         
         # Stealth toggle
-        stealth_held = False
-        for key in CONTROLS["stealth"]:
-            if game.is_key_pressed(key):
-                stealth_held = True
-                break
-        self.is_stealthed = stealth_held
+        self.is_stealthed = "stealth" in held
         
         # Dash
-        for key in CONTROLS["dash"]:
-            if game.is_key_just_pressed(key):
-                self.dash(game)
-                break
+        if any(KEY_TO_ACTION.get(key) == "dash" for key in game.keys_just_pressed):
+            self.dash(game)
         
         # Parry (F key or Right Click)
         if game.is_key_just_pressed(pygame.K_f) or (hasattr(game, 'mouse_buttons') and game.mouse_buttons[2]):
@@ -298,8 +279,6 @@ class Player:
         if not cell:
             return
         
-        from src.core.constants import CellType, COLORS
-        
         # Auto-pickup keys
         if cell.cell_type == CellType.KEY:
             self.keys += 1
@@ -313,8 +292,6 @@ class Player:
 
         # Check for exit
         if cell.cell_type == CellType.EXIT:
-            from src.core.constants import GameState
-            
             if self.keys > 0:
                 # Record level completion
                 if hasattr(game, 'stats_tracker'):
@@ -324,14 +301,13 @@ class Player:
                     # Check for new achievements
                     if hasattr(game, 'achievement_manager'):
                         stats_dict = game.stats_tracker.get_stats_dict()
-                        new_achievements = game.achievement_manager.check_all(stats_dict)
+                        new_achievements = game.achievement_manager.check_all(stats_dict, LEVEL_END_EVENTS)
                         game._new_achievements = new_achievements
                         
                         if new_achievements:
                             game.achievement_manager.save()
                     
                     # Store stats for victory screen
-                    import time
                     completion_time = time.time() - game.stats_tracker.current_level_start_time
                     game._victory_stats = (stars, completion_time, is_new_best_time)
                 
@@ -399,7 +375,6 @@ class Player:
             game.behavior_tracker.record_damage((int(self.x), int(self.y)))
         
         if game.renderer:
-            from src.core.constants import COLORS
             game.renderer.add_notification("Damage Taken!", COLORS.TRAP)
             game.renderer.camera.add_shake(10.0)
         
@@ -410,12 +385,17 @@ class Player:
             # Record death
             if hasattr(game, 'stats_tracker'):
                 game.stats_tracker.record_death()
+                
+                # Death-count achievements
+                if hasattr(game, 'achievement_manager'):
+                    stats_dict = game.stats_tracker.get_stats_dict()
+                    if game.achievement_manager.check_all(stats_dict, DEATH_EVENTS):
+                        game.achievement_manager.save()
             
             # Record death location for behavior tracker (endless mode)
             if hasattr(game, 'behavior_tracker') and game.behavior_tracker:
                 game.behavior_tracker.record_death((int(self.x), int(self.y)))
             
-            from src.core.constants import GameState
             game.change_state(GameState.GAME_OVER)
     
     def interact(self, game):
@@ -438,23 +418,18 @@ class Player:
             if not cell:
                 continue
             
-            from src.core.constants import CellType, COLORS
-            
             # Handle Privacy Door - no key required
             if cell.cell_type == CellType.PRIVACY_DOOR:
                 if cell.is_locked:
                     # Open the privacy door
-                    cell.is_locked = False
-                    game.level.opened_doors.add((tx, ty))
+                    game.level.set_door_locked(tx, ty, False)
                     if game.renderer:
                         game.renderer.add_notification("Door Opened", COLORS.DOOR_UNLOCKED)
                     if hasattr(game, 'audio_manager'):
                         game.audio_manager.play_sound("sfx_ui_select", 0.8)
                 else:
                     # Close the privacy door (optional - can toggle)
-                    cell.is_locked = True
-                    if (tx, ty) in game.level.opened_doors:
-                        game.level.opened_doors.remove((tx, ty))
+                    game.level.set_door_locked(tx, ty, True)
                     if game.renderer:
                         game.renderer.add_notification("Door Closed", COLORS.DOOR_LOCKED)
                 return
@@ -16,6 +16,17 @@ from src.core.constants import (
 from src.graphics.camera import Camera
 from src.graphics.particle_system import ParticleSystem
 
+# Tile colour indexed by CellType value (values run 0..N in definition order);
+# types without their own colour draw as floor
+_TILE_COLORS = tuple(
+    {
+        CellType.WALL: COLORS.WALL,
+        CellType.EXIT: COLORS.EXIT,
+        CellType.DOOR: COLORS.DOOR_LOCKED,
+    }.get(cell_type, COLORS.FLOOR)
+    for cell_type in CellType
+)
+
 
 class Renderer:
     """
@@ -142,58 +153,62 @@ class Renderer:
     
     def _render_level(self, screen: pygame.Surface):
         """Render the maze grid."""
-        if not self.game.level:
+        level = self.game.level
+        if not level:
             return
         
-        for y in range(self.game.level.height):
-            for x in range(self.game.level.width):
+        # Bind everything the per-tile loop reads to locals
+        cells = level.cells
+        visible_tiles = self.visible_tiles
+        world_to_screen = self.camera.world_to_screen
+        draw_rect = pygame.draw.rect
+        debug_mode = self.game.debug_mode
+        tile_colors = _TILE_COLORS
+        floor_color = COLORS.FLOOR
+        collected_keys, opened_doors = level.collected_keys, level.opened_doors
+        dimmed = {}  # color -> fog-of-war version, built once per color
+        
+        for y in range(level.height):
+            for x in range(level.width):
                 world_x = x * TILE_SIZE
                 world_y = y * TILE_SIZE
-                screen_x, screen_y = self.camera.world_to_screen(world_x, world_y)
+                screen_x, screen_y = world_to_screen(world_x, world_y)
                 
                 # Check if tile is visible
-                is_visible = (x, y) in self.visible_tiles
+                is_visible = (x, y) in visible_tiles
                 
                 # Get cell type
-                cell = self.game.level.cells.get((x, y))
+                cell = cells.get((x, y))
                 if not cell:
                     continue
                 
-                # Choose color
-                if cell.cell_type == CellType.WALL:
-                    color = COLORS.WALL
-                elif cell.cell_type == CellType.FLOOR:
-                    color = COLORS.FLOOR
-                elif cell.cell_type == CellType.KEY:
-                    if (x, y) not in self.game.level.collected_keys:
-                        color = COLORS.KEY
-                        # Draw key icon
-                        if is_visible:
-                            self._draw_key(screen, screen_x, screen_y)
-                        continue
-                    else:
-                        color = COLORS.FLOOR
-                elif cell.cell_type == CellType.EXIT:
-                    color = COLORS.EXIT
-                elif cell.cell_type == CellType.DOOR:
-                    if (x, y) in self.game.level.opened_doors:
-                        color = COLORS.FLOOR
-                    else:
-                        color = COLORS.DOOR
+                # Choose color; keys and opened doors are the only
+                # position-dependent cases
+                cell_type = cell.cell_type
+                if cell_type == CellType.KEY and (x, y) not in collected_keys:
+                    # Draw key icon
+                    if is_visible:
+                        self._draw_key(screen, screen_x, screen_y)
+                    continue
+                if cell_type == CellType.DOOR and (x, y) in opened_doors:
+                    color = floor_color
                 else:
-                    color = COLORS.FLOOR
+                    color = tile_colors[cell_type]
                 
                 # Apply fog of war
                 if not is_visible:
-                    color = tuple(c // 3 for c in color)
+                    dark = dimmed.get(color)
+                    if dark is None:
+                        dark = dimmed[color] = tuple(c // 3 for c in color)
+                    color = dark
                 
                 # Draw tile
-                rect = pygame.Rect(screen_x, screen_y, TILE_SIZE, TILE_SIZE)
-                pygame.draw.rect(screen, color, rect)
+                rect = (screen_x, screen_y, TILE_SIZE, TILE_SIZE)
+                draw_rect(screen, color, rect)
                 
                 # Draw grid lines (subtle)
-                if self.game.debug_mode:
-                    pygame.draw.rect(screen, (50, 50, 50), rect, 1)
+                if debug_mode:
+                    draw_rect(screen, (50, 50, 50), rect, 1)
     
     def _draw_key(self, screen: pygame.Surface, x: int, y: int):
         """Draw a key icon."""
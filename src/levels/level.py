@@ -9,9 +9,14 @@ from dataclasses import dataclass
 from src.core.constants import CellType, EnemyType
 from src.core.logger import get_logger
 from src.levels.maze_generator import MazeGenerator, Cell, create_campaign_level, create_endless_level
+from src.utils.spatial_hash import HashGridIndex
 import json
 import os
 
+import numpy as np
+
+# Cell types that make up the maze itself rather than objects placed in it
+_PLAIN_CELLS = frozenset((CellType.VOID, CellType.WALL, CellType.FLOOR))
 
 class Level:
     """
@@ -19,6 +24,9 @@ class Level:
     Wraps the MazeGenerator for in-game use.
     """
     
+    # Edited since the editor last saved it; levels start out unsaved
+    dirty = True
+    
     def __init__(self, width: int = 20, height: int = 15, 
                  algorithm: str = "bsp", seed: Optional[int] = None):
         """Create a new procedurally generated level."""
@@ -196,6 +204,39 @@ class Level:
         
         return level
     
+    # Key/door positions stay ordered (they are saved as-is), each paired
+    # with a set for O(1) membership. They are exposed as tuples so they
+    # can't be edited in place; assign a new sequence or use add_key/add_door
+    @property
+    def key_positions(self) -> Tuple[Tuple[int, int], ...]:
+        return self._key_positions
+    
+    @key_positions.setter
+    def key_positions(self, positions):
+        self._key_positions = tuple(positions)
+        self._key_set = set(self._key_positions)
+    
+    @property
+    def door_positions(self) -> Tuple[Tuple[int, int], ...]:
+        return self._door_positions
+    
+    @door_positions.setter
+    def door_positions(self, positions):
+        self._door_positions = tuple(positions)
+        self._door_set = set(self._door_positions)
+    
+    def add_key(self, x: int, y: int):
+        """Register a key position."""
+        if (x, y) not in self._key_set:
+            self._key_positions += ((x, y),)
+            self._key_set.add((x, y))
+    
+    def add_door(self, x: int, y: int):
+        """Register a door position."""
+        if (x, y) not in self._door_set:
+            self._door_positions += ((x, y),)
+            self._door_set.add((x, y))
+    
     def get_cell(self, x: int, y: int) -> Optional[Cell]:
         """Get cell at position."""
         return self.cells.get((x, y))
@@ -214,27 +255,105 @@ class Level:
         
         return cell.is_walkable()
     
+    @property
+    def wall_grid(self) -> np.ndarray:
+        """(height, width) uint8 grid, 1 where the cell is not walkable."""
+        grid = getattr(self, '_wall_grid', None)
+        if grid is None:
+            grid = np.ones((self.height, self.width), dtype=np.uint8)
+            for (x, y) in self.cells:
+                if 0 <= x < self.width and 0 <= y < self.height and self.is_walkable(x, y):
+                    grid[y, x] = 0
+            self._wall_grid = grid
+        return grid
+    
+    @property
+    def type_grid(self) -> np.ndarray:
+        """(height, width) uint8 grid of CellType values; missing cells read as VOID."""
+        grid = getattr(self, '_type_grid', None)
+        if grid is None:
+            grid = np.zeros((self.height, self.width), dtype=np.uint8)
+            for (x, y), cell in self.cells.items():
+                if 0 <= x < self.width and 0 <= y < self.height:
+                    grid[y, x] = cell.cell_type
+            self._type_grid = grid
+        return grid
+    
+    @property
+    def object_index(self) -> HashGridIndex:
+        """Spatial hash of non-wall/floor cells, with their CellType as payload."""
+        index = getattr(self, '_object_index', None)
+        if index is None:
+            index = HashGridIndex()
+            for (x, y), cell in self.cells.items():
+                if cell.cell_type not in _PLAIN_CELLS:
+                    index.set(x, y, cell.cell_type)
+            self._object_index = index
+        return index
+    
+    def query_radius(self, x: float, y: float, radius: float) -> List[Tuple[Tuple[int, int], CellType]]:
+        """Object cells within radius of (x, y), as ((x, y), cell_type) pairs."""
+        return list(self.object_index.query_radius(x, y, radius))
+    
+    def set_cell_type(self, x: int, y: int, cell_type: CellType):
+        """Change a cell's type, keeping the cached grids in step."""
+        cell = self.cells.get((x, y))
+        if cell is None:
+            self.cells[(x, y)] = Cell(x, y, cell_type)
+        else:
+            cell.cell_type = cell_type
+        grid = getattr(self, '_type_grid', None)
+        if grid is not None and 0 <= x < self.width and 0 <= y < self.height:
+            grid[y, x] = cell_type
+        index = getattr(self, '_object_index', None)
+        if index is not None:
+            if cell_type in _PLAIN_CELLS:
+                index.remove(x, y)
+            else:
+                index.set(x, y, cell_type)
+        self._wall_grid = None
+        self.dirty = True
+    
     def collect_key(self, x: int, y: int) -> bool:
         """Mark a key as collected."""
         pos = (x, y)
-        if pos in self.key_positions and pos not in self.collected_keys:
+        if pos in self._key_set and pos not in self.collected_keys:
             self.collected_keys.add(pos)
             # Change cell type
             if pos in self.cells:
                 self.cells[pos].cell_type = CellType.FLOOR
+                grid = getattr(self, '_type_grid', None)
+                if grid is not None and 0 <= x < self.width and 0 <= y < self.height:
+                    grid[y, x] = CellType.FLOOR
+                index = getattr(self, '_object_index', None)
+                if index is not None:
+                    index.remove(x, y)
             return True
         return False
     
     def open_door(self, x: int, y: int) -> bool:
         """Mark a door as opened."""
         pos = (x, y)
-        if pos in self.door_positions and pos not in self.opened_doors:
+        if pos in self._door_set and pos not in self.opened_doors:
             self.opened_doors.add(pos)
             if pos in self.cells:
                 self.cells[pos].is_locked = False
+            self._wall_grid = None
             return True
         return False
     
+    def set_door_locked(self, x: int, y: int, locked: bool):
+        """Lock or unlock a door cell, keeping opened_doors and the wall grid in step."""
+        pos = (x, y)
+        if locked:
+            self.opened_doors.discard(pos)
+        else:
+            self.opened_doors.add(pos)
+        cell = self.cells.get(pos)
+        if cell:
+            cell.is_locked = locked
+        self._wall_grid = None
+    
     def get_enemy_configs(self) -> List[Dict]:
         """Get enemy spawn configurations for this level."""
         configs = []
@@ -7,6 +7,11 @@ from src.ui.ui_manager import Screen
 from src.core.constants import SCREEN_WIDTH, SCREEN_HEIGHT, COLORS, GameState
 
 
+def _make_overlay(color) -> pygame.Surface:
+    """Full-screen translucent fill, built once per screen and reused every frame."""
+    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+    overlay.fill(color)
+    return overlay
 
 
 class UISlider:
@@ -71,6 +76,9 @@ class SettingsScreen(Screen):
         self.elements = []
         self.center_x = SCREEN_WIDTH // 2
         
+        self._title_surf = self.fonts['header'].render("SETTINGS", True, UITheme.COLOR_TEXT_PRIMARY)
+        self._title_rect = self._title_surf.get_rect(center=(self.center_x, 80))
+        
     def on_enter(self):
         self.elements = []
         font_small = self.fonts['small']
@@ -154,8 +162,7 @@ class SettingsScreen(Screen):
     def draw(self, surface: pygame.Surface):
         surface.fill(COLORS.BACKGROUND)
         
-        title = self.fonts['header'].render("SETTINGS", True, UITheme.COLOR_TEXT_PRIMARY)
-        surface.blit(title, title.get_rect(center=(self.center_x, 80)))
+        surface.blit(self._title_surf, self._title_rect)
         
         for el in self.elements:
             el.draw(surface)
@@ -168,6 +175,28 @@ class CreditsScreen(Screen):
         super().__init__(manager)
         self.center_x = SCREEN_WIDTH // 2
         
+        # All text is static: rasterize it once as (surface, rect) pairs
+        title = self.fonts['header'].render("CREDITS", True, UITheme.COLOR_TEXT_PRIMARY)
+        self._text = [(title, title.get_rect(center=(self.center_x, 80)))]
+        
+        # Developers
+        devs = [
+            "DEVELOPED BY",
+            "",
+            "Mehboob ul Qadri",
+            "Zainab Saeed",
+            "Muhmmad Ehtisham Anjum"
+        ]
+        
+        y = 250
+        for line in devs:
+            color = UITheme.COLOR_TEXT_ACCENT if line == "DEVELOPED BY" else UITheme.COLOR_TEXT_PRIMARY
+            font = self.fonts['title'] if line == "DEVELOPED BY" else self.fonts['normal']
+            
+            surf = font.render(line, True, color)
+            self._text.append((surf, surf.get_rect(center=(self.center_x, y))))
+            y += 50
+        
     def on_enter(self):
         font = self.fonts['normal']
         
@@ -197,27 +226,9 @@ class CreditsScreen(Screen):
     def draw(self, surface: pygame.Surface):
         surface.fill(COLORS.BACKGROUND)
         
-        # Title
-        title = self.fonts['header'].render("CREDITS", True, UITheme.COLOR_TEXT_PRIMARY)
-        surface.blit(title, title.get_rect(center=(self.center_x, 80)))
-        
-        # Developers
-        devs = [
-            "DEVELOPED BY",
-            "",
-            "Mehboob ul Qadri",
-            "Zainab Saeed",
-            "Muhmmad Ehtisham Anjum"
-        ]
-        
-        y = 250
-        for line in devs:
-            color = UITheme.COLOR_TEXT_ACCENT if line == "DEVELOPED BY" else UITheme.COLOR_TEXT_PRIMARY
-            font = self.fonts['title'] if line == "DEVELOPED BY" else self.fonts['normal']
-            
-            surf = font.render(line, True, color)
-            surface.blit(surf, surf.get_rect(center=(self.center_x, y)))
-            y += 50
+        # Title and developers
+        for surf, rect in self._text:
+            surface.blit(surf, rect)
             
         self.btn_back.draw(surface)
 
@@ -275,6 +286,11 @@ class PauseScreen(Screen):
     def __init__(self, manager):
         super().__init__(manager)
         self.buttons: List[UIButton] = []
+        self._overlay = _make_overlay(UITheme.COLOR_BG_OVERLAY)
+        
+        # Static title, rendered once
+        self._title_surf = self.fonts['header'].render("PAUSED", True, UITheme.COLOR_TEXT_PRIMARY)
+        self._title_rect = self._title_surf.get_rect(center=(SCREEN_WIDTH // 2, 150))
         
         # Layout
         center_x = SCREEN_WIDTH // 2
@@ -328,16 +344,10 @@ class PauseScreen(Screen):
 
     def draw(self, surface: pygame.Surface):
         # Semi-transparent background
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill(UITheme.COLOR_BG_OVERLAY)
-        surface.blit(overlay, (0,0))
+        surface.blit(self._overlay, (0,0))
         
         # Title
-        title_font = self.fonts['header']
-        title_text = "PAUSED"
-        title_surf = title_font.render(title_text, True, UITheme.COLOR_TEXT_PRIMARY)
-        title_rect = title_surf.get_rect(center=(SCREEN_WIDTH // 2, 150))
-        surface.blit(title_surf, title_rect)
+        surface.blit(self._title_surf, self._title_rect)
         
         # Buttons
         for btn in self.buttons:
@@ -349,15 +359,42 @@ class GameOverScreen(Screen):
         self.buttons: List[UIButton] = []
         self.is_victory = False
         self.stats = {}
+        self._overlay = _make_overlay((0, 0, 0, 200))
         
         # Layout
         self.center_x = SCREEN_WIDTH // 2
         
+        self._text = []  # (surface, rect) for title and stats
+        self._render_text()
+        
     def on_enter(self, victory=False, stats=None):
         self.is_victory = victory
         self.stats = stats or {}
         
         self.create_buttons()
+        self._render_text()
+        
+    def _render_text(self):
+        """Rasterize the title and stats; both are fixed until the next on_enter."""
+        # Title
+        text = "VICTORY" if self.is_victory else "GAME OVER"
+        color = UITheme.COLOR_TEXT_ACCENT if self.is_victory else UITheme.COLOR_TEXT_DANGER
+        title_surf = self.fonts['header'].render(text, True, color)
+        self._text = [(title_surf, title_surf.get_rect(center=(self.center_x, 150)))]
+        
+        # Stats
+        y = 250
+        stat_color = UITheme.COLOR_TEXT_PRIMARY
+        if self.stats:
+            lines = [
+                f"Floor Reached: {self.stats.get('floor', 1)}",
+                f"Time: {self.stats.get('time', 0):.1f}s",
+                f"Score: {self.stats.get('score', 0)}"
+            ]
+            for line in lines:
+                s = self.fonts['normal'].render(line, True, stat_color)
+                self._text.append((s, s.get_rect(center=(self.center_x, y))))
+                y += 40
         
     def create_buttons(self):
         font = self.fonts['normal']
@@ -402,31 +439,11 @@ class GameOverScreen(Screen):
 
     def draw(self, surface: pygame.Surface):
         # Draw dark overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        surface.blit(overlay, (0,0))
-        
-        # Title
-        text = "VICTORY" if self.is_victory else "GAME OVER"
-        color = UITheme.COLOR_TEXT_ACCENT if self.is_victory else UITheme.COLOR_TEXT_DANGER
-        title_surf = self.fonts['header'].render(text, True, color)
-        title_rect = title_surf.get_rect(center=(self.center_x, 150))
-        surface.blit(title_surf, title_rect)
+        surface.blit(self._overlay, (0,0))
         
-        # Stats
-        y = 250
-        stat_color = UITheme.COLOR_TEXT_PRIMARY
-        if self.stats:
-            lines = [
-                f"Floor Reached: {self.stats.get('floor', 1)}",
-                f"Time: {self.stats.get('time', 0):.1f}s",
-                f"Score: {self.stats.get('score', 0)}"
-            ]
-            for line in lines:
-                s = self.fonts['normal'].render(line, True, stat_color)
-                r = s.get_rect(center=(self.center_x, y))
-                surface.blit(s, r)
-                y += 40
+        # Title and stats
+        for surf, rect in self._text:
+            surface.blit(surf, rect)
         
         # Buttons
         for btn in self.buttons:
@@ -438,6 +455,17 @@ class MainMenuScreen(Screen):
         self.buttons: List[UIButton] = []
         self.start_time = time.time()
         
+        # Background grid lines are static; draw() only pulses the
+        # whole layer's alpha
+        self._grid_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        for x in range(0, SCREEN_WIDTH, 40):
+            pygame.draw.line(self._grid_surf, (0, 255, 215), (x, 0), (x, SCREEN_HEIGHT))
+        for y in range(0, SCREEN_HEIGHT, 40):
+            pygame.draw.line(self._grid_surf, (0, 255, 215), (0, y), (SCREEN_WIDTH, y))
+        
+        # Title text never changes; draw() only rescales it for the pulse
+        self._title_surf = self.fonts['header'].render("MAZE BOURNE", True, UITheme.COLOR_TEXT_ACCENT)
+        
         # Layout
         center_x = SCREEN_WIDTH // 2
         start_y = 300
@@ -509,22 +537,14 @@ class MainMenuScreen(Screen):
         # Animated Grid Effect
         t = time.time() - self.start_time
         grid_alpha = int(30 + math.sin(t) * 10)
-        grid_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        
-        for x in range(0, SCREEN_WIDTH, 40):
-            pygame.draw.line(grid_surf, (0, 255, 215, grid_alpha), (x, 0), (x, SCREEN_HEIGHT))
-        for y in range(0, SCREEN_HEIGHT, 40):
-            pygame.draw.line(grid_surf, (0, 255, 215, grid_alpha), (0, y), (SCREEN_WIDTH, y))
-            
-        surface.blit(grid_surf, (0,0))
+        self._grid_surf.set_alpha(grid_alpha)
+        surface.blit(self._grid_surf, (0,0))
         
         # Title
-        title_font = self.fonts['header']
-        title_text = "MAZE BOURNE"
+        title_surf = self._title_surf
         
         # Pulse Effect
         scale = 1.0 + math.sin(t * 2) * 0.02
-        title_surf = title_font.render(title_text, True, UITheme.COLOR_TEXT_ACCENT)
         w, h = title_surf.get_size()
         scaled_surf = pygame.transform.smoothscale(title_surf, (int(w*scale), int(h*scale)))
         title_rect = scaled_surf.get_rect(center=(SCREEN_WIDTH // 2, 150))
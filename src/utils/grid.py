@@ -9,6 +9,9 @@ from typing import Tuple
 class GridPos:
     """Represents a position on the game grid."""
     
+    # Created per path step and per AI query; no per-instance __dict__
+    __slots__ = ('x', 'y')
+    
     def __init__(self, x: float, y: float):
         self.x = x
         self.y = y
@@ -39,3 +42,13 @@ class GridPos:
     def copy(self) -> 'GridPos':
         """Create a copy of this position."""
         return GridPos(self.x, self.y)
+
+
+def pack_pos(x: float, y: float) -> int:
+    """Pack non-negative grid coordinates into one int (x in the high 16 bits)."""
+    return (int(x) << 16) | int(y)
+
+
+def unpack_pos(packed: int) -> Tuple[int, int]:
+    """Inverse of pack_pos."""
+    return (packed >> 16, packed & 0xFFFF)
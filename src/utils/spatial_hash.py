@@ -0,0 +1,75 @@
+"""
+Spatial hash utilities
+Bucketed grid index for radius and nearest-point queries on grid positions.
+"""
+
+import math
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+class HashGridIndex:
+    """
+    Points bucketed into square cells of bucket_size tiles.
+    
+    Radius queries only visit the buckets overlapping the query box, so
+    cost depends on the local density rather than the total point count.
+    Each point carries an arbitrary payload (e.g. a usage count).
+    """
+    
+    def __init__(self, bucket_size: int = 8):
+        self.bucket_size = bucket_size
+        self.buckets: Dict[Tuple[int, int], Dict[Tuple[int, int], Any]] = {}
+    
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self.buckets.values())
+    
+    def _bucket_key(self, x: int, y: int) -> Tuple[int, int]:
+        return (x // self.bucket_size, y // self.bucket_size)
+    
+    def set(self, x: int, y: int, payload: Any = None):
+        """Insert a point or replace its payload."""
+        key = self._bucket_key(x, y)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = {}
+        bucket[(x, y)] = payload
+    
+    def remove(self, x: int, y: int):
+        """Remove a point if present."""
+        key = self._bucket_key(x, y)
+        bucket = self.buckets.get(key)
+        if bucket is not None:
+            bucket.pop((x, y), None)
+            if not bucket:
+                del self.buckets[key]
+    
+    def clear(self):
+        self.buckets.clear()
+    
+    def query_radius(self, x: float, y: float,
+                     radius: float) -> Iterator[Tuple[Tuple[int, int], Any]]:
+        """Yield ((px, py), payload) for points within radius of (x, y)."""
+        size = self.bucket_size
+        r2 = radius * radius
+        for bx in range(math.floor((x - radius) / size), math.floor((x + radius) / size) + 1):
+            for by in range(math.floor((y - radius) / size), math.floor((y + radius) / size) + 1):
+                bucket = self.buckets.get((bx, by))
+                if not bucket:
+                    continue
+                for pos, payload in bucket.items():
+                    dx = pos[0] - x
+                    dy = pos[1] - y
+                    if dx * dx + dy * dy <= r2:
+                        yield pos, payload
+    
+    def nearest(self, x: float, y: float, radius: float) -> Optional[Tuple[int, int]]:
+        """Closest point within radius of (x, y), or None."""
+        best = None
+        best_d2 = math.inf
+        for pos, _ in self.query_radius(x, y, radius):
+            dx = pos[0] - x
+            dy = pos[1] - y
+            d2 = dx * dx + dy * dy
+            if d2 < best_d2:
+                best, best_d2 = pos, d2
+        return best
@@ -0,0 +1,127 @@
+"""
+Tests for the achievement system
+"""
+
+import json
+import os
+
+import pytest
+from src.core import achievements
+from src.core.achievements import AchievementManager, DEATH_EVENTS, LEVEL_END_EVENTS
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """Achievement manager saving into a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    return AchievementManager()
+
+def test_requirement_checks(manager):
+    """Test each requirement type against matching and non-matching stats."""
+    cases = [
+        ("first_escape", {"levels_completed": [1]}, {"levels_completed": [2]}),
+        ("master_escapist", {"levels_completed": list(range(1, 11))}, {"levels_completed": [1, 2]}),
+        ("speed_demon_1", {"level_best_times": {1: 59.0}}, {"level_best_times": {1: 61.0}}),
+        ("untouchable", {"no_damage_levels": [1]}, {}),
+        ("ghost", {"stealth_perfect_levels": [1]}, {"stealth_perfect_levels": [2]}),
+        ("iron_will", {"total_deaths": 10}, {"total_deaths": 9}),
+    ]
+    for achievement_id, unlocks, stays_locked in cases:
+        achievement = manager.get_achievement(achievement_id)
+        assert achievement.check_unlock(unlocks), achievement_id
+        assert not achievement.check_unlock(stays_locked), achievement_id
+    
+    # Requirement types without a checker never unlock
+    assert not manager.get_achievement("phantom").check_unlock({"perfect_stealth_count": 99})
+
+def test_check_all_by_event(manager):
+    """Test that check_all only visits the requested types and unlocks once."""
+    stats = {"levels_completed": [1], "total_deaths": 10, "current_time": 12.5}
+    
+    unlocked = manager.check_all(stats, LEVEL_END_EVENTS)
+    assert [a.id for a in unlocked] == ["first_escape"]
+    assert manager.get_achievement("first_escape").unlock_time == 12.5
+    assert not manager.get_achievement("iron_will").unlocked
+    
+    unlocked = manager.check_all(stats, DEATH_EVENTS)
+    assert [a.id for a in unlocked] == ["iron_will"]
+    assert manager.unlocked_achievements == {"iron_will", "first_escape"}
+    
+    # Unlocked achievements leave the index, so nothing fires twice
+    assert manager.check_all(stats) == []
+    assert all(not a.unlocked for bucket in manager._locked_by_type.values() for a in bucket)
+
+def test_save_load_round_trip(manager):
+    """Test that unlocks survive a save and reload, and clean saves are skipped."""
+    manager.save()
+    assert not os.path.exists(manager.save_path)  # Nothing to save yet
+    
+    manager.check_all({"total_deaths": 10, "current_time": 3.0})
+    manager.save()
+    assert not os.path.exists(manager.save_path + ".tmp")
+    
+    reloaded = AchievementManager()
+    assert reloaded.unlocked_achievements == {"iron_will"}
+    assert reloaded.get_achievement("iron_will").unlock_time == 3.0
+    assert reloaded.check_all({"total_deaths": 10}) == []
+    
+    # A freshly loaded manager has nothing unsaved
+    os.remove(reloaded.save_path)
+    reloaded.save()
+    assert not os.path.exists(reloaded.save_path)
+
+def test_reload_refreshes_index(manager):
+    """Test that a later load() rebuilds the index and views and clears the dirty flag."""
+    other = AchievementManager()
+    other.check_all({"total_deaths": 10})
+    other.save()
+    
+    assert manager.get_progress()[0] == 0
+    manager.check_all({"levels_completed": [1]})  # Unsaved, discarded by the load
+    manager.load()
+    assert manager.get_progress()[0] == 1
+    assert manager.check_all({"total_deaths": 10}) == []
+    assert all(a.id != "iron_will" for bucket in manager._locked_by_type.values() for a in bucket)
+    
+    os.remove(manager.save_path)
+    manager.save()
+    assert not os.path.exists(manager.save_path)  # Nothing left unsaved
+
+def test_failed_save_keeps_previous_file(manager, monkeypatch):
+    """Test that a write that dies midway leaves the old save intact."""
+    manager.check_all({"total_deaths": 10})
+    manager.save()
+    with open(manager.save_path) as f:
+        before = f.read()
+    
+    def broken_dump(data, f, **kwargs):
+        f.write('{"unlocked": [')
+        raise OSError("disk full")
+    
+    manager.check_all({"levels_completed": [1]})
+    with monkeypatch.context() as patch:
+        patch.setattr(achievements.json, "dump", broken_dump)
+        with pytest.raises(OSError):
+            manager.save()
+    
+    with open(manager.save_path) as f:
+        assert f.read() == before
+    assert not os.path.exists(manager.save_path + ".tmp")
+    
+    # Still dirty, so the next save goes through
+    manager.save()
+    with open(manager.save_path) as f:
+        assert set(json.load(f)["unlocked"]) == {"iron_will", "first_escape"}
+
+def test_views_refresh_after_unlock(manager):
+    """Test that cached progress and list views pick up new unlocks."""
+    visible = manager.get_all_visible()
+    assert manager.get_all_visible() is visible  # Cached between unlocks
+    assert manager.get_progress() == (0, len(manager.achievements))
+    assert manager.get_all_unlocked() == []
+    
+    manager.check_all({"total_deaths": 50})
+    assert manager.get_progress() == (2, len(manager.achievements))
+    assert {a.id for a in manager.get_all_unlocked()} == {"iron_will", "persistent"}
+    # The hidden "persistent" becomes visible once unlocked
+    assert manager.get_achievement("persistent") in manager.get_all_visible()
+    assert manager.get_achievement("persistent") not in visible
@@ -0,0 +1,42 @@
+"""
+Tests for adaptive enemy behaviors
+"""
+
+import random
+
+import pytest
+from src.ai.adaptive_behaviors import AdaptiveMixin
+
+class _Adaptive(AdaptiveMixin):
+    """Mixin host with fixed danger zones instead of a behavior tracker."""
+    
+    def __init__(self, danger_zones):
+        super().__init__()
+        self.danger_zones = danger_zones
+    
+    def get_danger_zones(self, game):
+        return self.danger_zones
+
+def _picks(enemy, waypoints, seed=0, rounds=200):
+    random.seed(seed)
+    return [enemy.get_adaptive_patrol_waypoint(None, None, waypoints) for _ in range(rounds)]
+
+def test_patrol_waypoint_branches_agree():
+    """Test that short and long waypoint lists follow the same pick rule."""
+    enemy = _Adaptive([(1, 1), (20, 20), (40, 40)])
+    short = [(1.5, 1.5)] * (AdaptiveMixin.VECTORIZE_MIN_WAYPOINTS - 1)
+    long = [(1.5, 1.5)] * AdaptiveMixin.VECTORIZE_MIN_WAYPOINTS
+    
+    picks = _picks(enemy, long)
+    assert picks == _picks(enemy, short)
+    assert (1.5, 1.5) not in picks  # The zone under the waypoints is never chosen
+    assert {(20.5, 20.5), (40.5, 40.5), None} == set(picks)
+
+def test_waypoint_array_tracks_in_place_edits():
+    """Test that the cached waypoint array follows edits to the same list."""
+    enemy = _Adaptive([])
+    waypoints = [(1.0, 1.0)] * 5
+    assert enemy._get_waypoint_array(waypoints)[0].tolist() == [1.0, 1.0]
+    
+    waypoints[0] = (9.0, 4.0)
+    assert enemy._get_waypoint_array(waypoints)[0].tolist() == [9.0, 4.0]
@@ -55,3 +55,52 @@ def test_level_key_collection():
         assert (kx, ky) in level.collected_keys
         
         assert not level.collect_key(kx, ky)
+
+def test_level_query_radius():
+    """Test radius queries over object cells."""
+    level = Level(30, 20, seed=3)
+    level.query_radius(0, 0, 1)  # Build the index before editing
+    
+    level.set_cell_type(5, 5, CellType.TRAP)
+    assert ((5, 5), CellType.TRAP) in level.query_radius(6, 6, 2)
+    assert ((5, 5), CellType.TRAP) not in level.query_radius(9, 9, 2)
+    
+    level.set_cell_type(5, 5, CellType.FLOOR)
+    assert all(pos != (5, 5) for pos, _ in level.query_radius(5, 5, 1))
+
+def test_level_set_cell_type_out_of_bounds():
+    """Test that edits outside the level never wrap into the type grid."""
+    level = Level(30, 20, seed=3)
+    before = level.type_grid.copy()
+    
+    level.set_cell_type(-1, 0, CellType.TRAP)
+    level.set_cell_type(30, 20, CellType.TRAP)
+    assert (level.type_grid == before).all()
+    assert level.wall_grid.shape == (20, 30)
+
+def test_level_add_key():
+    """Test that added keys can be collected."""
+    level = Level(30, 20, seed=3)
+    
+    level.add_key(5, 5)
+    assert (5, 5) in level.key_positions
+    assert level.collect_key(5, 5)
+    
+    # Positions are read-only; edits go through add_key or reassignment
+    with pytest.raises(AttributeError):
+        level.key_positions.append((6, 6))
+
+def test_level_set_door_locked():
+    """Test that locking and unlocking doors refreshes the wall grid."""
+    level = Level(30, 20, seed=3)
+    level.set_cell_type(5, 5, CellType.DOOR)
+    level.cells[(5, 5)].is_locked = True
+    assert level.wall_grid[5, 5] == 1
+    
+    level.set_door_locked(5, 5, False)
+    assert level.wall_grid[5, 5] == 0
+    assert (5, 5) in level.opened_doors
+    
+    level.set_door_locked(5, 5, True)
+    assert level.wall_grid[5, 5] == 1
+    assert (5, 5) not in level.opened_doors
@@ -0,0 +1,150 @@
+"""
+Tests for line of sight and vision detection
+"""
+
+import importlib
+import sys
+
+import numpy as np
+import pytest
+from src.ai import _jit
+from src.ai._raycast_nb import raycast, raycast_many
+from src.ai.line_of_sight import LineOfSight, VisionSystem
+from src.core.constants import CellType
+from src.levels.level import Level
+from src.utils.grid import GridPos
+
+# Plain-Python kernels; the same functions when numba is not installed
+KERNELS = [raycast, getattr(raycast, 'py_func', raycast)]
+
+@pytest.fixture
+def blocker():
+    """Random blocker grid with about a quarter of the cells blocking."""
+    rng = np.random.default_rng(7)
+    return (rng.random((20, 30)) < 0.25).astype(np.uint8)
+
+def test_njit_fallback(monkeypatch):
+    """Test that njit degrades to a no-op decorator without numba."""
+    monkeypatch.setitem(sys.modules, 'numba', None)
+    try:
+        fallback = importlib.reload(_jit)
+        assert not fallback.HAVE_NUMBA
+        
+        def kernel(a):
+            return a + 1
+        
+        assert fallback.njit(kernel) is kernel
+        assert fallback.njit(cache=True, nogil=True)(kernel) is kernel
+    finally:
+        monkeypatch.delitem(sys.modules, 'numba')
+        importlib.reload(_jit)
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_raycast_endpoints(kernel):
+    """Test that both endpoints and out-of-grid cells block."""
+    grid = np.zeros((5, 5), dtype=np.uint8)
+    assert kernel(grid, 0, 0, 4, 4)
+    assert kernel(grid, 2, 2, 2, 2)
+    assert not kernel(grid, 0, 0, 5, 0)
+    assert not kernel(grid, -1, 0, 3, 0)
+    
+    grid[4, 4] = 1
+    assert not kernel(grid, 0, 0, 4, 4)
+    assert not kernel(grid, 4, 4, 0, 0)
+
+def _branchy_raycast(blocker, x0, y0, x1, y1):
+    """Textbook Bresenham walk, for checking the branchless kernel."""
+    height, width = blocker.shape
+    dx, dy = abs(x1 - x0), abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx - dy
+    x, y = x0, y0
+    while True:
+        if x < 0 or y < 0 or x >= width or y >= height or blocker[y, x]:
+            return False
+        if x == x1 and y == y1:
+            return True
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            x += sx
+        if e2 < dx:
+            err += dx
+            y += sy
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_raycast_matches_bresenham(kernel, blocker):
+    """Test the branchless step against a textbook Bresenham walk."""
+    rng = np.random.default_rng(3)
+    # Include endpoints just outside the grid
+    segments = np.column_stack([rng.integers(-2, 32, 2000), rng.integers(-2, 22, 2000),
+                                rng.integers(-2, 32, 2000), rng.integers(-2, 22, 2000)])
+    for x0, y0, x1, y1 in segments.tolist():
+        assert kernel(blocker, x0, y0, x1, y1) == _branchy_raycast(blocker, x0, y0, x1, y1)
+
+def test_raycast_many(blocker):
+    """Test that raycast_many matches raycast per source."""
+    rng = np.random.default_rng(11)
+    xs = rng.integers(0, 30, 200)
+    ys = rng.integers(0, 20, 200)
+    many = raycast_many(blocker, xs, ys, 15, 10)
+    single = [raycast(blocker, int(x), int(y), 15, 10) for x, y in zip(xs, ys)]
+    assert many.tolist() == single
+
+def test_blocker_grid_matches_maze():
+    """Test that the blocker grid follows the maze and cell type edits."""
+    level = Level(30, 20, seed=3)
+    los = LineOfSight(level.cells)
+    for (x, y), cell in level.cells.items():
+        assert los._blocks_sight(GridPos(x, y)) == LineOfSight._cell_blocks(cell)
+    
+    level.set_cell_type(5, 5, CellType.WALL)
+    los.mark_dirty(5, 5)
+    assert los._blocks_sight(GridPos(5, 5))
+
+def test_blocker_grid_follows_doors():
+    """Test that opening and closing doors updates sight without mark_dirty."""
+    level = Level(30, 20, seed=3)
+    level.set_cell_type(5, 5, CellType.DOOR)
+    level.set_door_locked(5, 5, True)
+    vision = VisionSystem(level.cells)
+    los = vision.line_of_sight
+    assert los._blocks_sight(GridPos(5, 5))
+    
+    level.set_door_locked(5, 5, False)
+    assert not los._blocks_sight(GridPos(5, 5))
+    assert los.has_clear_sight(GridPos(5, 5), GridPos(5, 5))
+    assert vision.batch_detect([(5, 5)], (5, 5), [1.0])['detected'][0]
+    
+    level.set_door_locked(5, 5, True)
+    assert los._blocks_sight(GridPos(5, 5))
+    assert not los.has_clear_sight(GridPos(5, 5), GridPos(5, 5))
+    assert not vision.batch_detect([(5, 5)], (5, 5), [1.0])['detected'][0]
+
+def test_batch_detect_matches_single():
+    """Test that batch_detect agrees with can_detect_player per enemy."""
+    level = Level(30, 20, seed=3)
+    vision = VisionSystem(level.cells)
+    rng = np.random.default_rng(5)
+    count = 300
+    enemies = rng.integers(0, 30, (count, 2)).astype(float)
+    enemies[:, 1] %= 20
+    ranges = rng.uniform(2.0, 12.0, count)
+    types = rng.choice(["omnidirectional", "cone", "limited"], count).tolist()
+    facings = rng.integers(-1, 2, (count, 2)).astype(float)
+    
+    sx, sy = level.spawn_point
+    ex, ey = level.exit_point
+    hits = 0
+    for player in [(sx, sy), (sx + 0.5, sy + 0.25), (ex, ey)]:
+        batch = vision.batch_detect(enemies, player, ranges, types, facings)
+        for i in range(count):
+            facing = GridPos(*facings[i]) if facings[i].any() else None
+            single = vision.can_detect_player(GridPos(*enemies[i]), GridPos(*player),
+                                              types[i], facing, ranges[i])
+            assert batch['detected'][i] == single.detected
+            if single.detected:
+                assert batch['confidence'][i] == pytest.approx(single.confidence, abs=1e-6)
+                hits += 1
+    assert hits > 0
@@ -50,3 +50,70 @@ def test_pathfinder_cache(pathfinder):
     
     if path1:
         assert pathfinder.performance_stats['cache_hits'] > 0
+
+def _bfs_lengths(cells, start):
+    """Shortest 4-connected step counts from start to every reachable cell."""
+    dist = {start: 0}
+    frontier = [start]
+    while frontier:
+        next_frontier = []
+        for x, y in frontier:
+            for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                cell = cells.get((nx, ny))
+                if (nx, ny) not in dist and cell is not None and cell.is_walkable():
+                    dist[(nx, ny)] = dist[(x, y)] + 1
+                    next_frontier.append((nx, ny))
+        frontier = next_frontier
+    return dist
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4])
+def test_pathfinder_matches_bfs(seed):
+    """Test that A* paths are valid and as short as a BFS shortest path."""
+    level = Level(30, 20, seed=seed)
+    pathfinder = AStarPathfinder(level.cells)
+    start = level.spawn_point
+    dist = _bfs_lengths(level.cells, start)
+    
+    # Sample goals spread over the reachable area
+    goals = sorted(dist)[::max(1, len(dist) // 25)]
+    for goal in goals:
+        path = pathfinder.find_path(GridPos(*start), GridPos(*goal), max_distance=1000)
+        assert path, f"no path to {goal}"
+        assert path[0] == GridPos(*start) and path[-1] == GridPos(*goal)
+        assert len(path) - 1 == dist[goal]
+        for a, b in zip(path, path[1:]):
+            assert abs(a.x - b.x) + abs(a.y - b.y) == 1
+            assert level.cells[(b.x, b.y)].is_walkable()
+
+def test_pathfinder_reverse_cache():
+    """Test that the cached reverse path mirrors the forward path."""
+    level = Level(30, 20, seed=3)
+    pathfinder = AStarPathfinder(level.cells)
+    start = GridPos(*level.spawn_point)
+    goal = GridPos(*level.exit_point)
+    
+    forward = pathfinder.find_path(start, goal, max_distance=1000)
+    assert forward
+    
+    hits = pathfinder.performance_stats['cache_hits']
+    reverse = pathfinder.find_path(goal, start, max_distance=1000)
+    assert pathfinder.performance_stats['cache_hits'] == hits + 1
+    assert reverse == forward[::-1]
+    
+    # Hand-outs are copies, so editing one leaves the cache intact
+    reverse.pop()
+    assert pathfinder.find_path(goal, start, max_distance=1000) == forward[::-1]
+
+def test_pathfinder_avoid_positions():
+    """Test that avoided cells are routed around and never cached."""
+    level = Level(30, 20, seed=3)
+    pathfinder = AStarPathfinder(level.cells)
+    start = GridPos(*level.spawn_point)
+    goal = GridPos(*level.exit_point)
+    forward = pathfinder.find_path(start, goal, max_distance=1000)
+    blocked = forward[len(forward) // 2]
+    
+    detour = pathfinder.find_path_avoiding_positions(start, goal, {blocked}, max_distance=1000)
+    assert blocked not in detour
+    assert (blocked.x, blocked.y) in level.cells  # The maze itself is untouched
+    assert pathfinder.find_path(start, goal, max_distance=1000) == forward
@@ -0,0 +1,31 @@
+"""
+Tests for player behavior tracking
+"""
+
+import pytest
+from src.ai.player_tracker import PlayerBehaviorTracker
+
+def test_nearest_hiding_spot():
+    """Test nearest-hiding-spot queries after recorded hides."""
+    tracker = PlayerBehaviorTracker()
+    assert tracker.get_nearest_hiding_spot(0, 0) is None
+    
+    tracker.record_hide((2, 2), is_entering=True)
+    tracker.record_hide((2, 2), is_entering=False)
+    tracker.record_hide((10, 3), is_entering=True)
+    
+    assert tracker.get_nearest_hiding_spot(3, 3) == (2, 2)
+    assert tracker.get_nearest_hiding_spot(9, 4) == (10, 3)
+    assert tracker.get_nearest_hiding_spot(30, 30, radius=5) is None
+
+def test_nearest_hiding_spot_after_load():
+    """Test that hiding spots restored by from_dict are indexed."""
+    tracker = PlayerBehaviorTracker()
+    for pos in [(4, 4), (4, 4), (20, 8)]:
+        tracker.record_hide(pos, is_entering=True)
+    
+    restored = PlayerBehaviorTracker.from_dict(tracker.to_dict())
+    
+    assert restored.hiding_spot_usage[(4, 4)] == 2
+    assert restored.get_nearest_hiding_spot(18, 9) == (20, 8)
+    assert restored.get_nearest_hiding_spot(5, 5, radius=3) == (4, 4)
@@ -0,0 +1,64 @@
+"""
+Tests for the spatial hash index
+"""
+
+import math
+import random
+
+import pytest
+from src.utils.spatial_hash import HashGridIndex
+
+@pytest.fixture
+def points():
+    """Random grid points with integer payloads, including negative coordinates."""
+    rng = random.Random(9)
+    return {(rng.randint(-20, 60), rng.randint(-20, 60)): i for i in range(400)}
+
+def _brute_radius(points, x, y, radius):
+    return {pos: payload for pos, payload in points.items()
+            if (pos[0] - x) ** 2 + (pos[1] - y) ** 2 <= radius * radius}
+
+@pytest.mark.parametrize("bucket_size", [1, 4, 8])
+def test_query_radius_matches_brute_force(points, bucket_size):
+    """Test radius queries against a linear scan."""
+    index = HashGridIndex(bucket_size)
+    for (x, y), payload in points.items():
+        index.set(x, y, payload)
+    assert len(index) == len(points)
+    
+    rng = random.Random(1)
+    for _ in range(200):
+        x, y = rng.uniform(-25, 65), rng.uniform(-25, 65)
+        radius = rng.uniform(0, 15)
+        assert dict(index.query_radius(x, y, radius)) == _brute_radius(points, x, y, radius)
+
+def test_nearest_matches_brute_force(points):
+    """Test nearest-point queries against a linear scan."""
+    index = HashGridIndex()
+    for (x, y), payload in points.items():
+        index.set(x, y, payload)
+    
+    rng = random.Random(2)
+    for _ in range(200):
+        x, y = rng.uniform(-25, 65), rng.uniform(-25, 65)
+        radius = rng.uniform(0, 15)
+        found = index.nearest(x, y, radius)
+        in_range = _brute_radius(points, x, y, radius)
+        if not in_range:
+            assert found is None
+        else:
+            best = min(math.hypot(px - x, py - y) for px, py in in_range)
+            assert math.hypot(found[0] - x, found[1] - y) == pytest.approx(best)
+
+def test_set_and_remove():
+    """Test payload replacement and removal, including empty buckets."""
+    index = HashGridIndex()
+    index.set(3, 4, 1)
+    index.set(3, 4, 2)
+    assert len(index) == 1
+    assert list(index.query_radius(3, 4, 0)) == [((3, 4), 2)]
+    
+    index.remove(3, 4)
+    index.remove(3, 4)  # Missing points are ignored
+    assert len(index) == 0
+    assert not index.buckets
@@ -0,0 +1,198 @@
+"""
+Tests for the LLM strategist
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from src.ai.strategist import EnemyStrategist, LLMProvider, StrategyRequest, _snapshot_alive_positions
+from src.utils.grid import GridPos
+
+REPLY = '{"positions": [[4, 8], [12, 2]], "formation": "ambush", "reason": "test"}'
+
+class _FakeProvider(LLMProvider):
+    """Answers every prompt with REPLY and records what it was asked."""
+    
+    def __init__(self):
+        super().__init__("test-key", "test-model")
+        self.prompts = []
+        self.loops = []
+        self.closed = False
+    
+    async def get_strategy(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        self.loops.append(asyncio.get_running_loop())
+        return REPLY
+    
+    async def aclose(self):
+        self.closed = True
+
+def _game():
+    tracker = SimpleNamespace(get_player_tendencies=lambda: {'hiding_preference': 0.5})
+    return SimpleNamespace(behavior_tracker=tracker, current_level_num=3)
+
+def _enemies():
+    return [SimpleNamespace(pos=GridPos(5, 9), is_alive=True, last_known_player_pos=(2, 3)),
+            SimpleNamespace(pos=GridPos(13, 3), is_alive=True, last_known_player_pos=None)]
+
+def _wait_for(strategist, request_id, timeout=2.0):
+    """Poll get_response like the game loop does, or give up after timeout."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = strategist.get_response(request_id)
+        if response:
+            return response
+        time.sleep(0.01)
+    return None
+
+@pytest.fixture
+def strategist():
+    """Strategist wired to a fake provider instead of the network."""
+    strategist = EnemyStrategist()
+    strategist._providers = [_FakeProvider()]
+    strategist._providers_initialized = True
+    yield strategist
+    strategist.shutdown()
+
+def test_rate_limit_refuses_without_tokens(strategist):
+    """Test that the token bucket refuses requests once drained."""
+    strategist._any_provider_reachable = True
+    strategist._ensure_worker = lambda: None  # Keep requests pending
+    strategist._tokens = 1.0
+    strategist._last_refill = time.monotonic()
+    
+    assert strategist.request_strategy(_game(), _enemies()) is not None
+    assert strategist.request_strategy(_game(), _enemies()) is None
+    
+    # Refilled tokens let requests through again
+    strategist.pending_requests.clear()
+    strategist._last_refill -= strategist.MIN_REQUEST_INTERVAL
+    assert strategist.request_strategy(_game(), _enemies()) is not None
+
+def test_burst_requests_get_distinct_ids(strategist):
+    """Test that back-to-back requests never share an id."""
+    strategist._any_provider_reachable = True
+    strategist._ensure_worker = lambda: None  # Keep requests pending
+    
+    ids = [strategist.request_strategy(_game(), _enemies())
+           for _ in range(strategist.MAX_PENDING_REQUESTS)]
+    assert None not in ids
+    assert len(set(ids)) == len(ids)
+    assert list(strategist.pending_requests) == ids
+
+def test_unreachable_providers_refuse(strategist):
+    """Test that requests are refused once the probe found no provider."""
+    strategist._any_provider_reachable = False
+    assert strategist.request_strategy(_game(), _enemies()) is None
+
+def test_worker_reuses_event_loop(strategist):
+    """Test that one worker thread answers every query on a single loop."""
+    provider = strategist._providers[0]
+    strategist._tokens = float(strategist.MAX_PENDING_REQUESTS)
+    game = _game()
+    
+    first = strategist.request_strategy(game, _enemies())
+    assert _wait_for(strategist, first)
+    worker = strategist._query_thread
+    
+    game.current_level_num += 1  # New prompt, so the cache can't answer
+    second = strategist.request_strategy(game, _enemies())
+    assert _wait_for(strategist, second)
+    
+    assert strategist._query_thread is worker
+    assert len(provider.loops) == 2 and provider.loops[0] is provider.loops[1]
+
+def test_shutdown_closes_providers(strategist):
+    """Test that pooled provider clients are closed when the worker exits."""
+    provider = strategist._providers[0]
+    request_id = strategist.request_strategy(_game(), _enemies())
+    assert _wait_for(strategist, request_id)
+    
+    worker = strategist._query_thread
+    strategist.shutdown()
+    assert not worker.is_alive()
+    assert provider.closed
+
+def test_request_round_trip(strategist):
+    """Test that a queued request comes back parsed and leaves no pending entry."""
+    request_id = strategist.request_strategy(_game(), _enemies())
+    response = _wait_for(strategist, request_id)
+    
+    assert response.suggested_positions == [(4, 8), (12, 2)]
+    assert response.suggested_formation == "ambush"
+    assert request_id not in strategist.pending_requests
+
+def test_pending_requests_expire(strategist):
+    """Test that unanswered requests stop counting against the limit once stale."""
+    strategist._ensure_worker = lambda: None  # Nothing answers
+    strategist._tokens = float(strategist.MAX_PENDING_REQUESTS + 1)
+    
+    def request(request_id):
+        return StrategyRequest(request_id, {}, [], None, 1)
+    
+    for i in range(strategist.MAX_PENDING_REQUESTS):
+        assert strategist._submit(request(f"fresh_{i}"))
+    assert not strategist._submit(request("over_limit"))
+    
+    for request_id in strategist.pending_requests:
+        strategist.pending_requests[request_id].timestamp -= strategist.PENDING_TIMEOUT + 1
+    assert strategist._submit(request("after_timeout"))
+    assert list(strategist.pending_requests) == ["after_timeout"]
+
+def test_prompt_cache_reuses_answers(strategist):
+    """Test fresh, stale and expired prompt cache entries."""
+    provider = strategist._providers[0]
+    first = strategist.request_strategy(_game(), _enemies())
+    assert _wait_for(strategist, first)
+    assert len(provider.prompts) == 1
+    
+    # Fresh: answered immediately, even with the rate limit exhausted
+    strategist._tokens = 0.0
+    strategist._last_refill = time.monotonic()
+    second = strategist.request_strategy(_game(), _enemies())
+    assert strategist.get_response(second).suggested_positions == [(4, 8), (12, 2)]
+    assert len(provider.prompts) == 1
+    
+    (key, (stamp, response)), = strategist._prompt_cache.items()
+    
+    # Stale: still served, and refreshed in the background
+    strategist._prompt_cache[key] = (stamp - strategist.PROMPT_CACHE_FRESH, response)
+    strategist._tokens = 1.0
+    strategist._last_refill = time.monotonic()
+    third = strategist.request_strategy(_game(), _enemies())
+    assert strategist.get_response(third)
+    assert _wait_for(strategist, f"{third}_refresh")
+    assert len(provider.prompts) == 2
+    
+    # Expired: not served, so an exhausted rate limit refuses the request
+    stamp, response = strategist._prompt_cache[key]
+    strategist._prompt_cache[key] = (stamp - strategist.PROMPT_CACHE_STALE, response)
+    strategist._tokens = 0.0
+    strategist._last_refill = time.monotonic()
+    assert strategist.request_strategy(_game(), _enemies()) is None
+
+def test_parse_response_formats():
+    """Test bare JSON, JSON inside prose and unparseable replies."""
+    strategist = EnemyStrategist()
+    
+    bare = strategist._parse_response("a", REPLY)
+    assert bare.suggested_positions == [(4, 8), (12, 2)]
+    assert bare.confidence == 0.7
+    
+    prose = strategist._parse_response("b", f"Sure! Here is the plan: {REPLY} Good luck.")
+    assert prose.suggested_formation == "ambush"
+    
+    for text in ["", "no plan today", "[1, 2]"]:
+        fallback = strategist._parse_response("c", text)
+        assert fallback.confidence == 0.0
+        assert fallback.suggested_positions == []
+
+def test_snapshot_alive_positions():
+    """Test that only living enemies are snapshotted, in order."""
+    enemies = _enemies() + [SimpleNamespace(pos=GridPos(7.5, 1.25), is_alive=False)]
+    enemies.append(SimpleNamespace(pos=GridPos(0.5, 6), is_alive=True))
+    
+    assert _snapshot_alive_positions(enemies) == [(5, 9), (13, 3), (0.5, 6)]
+    assert _snapshot_alive_positions([]) == []
@@ -114,8 +114,8 @@ def generate_levels():
             # Key/Door
             kx, ky = level.width//2, level.height//2
             if level.is_walkable(kx, ky): 
-                level.key_positions.append((kx, ky))
-                level.cells[(kx, ky)].cell_type = CellType.KEY
+                level.add_key(kx, ky)
+                level.set_cell_type(kx, ky, CellType.KEY)
                 
         elif i == 4:
             level.level_name = "Level 4: Trackers"